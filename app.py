@@ -5,9 +5,132 @@ Created on Sun Jun 10 15:21:23 2018
 @author: ctsoft
 """
 
-import ctsoft.awd.application.pva_05 as pva
+import argparse
+import sys
+import time
+
+# The start of the application to measure the startup time.
+STARTED = time.perf_counter()
+
+
+def parseArguments(arguments):
+    parser = argparse.ArgumentParser(description='Numerical integration of '
+                                     'the torus volume.')
+    parser.add_argument('--startup', action='store_true',
+                        help='reports the startup time against the budget')
+    parser.add_argument('--index-cache', action='store_true',
+                        help='stores the indexes of the settings and '
+                        'messages in the cache directory')
+    commands = parser.add_subparsers(dest='command')
+
+    commands.add_parser('run', help='calculates the default function '
+                        '(default command)')
+
+    bench = commands.add_parser('bench', help='measures the integration '
+                                'methods')
+    bench.add_argument('--output', default='benchmark.json',
+                       help='json file of the records')
+    bench.add_argument('--baseline', help='json file of a saved baseline')
+    bench.add_argument('--threshold', type=float, default=1.25,
+                       help='allowed wall time factor against the baseline')
+    bench.add_argument('--steps', type=int, nargs='+',
+                       help='step counts of the matrix')
+    bench.add_argument('--methods', nargs='+',
+                       help='calculation types of the matrix')
+    bench.add_argument('--functions', nargs='+',
+                       help='function strings of the matrix')
+    bench.add_argument('--repeats', type=int, default=3,
+                       help='number of timed runs per combination')
+    bench.add_argument('--backends', nargs='+',
+                       help='precision backends of the matrix')
+
+    batch = commands.add_parser('batch', help='calculates the jobs of a '
+                                'jsonl or xml file')
+    batch.add_argument('input', help='jsonl or xml file of the jobs')
+    batch.add_argument('output', help='jsonl or csv file of the results')
+    batch.add_argument('--format', choices=['jsonl', 'csv'],
+                       help='format of the results (default by extension)')
+    batch.add_argument('--workers', type=int,
+                       help='number of worker processes (1 runs inline)')
+
+    serve = commands.add_parser('serve', help='serves json line jobs of '
+                                'stdin or a local socket')
+    serve.add_argument('--socket', help='path of a unix socket')
+    serve.add_argument('--host', default='127.0.0.1',
+                       help='host of the tcp socket')
+    serve.add_argument('--port', type=int, help='port of the tcp socket')
+    serve.add_argument('--workers', type=int,
+                       help='number of worker processes')
+
+    return parser.parse_args(arguments)
+
+
+def reportStartup(args):
+    import ctsoft.awd.application.pva_05 as pva
+
+    if not args.startup:
+        return
+    startup = time.perf_counter() - STARTED
+    budget = pva.Application.STARTUP_BUDGET
+    print('startup: {0:.3f} s (budget {1:.3f} s){2}'.format(
+        startup, budget, ' exceeded' if startup > budget else ''),
+        file=sys.stderr)
+
+
+def runBenchmark(args):
+    import ctsoft.awd.application.benchmark as benchmark
+
+    reportStartup(args)
+    bench = benchmark.Benchmark(functions=args.functions,
+                                methods=args.methods, steps=args.steps,
+                                repeats=args.repeats,
+                                backends=args.backends)
+    for record in bench.run():
+        print('{0:<10} {1:<7} {2:>8} {3:>12.6f} s {4:>14.0f} eval/s '
+              '{5:.3e}'.format(record['method'], str(record['backend'] or ''),
+                               str(record['steps']), record['wallTime'],
+                               record['evaluationsPerSecond'] or 0.0,
+                               record['absoluteError']))
+    bench.write(args.output)
+
+    if args.baseline is None:
+        return 0
+
+    regressions = bench.compare(benchmark.load(args.baseline),
+                                args.threshold)
+    for regression in regressions:
+        print('regression: {key} {field} {baseline} -> {current}'.format(
+            **regression))
+    return 1 if regressions else 0
+
+
+def runBatch(args):
+    import ctsoft.awd.application.batch as batch
+
+    reportStartup(args)
+    count = batch.Batch(args.input, args.output, args.format,
+                        args.workers).run()
+    print('calculated jobs: ', count)
+    return 0
 
 
 if __name__ == "__main__":
-    app = pva.Application()
-    app.run()
+    args = parseArguments(sys.argv[1:])
+
+    if args.command == 'bench':
+        sys.exit(runBenchmark(args))
+    elif args.command == 'batch':
+        sys.exit(runBatch(args))
+    else:
+        import ctsoft.awd.application.pva_05 as pva
+        import ctsoft.awd.math.cache as cache
+
+        indexDirectory = None
+        if args.index_cache:
+            indexDirectory = cache.getDirectory()
+        app = pva.Application(indexDirectory)
+        reportStartup(args)
+        if args.command == 'serve':
+            app.serve(args.socket, args.host, args.port, args.workers)
+        else:
+            app.run()
@@ -0,0 +1,217 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 13:02:37 2026
+
+@author: ctsoft
+"""
+
+import collections
+import concurrent.futures
+import csv
+import json
+import os
+import xml.etree.ElementTree as xmlee
+
+import ctsoft.awd.math.numerical as numerical
+from ctsoft.awd.math.model import Function
+
+
+class Batch(object):
+    """
+    Class for the batch mode: the jobs are read lazily from a jsonl or xml
+    file, calculated by a worker pool and the results are written in job
+    order as soon as they are available.
+
+    Methods
+    -------
+    run:
+        Calculates all jobs of the input file.
+    """
+    def __init__(self, inputPath, outputPath, outputFormat=None, workers=None,
+                 window=None):
+        if outputFormat is None:
+            outputFormat = 'csv' if outputPath.endswith('.csv') else 'jsonl'
+        self.__inputPath = inputPath
+        self.__outputPath = outputPath
+        self.__outputFormat = outputFormat
+        self.__workers = workers
+        self.__window = window
+
+    def run(self):
+        """
+        Calculates all jobs of the input file. At most window jobs are
+        pending at the same time, so the input file is never loaded as a
+        whole. Each result is flushed to the output file immediately.
+
+        Returns
+        -------
+        int : The number of calculated jobs.
+        """
+        jobs = readJobs(self.__inputPath)
+        count = 0
+        # The pool of the executor has os.cpu_count() workers by default.
+        workers = self.__workers or os.cpu_count() or 1
+        window = self.__window
+        if window is None:
+            window = 4 * workers
+
+        with open(self.__outputPath, 'w', encoding='utf-8',
+                  newline='') as file:
+            if self.__outputFormat == 'csv':
+                writer = CsvWriter(file)
+            else:
+                writer = JsonlWriter(file)
+
+            if workers <= 1:
+                for job in jobs:
+                    writer.write(runJob(job))
+                    count += 1
+                return count
+
+            with concurrent.futures.ProcessPoolExecutor(
+                    workers) as executor:
+                pending = collections.deque()
+                for job in jobs:
+                    pending.append(executor.submit(runJob, job))
+                    if len(pending) >= window:
+                        writer.write(pending.popleft().result())
+                        count += 1
+                while pending:
+                    writer.write(pending.popleft().result())
+                    count += 1
+
+        return count
+
+
+class CsvWriter(object):
+    """
+    Writes one csv row per job and method.
+    """
+    FIELDS = ['id', 'function', 'rCircle', 'rTorus', 'steps', 'method',
+              'calculated', 'reference', 'derivation', 'evaluations',
+              'errorEstimate', 'error']
+
+    def __init__(self, file):
+        self.__file = file
+        self.__writer = csv.DictWriter(file, fieldnames=self.FIELDS,
+                                       extrasaction='ignore')
+        self.__writer.writeheader()
+
+    def write(self, record):
+        rows = record.get('results') or [{}]
+        for row in rows:
+            values = dict(record)
+            values.update(row)
+            self.__writer.writerow(values)
+        self.__file.flush()
+
+
+class JsonlWriter(object):
+    """
+    Writes one json line per job.
+    """
+    def __init__(self, file):
+        self.__file = file
+
+    def write(self, record):
+        self.__file.write(json.dumps(record) + '\n')
+        self.__file.flush()
+
+
+def readJobs(path):
+    """
+    Reads the jobs of a jsonl or xml file lazily. A job has the keys
+    function, rCircle, rTorus, steps, methods and optionally id.
+
+    Parameters
+    ----------
+    path : str
+        The path of the input file, xml files are detected by the extension.
+
+    Returns
+    -------
+    generator : The jobs as dictonaries.
+    """
+    if path.endswith('.xml'):
+        return _readXml(path)
+    return _readJsonl(path)
+
+
+def runJob(job):
+    """
+    Calculates one job: the exact integral and all requested methods. The
+    grid based methods share one sample of the function.
+
+    Parameters
+    ----------
+    job : dict
+        The job with the keys function, rCircle, rTorus, steps, methods and
+        optionally id.
+
+    Returns
+    -------
+    dict : The job parameters with the reference value and one result per
+        method, or the error message if the job failed.
+    """
+    record = {'id': job.get('id'), 'function': job.get('function'),
+              'rCircle': job.get('rCircle'), 'rTorus': job.get('rTorus'),
+              'steps': job.get('steps')}
+    try:
+        function = Function(job['function'], float(job['rCircle']),
+                            float(job['rTorus']), int(job['steps']))
+        methods = job.get('methods') or sorted(numerical.METHODS)
+        integrated = numerical.Integrated(function)
+        reference = integrated.calculate().getCalculatedValue()
+        sample = numerical.Sample(function)
+
+        results = []
+        for calcType in methods:
+            if calcType in numerical.METHODS:
+                method = numerical.METHODS[calcType](function, reference,
+                                                     sample)
+            else:
+                method = numerical.CALCULATIONS[calcType](function, reference)
+            result = method.calculate()
+            # The derivation is None if the reference value is zero.
+            derivation = result.getDerivation()
+            if derivation is not None:
+                derivation = float(derivation)
+            results.append({'method': calcType,
+                            'calculated': float(result.getCalculatedValue()),
+                            'derivation': derivation,
+                            'evaluations': method.getEvaluations(),
+                            'errorEstimate': method.getErrorEstimate()})
+    except (KeyError, TypeError, ValueError, ArithmeticError) as error:
+        record['error'] = '{0}: {1}'.format(type(error).__name__, error)
+        return record
+
+    record['reference'] = reference
+    record['results'] = results
+    return record
+
+
+def _readJsonl(path):
+    with open(path, 'r', encoding='utf-8') as file:
+        for line in file:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def _readXml(path):
+    root = None
+    for (event, element) in xmlee.iterparse(path, events=('start', 'end')):
+        if root is None:
+            root = element
+        if event != 'end' or element.tag != 'job':
+            continue
+        job = {'id': element.attrib.get('id')}
+        for name in ('function', 'rCircle', 'rTorus', 'steps'):
+            child = element.find(name)
+            if child is not None:
+                job[name] = child.text.strip()
+        job['methods'] = [method.text.strip()
+                          for method in element.iter('method')]
+        yield job
+        # Releases the parsed jobs, so the tree does not grow with the file.
+        root.clear()
@@ -0,0 +1,322 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 09:05:44 2026
+
+@author: ctsoft
+"""
+
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import ctsoft.awd.math.numerical as numerical
+from ctsoft.awd.math.model import Function
+
+
+class Benchmark(object):
+    """
+    Class for timing the integration methods over a matrix of function
+    strings, steps and precision backends.
+
+    Methods
+    -------
+    compare:
+        Compares the records with the records of a baseline.
+    getRecords:
+        Returns the records of the last run.
+    measure:
+        Measures one method with one function object.
+    measureStartup:
+        Measures the startup time of the application.
+    run:
+        Measures all combinations of the matrix.
+    write:
+        Writes the records as json file.
+    """
+    # The methods which do not use the steps of the function object are
+    # measured once per function string only.
+    STEPLESS = ('adaptive', 'auto', 'integral', 'tanhsinh')
+    # The methods using the steps differently get their own steps, e.g. the
+    # order of the gauss legendre method costs O(order**2) for the nodes.
+    METHOD_STEPS = {'gauss': [5, 10, 20, 50, 100]}
+    # The maximal steps of the mpmath backend, which evaluates the function
+    # string per value.
+    MPMATH_STEPS = 1000
+    # The script measuring the startup in a new interpreter, so the modules
+    # are not imported yet.
+    STARTUP_SCRIPT = ('import time\n'
+                      'started = time.perf_counter()\n'
+                      'import ctsoft.awd.application.pva_05 as pva\n'
+                      'pva.Application()\n'
+                      'print(time.perf_counter() - started)\n')
+
+    def __init__(self, functions=None, methods=None, steps=None,
+                 rCircle=1.0, rTorus=2.0, repeats=3, startup=True,
+                 backends=None, digits=None):
+        if functions is None:
+            functions = ['4*r2*pi*(r1**2-x**2)**(1/2)',
+                         '2*pi*r2*cos(pi*x/(2*r1))**2']
+        if methods is None:
+            methods = ['integral'] + sorted(numerical.CALCULATIONS)
+        if steps is None:
+            steps = [10, 100, 1000, 10000, 100000]
+        if backends is None:
+            backends = ['float64', 'mpmath']
+        self.__functions = functions
+        self.__methods = methods
+        self.__steps = steps
+        self.__backends = backends
+        self.__digits = digits
+        self.__rCircle = rCircle
+        self.__rTorus = rTorus
+        self.__repeats = repeats
+        self.__startup = startup
+        self.__records = []
+
+    def compare(self, baseline, threshold=1.25):
+        """
+        Compares the records with the records of a baseline. A record is a
+        regression if its wall time exceeds the baseline by the threshold
+        factor or its absolute error got larger. The startup record is also
+        a regression if it exceeds the startup budget.
+
+        Parameters
+        ----------
+        baseline : list
+            The records of the baseline.
+        threshold : double
+            The allowed factor of the wall time.
+
+        Returns
+        -------
+        list : Dictonaries with the keys: key, field, baseline and current
+            for each regression.
+        """
+        baseRecords = {self._getKey(record): record for record in baseline}
+        regressions = []
+
+        for record in self.__records:
+            key = self._getKey(record)
+            budget = record.get('budget')
+            if budget is not None and record['wallTime'] > budget:
+                regressions.append({'key': key, 'field': 'budget',
+                                    'baseline': budget,
+                                    'current': record['wallTime']})
+            base = baseRecords.get(key)
+            if base is None:
+                continue
+            if record['wallTime'] > threshold * base['wallTime']:
+                regressions.append({'key': key, 'field': 'wallTime',
+                                    'baseline': base['wallTime'],
+                                    'current': record['wallTime']})
+            # Allows differences in the last bits of the result.
+            if record['absoluteError'] > (base['absoluteError'] * 1.000001 +
+                                          1e-300):
+                regressions.append({'key': key, 'field': 'absoluteError',
+                                    'baseline': base['absoluteError'],
+                                    'current': record['absoluteError']})
+
+        return regressions
+
+    def getRecords(self):
+        """
+        Returns the records of the last run.
+
+        Returns
+        -------
+        list : One dictonary per measured combination.
+        """
+        return self.__records
+
+    def measure(self, calcType, function, referenceValue):
+        """
+        Measures one method with one function object. The wall time is the
+        best of the repeats, the first run with cold caches is recorded
+        separately. The peak memory is measured in an extra run, because
+        tracing the memory slows down the calculation.
+
+        Parameters
+        ----------
+        calcType : str
+            The calculation type of the method.
+        function : ctsoft.awd.math.model.Function
+            The function object to integrate.
+        referenceValue : double
+            The exact integral of the function object.
+
+        Returns
+        -------
+        dict : The record of the measurement.
+        """
+        times = []
+        for repeat in range(0, self.__repeats + 1):
+            method = self._create(calcType, function, referenceValue)
+            start = time.perf_counter()
+            method.calculate()
+            times.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        method = self._create(calcType, function, referenceValue)
+        method.calculate()
+        peakMemory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        calculated = float(method.getCalculatedValue())
+        evaluations = self._getEvaluations(method, function)
+        wallTime = min(times[1:]) if len(times) > 1 else times[0]
+        absoluteError = abs(calculated - referenceValue)
+
+        return {'function': function.getFunction(), 'method': calcType,
+                'backend': function.getBackend(),
+                'steps': function.getSteps(),
+                'rCircle': function.getRCircle(),
+                'rTorus': function.getRTorus(),
+                'firstTime': times[0], 'wallTime': wallTime,
+                'evaluations': evaluations,
+                'evaluationsPerSecond': evaluations / wallTime
+                if wallTime > 0 else None,
+                'peakMemory': peakMemory, 'calculated': calculated,
+                'reference': referenceValue, 'absoluteError': absoluteError,
+                'relativeError': absoluteError / abs(referenceValue)
+                if referenceValue else None}
+
+    def measureStartup(self):
+        """
+        Measures the startup time of the application: the imports and the
+        loading of the settings and messages in a new interpreter. The wall
+        time is the best of the repeats.
+
+        Returns
+        -------
+        dict : The record of the startup with the startup budget.
+        """
+        import ctsoft.awd
+        import ctsoft.awd.application.pva_05 as pva
+
+        # The new interpreter runs in the root of the package like app.py,
+        # so it finds the package and the settings from any working
+        # directory.
+        root = os.path.dirname(os.path.dirname(os.path.dirname(
+            os.path.abspath(ctsoft.awd.__file__))))
+
+        times = []
+        for repeat in range(0, self.__repeats):
+            process = subprocess.run([sys.executable, '-c',
+                                      self.STARTUP_SCRIPT],
+                                     cwd=root, check=True,
+                                     stdout=subprocess.PIPE,
+                                     universal_newlines=True)
+            times.append(float(process.stdout.split()[-1]))
+
+        return {'function': '', 'method': 'startup', 'backend': None,
+                'steps': None,
+                'rCircle': None, 'rTorus': None, 'firstTime': times[0],
+                'wallTime': min(times), 'evaluations': 0,
+                'evaluationsPerSecond': None,
+                'peakMemory': None, 'calculated': None, 'reference': None,
+                'absoluteError': 0.0, 'relativeError': None,
+                'budget': pva.Application.STARTUP_BUDGET}
+
+    def run(self):
+        """
+        Measures the startup and all combinations of function strings,
+        methods, steps and backends. A method is measured only with the
+        backends it supports.
+
+        Returns
+        -------
+        list : The records of all measurements.
+        """
+        self.__records = []
+        if self.__startup:
+            self.__records.append(self.measureStartup())
+
+        for funcString in self.__functions:
+            reference = Function(funcString, self.__rCircle, self.__rTorus, 0)
+            referenceValue = numerical.Integrated(reference).calculate(
+                ).getCalculatedValue()
+
+            for calcType in self.__methods:
+                steps = self.METHOD_STEPS.get(calcType, self.__steps)
+                if calcType in self.STEPLESS:
+                    steps = steps[:1]
+                for backend in self.__backends:
+                    if not self._supports(calcType, backend):
+                        continue
+                    for stepCount in steps:
+                        if (backend == 'mpmath' and
+                                stepCount > self.MPMATH_STEPS):
+                            continue
+                        function = Function(funcString, self.__rCircle,
+                                            self.__rTorus, stepCount,
+                                            backend, self.__digits)
+                        self.__records.append(self.measure(
+                            calcType, function, referenceValue))
+
+        return self.__records
+
+    def write(self, path):
+        """
+        Writes the records with a description of the environment as json
+        file.
+
+        Parameters
+        ----------
+        path : str
+            The path of the json file.
+        """
+        document = {'python': platform.python_version(),
+                    'machine': platform.machine(),
+                    'repeats': self.__repeats, 'records': self.__records}
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(document, file, indent=2)
+
+    def _create(self, calcType, function, referenceValue):
+        if calcType == 'integral':
+            return numerical.Integrated(function)
+        return numerical.CALCULATIONS[calcType](function, referenceValue)
+
+    def _getEvaluations(self, method, function):
+        if isinstance(method, numerical.Integrated):
+            # The antiderivative is evaluated at both bounds.
+            return 2
+        evaluations = method.getEvaluations()
+        if evaluations is None:
+            # The grid based methods evaluate steps + 1 abscissa values.
+            evaluations = function.getSteps() + 1
+        return evaluations
+
+    def _getKey(self, record):
+        # The records of baselines without backends are float64 records.
+        return '{0}|{1}|{2}|{3}'.format(record['function'], record['method'],
+                                        record['steps'],
+                                        record.get('backend', 'float64'))
+
+    def _supports(self, calcType, backend):
+        if calcType == 'integral':
+            method = numerical.Integrated
+        else:
+            method = numerical.CALCULATIONS[calcType]
+        # The exact integral supports every backend.
+        return backend in getattr(method, 'BACKENDS', (backend,))
+
+
+def load(path):
+    """
+    Loads the records of a json file written by Benchmark.write.
+
+    Parameters
+    ----------
+    path : str
+        The path of the json file.
+
+    Returns
+    -------
+    list : The records of the file.
+    """
+    with open(path, 'r', encoding='utf-8') as file:
+        return json.load(file)['records']
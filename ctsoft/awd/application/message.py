@@ -9,16 +9,13 @@ import xml.etree.ElementTree as xmlee
 
 
 class Message(object):
-    def __init__(self, filepath):
+    def __init__(self, filepath, indexCache=None):
         self.__messages = {}
+        self.__indexCache = indexCache
         self._load(filepath)
 
     def getMessage(self, msgType):
-        for msg in self.__messages:
-            msgId = msg.attrib.get('id', '')
-            if msgId == msgType:
-                return msg.text
-        return ''
+        return self.__messages.get(msgType, '')
 
     def printWelcome(self):
         msgs = self._getWelcome()
@@ -33,5 +30,19 @@ class Message(object):
         return msg
 
     def _load(self, path):
-        root = xmlee.parse(path).getroot()
-        self.__messages = root.find('messages').findall('*')
+        if self.__indexCache is None:
+            self.__messages = parseMessages(path)
+        else:
+            self.__messages = self.__indexCache.get(path, 'messages',
+                                                    parseMessages)
+
+
+def parseMessages(path):
+    # Indexes the texts of the messages by their id.
+    root = xmlee.parse(path).getroot()
+    messages = {}
+
+    for msg in root.find('messages').findall('*'):
+        # The first message of an id wins like in a linear search.
+        messages.setdefault(msg.attrib.get('id', ''), msg.text)
+    return messages
@@ -7,47 +7,66 @@ Created on Sun Jun 10 15:26:52 2018
 
 import ctsoft.awd.application.message as message
 import ctsoft.awd.application.settings as settings
+import ctsoft.awd.application.xmlindex as xmlindex
 import ctsoft.awd.math.numerical as numerical
 from ctsoft.awd.math.model import Function
-#import ctsoft.awd.math.model as model
+import ctsoft.awd.math.model as model
 
 
 class Application(object):
-    def __init__(self):
+    # The budget of the startup (the imports and the loading of the settings
+    # and messages) in seconds.
+    STARTUP_BUDGET = 0.25
+
+    def __init__(self, indexDirectory=None):
         self.__function = None
-        self.__settings = settings.Settings()
+        # The settings and messages are indexed once. With a directory the
+        # indexes are stored until the xml files change.
+        indexCache = xmlindex.IndexCache(indexDirectory)
+        self.__settings = settings.Settings(indexCache=indexCache)
         msgFilename = self.__settings.getFile('messages.xml')
-        self.__message = message.Message(msgFilename)
+        self.__message = message.Message(msgFilename, indexCache)
 
     def calculateValues(self):
         results = []
 
-        setIntegrageted = self.getIntegratedSettings()
-        funcIntegrated = Function(**setIntegrageted)
-        integrated = numerical.Integrated(funcIntegrated)
+        settings = self.getFunctionSettings()
+        function = Function(**settings)
+
+        integrated = numerical.Integrated(function)
         resInt = integrated.calculate()
         results.append(resInt)
 
-        settings = self.getFunctionSettings()
-        function = Function(**settings)
+        # The ordinate values are evaluated once and shared by all methods.
+        sample = numerical.Sample(function)
 
         rectangle = numerical.Rectangle(function,
-                                        integrated.getCalculatedValue())
+                                        integrated.getCalculatedValue(),
+                                        sample)
         resRect = rectangle.calculate()
         results.append(resRect)
 
         trapezoid = numerical.Trapezoid(function,
-                                        integrated.getCalculatedValue())
+                                        integrated.getCalculatedValue(),
+                                        sample)
         resTrap = trapezoid.calculate()
         results.append(resTrap)
 
         simpson = numerical.Simpson(function,
-                                    integrated.getCalculatedValue())
+                                    integrated.getCalculatedValue(),
+                                    sample)
         resSim = simpson.calculate()
         results.append(resSim)
 
         self.printResults(results)
 
+    def calculateFused(self, funcStrings, methods=None):
+        # All function strings are integrated in one pass over the grid.
+        settings = self.getFunctionSettings()
+        settings['function'] = list(funcStrings)
+        fused = numerical.Fused(Function(**settings), methods)
+        self.printResults(fused.calculate())
+
     def getFunction(self):
         if self.__function is None:
             self.__function = Function()
@@ -56,24 +75,26 @@ class Application(object):
         return {'function': '4*r2*pi*(r1**2-x**2)**(1/2)',
                 'rCircle': 1.0, 'rTorus': 2.0, 'steps': 10}
 
-    def getIntegratedSettings(self):
-        return {'function': '2*r2*r1**2*pi**2',
-                'rCircle': 1.0, 'rTorus': 2.0, 'steps': 0}
-
     def printResults(self, results):
+        # The rows are formatted from the columns of the table, so a large
+        # table does not create a result object per row.
+        if not isinstance(results, model.ResultTable):
+            results = model.ResultTable.fromResults(results)
+
         for result in results:
             calcType = result.getCalculationType()
-            function = result.getFunction()
-            funcString = function.getFunction()
-            rCircle = function.getRCircle()
-            steps = function.getSteps()
-            calculated = result.getCalculatedValue()
+            funcString = result.getFunctionString()
+            rCircle = result.getRCircle()
+            steps = result.getSteps()
+            # The values of the mpmath backend are printed with all digits.
+            calculated = (result.getCalculatedText() or
+                          result.getCalculatedValue())
             
             print('--------------------------------------')
             print('Calculation Type: ', calcType, 'method')
             print('Function: ', funcString)
 
-            if calcType is 'integral':
+            if result.isOrigin():
                 print('calculated: ', calculated)
             else:
                 derivation = result.getDerivation()
@@ -83,9 +104,37 @@ class Application(object):
                 print('calculated: ', calculated)
                 print('derivation: ', derivation, '%')
 
+            if result.isEstimated():
+                print('evaluations: ', result.getEvaluations())
+                print('error estimate: ', result.getErrorEstimate())
+
+            if result.isSelected():
+                print('target error: ', result.getTargetError())
+                print('predicted error: ', result.getPredictedError())
+                print('achieved error: ', result.getAchievedError())
+                print('converged: ', result.isConverged())
+
+            if result.isInterval():
+                print('confidence interval: ', result.getLowerBound(),
+                      result.getUpperBound(), '({0:.0%})'.format(
+                          result.getConfidence()))
+
     def printWelcome(self):
         self.__message.printWelcome()
 
     def run(self):
         self.printWelcome()
         self.calculateValues()
+
+    def serve(self, path=None, host='127.0.0.1', port=None, workers=None):
+        import asyncio
+        import ctsoft.awd.application.service as service
+
+        server = service.Service(workers=workers)
+        try:
+            if path is None and port is None:
+                asyncio.run(server.serveStdin())
+            else:
+                asyncio.run(server.serveSocket(path, host, port))
+        finally:
+            server.shutdown()
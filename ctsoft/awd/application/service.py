@@ -0,0 +1,208 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 14:20:51 2026
+
+@author: ctsoft
+"""
+
+import asyncio
+import concurrent.futures
+import json
+import sys
+
+import ctsoft.awd.application.batch as batch
+import ctsoft.awd.math.cache as cache
+
+
+class Service(object):
+    """
+    Class for the resident service mode. Jobs are received as json lines
+    over a local socket or stdin, calculated by an executor and answered as
+    json lines. Concurrent identical jobs (same function, parameters,
+    methods and steps) are merged into one calculation.
+
+    Methods
+    -------
+    calculate:
+        Calculates a job or joins an identical pending calculation.
+    getStatistics:
+        Returns the numbers of received and coalesced jobs.
+    handleLine:
+        Answers one json line.
+    serveSocket:
+        Serves the jobs of the clients of a local socket.
+    serveStdin:
+        Serves the jobs of stdin.
+    """
+    def __init__(self, executor=None, workers=None):
+        if executor is None:
+            executor = concurrent.futures.ProcessPoolExecutor(workers)
+        self.__executor = executor
+        self.__pending = {}
+        self.__received = 0
+        self.__coalesced = 0
+
+    async def calculate(self, job):
+        """
+        Calculates a job in the executor. If an identical job is pending,
+        its calculation is awaited instead of starting a new one.
+
+        Parameters
+        ----------
+        job : dict
+            The job with the keys function, rCircle, rTorus, steps, methods
+            and optionally id.
+
+        Returns
+        -------
+        dict : The result record of the job with the id of this job.
+        """
+        self.__received += 1
+        key = self.getKey(job)
+        future = self.__pending.get(key)
+
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.run_in_executor(self.__executor, batch.runJob, job)
+            self.__pending[key] = future
+            future.add_done_callback(
+                lambda done: self.__pending.pop(key, None))
+        else:
+            self.__coalesced += 1
+
+        # Shields the shared calculation, so a cancelled client does not
+        # cancel the calculation of the other clients.
+        record = dict(await asyncio.shield(future))
+        record['id'] = job.get('id')
+        return record
+
+    def getKey(self, job):
+        """
+        Returns the key identifying identical jobs.
+
+        Parameters
+        ----------
+        job : dict
+            The job.
+
+        Returns
+        -------
+        tuple : The normalized function string, the parameters and the
+            methods of the job.
+        """
+        methods = job.get('methods')
+        return (cache.normalize(str(job.get('function'))),
+                float(job.get('rCircle')), float(job.get('rTorus')),
+                int(job.get('steps')),
+                tuple(methods) if methods else None)
+
+    def getStatistics(self):
+        """
+        Returns the numbers of received and coalesced jobs.
+
+        Returns
+        -------
+        dict : Dictonary with the keys: received, coalesced and pending.
+        """
+        return {'received': self.__received, 'coalesced': self.__coalesced,
+                'pending': len(self.__pending)}
+
+    async def handleLine(self, line):
+        """
+        Answers one json line. Invalid jobs are answered with an error
+        message.
+
+        Parameters
+        ----------
+        line : str
+            The json line of a job.
+
+        Returns
+        -------
+        str : The json line of the answer.
+        """
+        try:
+            job = json.loads(line)
+            record = await self.calculate(job)
+        except (TypeError, ValueError, AttributeError) as error:
+            record = {'error': '{0}: {1}'.format(type(error).__name__,
+                                                 error)}
+        return json.dumps(record) + '\n'
+
+    async def serveSocket(self, path=None, host='127.0.0.1', port=None):
+        """
+        Serves the jobs of the clients of a unix socket or, without a path,
+        of a tcp socket. Each client may send several jobs, the answers are
+        sent in the order of completion.
+
+        Parameters
+        ----------
+        path : str
+            The path of the unix socket.
+        host : str
+            The host of the tcp socket.
+        port : int
+            The port of the tcp socket.
+        """
+        if path is not None:
+            server = await asyncio.start_unix_server(self._handleClient,
+                                                     path=path)
+        else:
+            server = await asyncio.start_server(self._handleClient, host,
+                                                port)
+        async with server:
+            await server.serve_forever()
+
+    async def serveStdin(self):
+        """
+        Serves the jobs of stdin and writes the answers to stdout until
+        stdin is closed.
+        """
+        loop = asyncio.get_running_loop()
+        tasks = set()
+
+        async def answer(line):
+            sys.stdout.write(await self.handleLine(line))
+            sys.stdout.flush()
+
+        while True:
+            # Reading stdin blocks, so it is done in a thread.
+            line = await loop.run_in_executor(None, sys.stdin.readline)
+            if not line:
+                break
+            if line.strip():
+                task = asyncio.ensure_future(answer(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    def shutdown(self):
+        """
+        Shuts the executor down.
+        """
+        self.__executor.shutdown()
+
+    async def _handleClient(self, reader, writer):
+        lock = asyncio.Lock()
+        tasks = set()
+
+        async def answer(line):
+            response = await self.handleLine(line)
+            async with lock:
+                writer.write(response.encode('utf-8'))
+                await writer.drain()
+
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            if line.strip():
+                task = asyncio.ensure_future(answer(line.decode('utf-8')))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+
+        if tasks:
+            await asyncio.gather(*tasks)
+        writer.close()
@@ -9,30 +9,42 @@ import xml.etree.ElementTree as xmlee
 
 
 class Settings(object):
-    def __init__(self):
-        self.__filename = 'settings.xml'
-        self.__settings = {}
+    def __init__(self, filename='settings.xml', indexCache=None):
+        self.__filename = filename
+        self.__settings = None
+        self.__files = {}
+        self.__indexCache = indexCache
 
         self._load()
 
     def get(self, settingType):
+        # The element tree is parsed on demand only, the files are looked up
+        # in the index.
+        if self.__settings is None:
+            self.__settings = xmlee.parse(self.__filename).getroot()
         return self.__settings.find(settingType)
 
     def getFile(self, filename):
-        fileContainer = self.get('files')
-        files = fileContainer.findall('file')
-
-        for file in files:
-            name = file.find('name')
-            if name.text == filename:
-                filePath = file.find('path').text
-                if filePath == '/':
-                    path = ''
-                else:
-                    path = filePath
-                return path + filename
-        return None
+        return self.__files.get(filename)
 
     def _load(self):
-        root = xmlee.parse(self.__filename).getroot()
-        self.__settings = root
+        if self.__indexCache is None:
+            self.__files = parseFiles(self.__filename)
+        else:
+            self.__files = self.__indexCache.get(self.__filename, 'settings',
+                                                 parseFiles)
+
+
+def parseFiles(path):
+    # Indexes the paths of the files by their name.
+    root = xmlee.parse(path).getroot()
+    files = {}
+
+    for file in root.find('files').findall('file'):
+        filename = file.find('name').text
+        filePath = file.find('path').text
+        if filePath == '/':
+            filePath = ''
+        # The first entry of a name wins like in a linear search.
+        files.setdefault(filename, filePath + filename)
+    return files
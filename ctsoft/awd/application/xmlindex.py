@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 17:42:10 2026
+
+@author: ctsoft
+"""
+
+import hashlib
+import json
+import os
+
+import ctsoft.awd.math.cache as cache
+
+
+class IndexCache(object):
+    """
+    Persistent cache of the dictionary indexes of xml files. An index is
+    stored as json file together with the modification time and the size of
+    its xml file, so the xml file is parsed again only if it has changed.
+
+    Methods
+    -------
+    get:
+        Returns the index of a xml file.
+    getDirectory:
+        Returns the directory of the stored indexes.
+    setDirectory:
+        Sets the directory of the stored indexes.
+    """
+    def __init__(self, directory=None):
+        self.__directory = directory
+
+    def get(self, path, name, parse):
+        """
+        Returns the index of the xml file. The stored index is used if the
+        modification time and the size of the xml file are unchanged,
+        otherwise the xml file is parsed and the index is stored.
+
+        Parameters
+        ----------
+        path : str
+            The path of the xml file.
+        name : str
+            The name of the index, e.g. settings or messages.
+        parse : callable
+            Creates the index (a json serializable dictionary) from the path
+            of the xml file.
+
+        Returns
+        -------
+        dict : The index of the xml file.
+        """
+        source = os.path.abspath(path)
+        if self.__directory is None:
+            return parse(source)
+
+        status = os.stat(source)
+        stamp = [status.st_mtime_ns, status.st_size]
+        key = hashlib.sha256(source.encode('utf-8')).hexdigest()
+        cachePath = os.path.join(self.__directory,
+                                 'index-{0}-{1}.json'.format(name, key))
+
+        try:
+            with open(cachePath, 'r', encoding='utf-8') as file:
+                stored = json.load(file)
+            if stored['source'] == source and stored['stamp'] == stamp:
+                return stored['index']
+        except (IOError, ValueError, KeyError):
+            pass
+
+        index = parse(source)
+        self._store(cachePath, {'source': source, 'stamp': stamp,
+                                'index': index})
+        return index
+
+    def getDirectory(self):
+        """
+        Returns the directory of the stored indexes.
+
+        Returns
+        -------
+        str : The directory or None if the indexes are not stored.
+        """
+        return self.__directory
+
+    def setDirectory(self, directory):
+        """
+        Sets the directory of the stored indexes.
+
+        Parameters
+        ----------
+        directory : str
+            The directory or None to parse the xml files every time.
+        """
+        self.__directory = directory
+
+    def _store(self, cachePath, stored):
+        # The index is only an optimization, so the startup does not fail,
+        # if the directory is not writable.
+        try:
+            cache.replaceFile(cachePath,
+                              lambda file: json.dump(stored, file))
+        except OSError:
+            pass
@@ -0,0 +1,742 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 20:12:05 2026
+
+@author: ctsoft
+"""
+
+import collections
+import hashlib
+import inspect
+import os
+import tempfile
+import threading
+
+import numpy
+
+
+class CompiledExpression(object):
+    """
+    Container of a parsed function string and its compiled kernel.
+
+    Methods
+    -------
+    getExpression:
+        Returns the parsed sympy expression.
+    getKernel:
+        Returns the numpy vectorized callable of the expression.
+    getReplacements:
+        Returns the common subexpressions of the kernel.
+    getSource:
+        Returns the generated source code of the kernel.
+    getSymbols:
+        Returns the symbols used as arguments of the kernel.
+    """
+    def __init__(self, expression, symbols, kernel, replacements=()):
+        self.__expression = expression
+        self.__symbols = symbols
+        self.__kernel = kernel
+        self.__replacements = replacements
+
+    def getExpression(self):
+        """
+        Returns the parsed sympy expression.
+
+        Returns
+        -------
+        sympy.Expr : The parsed function string.
+        """
+        return self.__expression
+
+    def getKernel(self):
+        """
+        Returns the numpy vectorized callable of the expression.
+
+        Returns
+        -------
+        callable : The kernel with the symbols as positional arguments.
+        """
+        return self.__kernel
+
+    def getReplacements(self):
+        """
+        Returns the common subexpressions, which the kernel calculates only
+        once per call.
+
+        Returns
+        -------
+        tuple : Pairs of the sympy symbol and the subexpression assigned to it
+            (empty if no subexpressions were eliminated).
+        """
+        return self.__replacements
+
+    def getSource(self):
+        """
+        Returns the source code, which sympy generated for the kernel.
+
+        Returns
+        -------
+        str : The python source code of the kernel.
+        """
+        return inspect.getsource(self.__kernel)
+
+    def getSymbols(self):
+        """
+        Returns the symbols used as arguments of the kernel.
+
+        Returns
+        -------
+        tuple : The sympy symbols in the order of the kernel arguments.
+        """
+        return self.__symbols
+
+
+class ExpressionCache(object):
+    """
+    Bounded cache of compiled function strings with least recently used
+    eviction. The cache is safe to use from several threads.
+
+    Methods
+    -------
+    clear:
+        Removes all entries and resets the counters.
+    get:
+        Returns the compiled expression of a function string.
+    getHits:
+        Returns the number of lookups served from the cache.
+    getMaxSize:
+        Returns the maximal number of entries.
+    getMisses:
+        Returns the number of lookups which needed a compilation.
+    getSize:
+        Returns the current number of entries.
+    getStatistics:
+        Returns all counters as dictionary.
+    lookup:
+        Returns the compiled expression and whether it was cached.
+    """
+    def __init__(self, maxSize=128):
+        self.__entries = collections.OrderedDict()
+        self.__maxSize = maxSize
+        self.__hits = 0
+        self.__misses = 0
+        self.__lock = threading.Lock()
+
+    def clear(self):
+        """
+        Removes all entries and resets the hit and miss counters.
+        """
+        with self.__lock:
+            self.__entries.clear()
+            self.__hits = 0
+            self.__misses = 0
+
+    def get(self, funcString, symbols, modules='numpy', values=None,
+            digits=None):
+        """
+        Returns the compiled expression of the function string. The function
+        string is parsed and compiled only if it is not cached yet.
+
+        Parameters
+        ----------
+        funcString : str
+            The function string to compile.
+        symbols : tuple
+            The sympy symbols used as arguments of the kernel.
+        modules : str
+            The module evaluating the kernel, numpy or mpmath.
+        values : tuple
+            The fixed values of the symbols after the first one, see
+            specialize.
+        digits : int
+            The number of decimal digits of the folded constants.
+
+        Returns
+        -------
+        ctsoft.awd.math.cache.CompiledExpression : The parsed and compiled
+            function string.
+        """
+        return self.lookup(funcString, symbols, modules, values, digits)[0]
+
+    def lookup(self, funcString, symbols, modules='numpy', values=None,
+               digits=None):
+        """
+        Returns the compiled expression of the function string. The function
+        string is parsed and compiled only if it is not cached yet.
+
+        If values are given, the expression is specialized on them: the
+        kernel takes the first symbol only and the values are bound to it.
+
+        A list of function strings is compiled into one fused kernel, which
+        returns the list of their values.
+
+        Parameters
+        ----------
+        funcString : str or list
+            The function string to compile or a list of function strings.
+        symbols : tuple
+            The sympy symbols used as arguments of the kernel.
+        modules : str
+            The module evaluating the kernel, numpy or mpmath.
+        values : tuple
+            The fixed values of the symbols after the first one, see
+            specialize.
+        digits : int
+            The number of decimal digits of the folded constants.
+
+        Returns
+        -------
+        tuple : The parsed and compiled function string
+            (ctsoft.awd.math.cache.CompiledExpression) and whether it was
+            served from the cache.
+        """
+        if isinstance(funcString, str):
+            normalized = normalize(funcString)
+        else:
+            normalized = tuple(normalize(single) for single in funcString)
+        key = (normalized, tuple(str(s) for s in symbols), modules)
+        if values is not None:
+            key += (tuple(values), digits)
+
+        with self.__lock:
+            compiled = self.__entries.get(key)
+            if compiled is not None:
+                self.__hits += 1
+                self.__entries.move_to_end(key)
+                return (compiled, True)
+            self.__misses += 1
+
+        # sympy is imported on the first compilation only, because its
+        # import dominates the startup time of the application.
+        import sympy
+
+        # The compilation is done outside of the lock, so a slow parsing does
+        # not block the lookups of other threads.
+        if isinstance(normalized, str):
+            expression = sympy.sympify(normalized)
+        else:
+            expression = [sympy.sympify(single) for single in normalized]
+        if values is None:
+            kernel = sympy.lambdify(symbols, expression, modules=modules)
+            compiled = CompiledExpression(expression, tuple(symbols), kernel)
+        else:
+            compiled = specialize(expression, symbols, values, modules,
+                                  digits)
+
+        with self.__lock:
+            self.__entries[key] = compiled
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__maxSize:
+                self.__entries.popitem(last=False)
+
+        return (compiled, False)
+
+    def getHits(self):
+        """
+        Returns the number of lookups served from the cache.
+
+        Returns
+        -------
+        int : The number of cache hits.
+        """
+        return self.__hits
+
+    def getMaxSize(self):
+        """
+        Returns the maximal number of entries.
+
+        Returns
+        -------
+        int : The maximal number of cached expressions.
+        """
+        return self.__maxSize
+
+    def getMisses(self):
+        """
+        Returns the number of lookups which needed a compilation.
+
+        Returns
+        -------
+        int : The number of cache misses.
+        """
+        return self.__misses
+
+    def getSize(self):
+        """
+        Returns the current number of entries.
+
+        Returns
+        -------
+        int : The number of cached expressions.
+        """
+        return len(self.__entries)
+
+    def getStatistics(self):
+        """
+        Returns all counters of the cache.
+
+        Returns
+        -------
+        dict : Dictonary with the keys: hits, misses, size and maxSize.
+        """
+        with self.__lock:
+            return {'hits': self.__hits, 'misses': self.__misses,
+                    'size': len(self.__entries), 'maxSize': self.__maxSize}
+
+
+class NodeCache(object):
+    """
+    Cache of the nodes and weights of the gauss legendre quadrature by their
+    order. The tables are kept in memory and, if a directory is set, stored
+    as npy files, so they are computed only once across processes.
+
+    The orders are limited to MAX_ORDER, because the computation of the
+    nodes costs O(order**2) (see getGaussLegendre).
+
+    Methods
+    -------
+    clear:
+        Removes all tables from the memory.
+    get:
+        Returns the nodes and weights of an order.
+    getDirectory:
+        Returns the directory of the stored tables.
+    setDirectory:
+        Sets the directory of the stored tables.
+    """
+    # The maximal order of the cached tables.
+    MAX_ORDER = 20000
+
+    def __init__(self, directory=None):
+        self.__tables = {}
+        self.__directory = directory
+        self.__lock = threading.Lock()
+
+    def clear(self):
+        """
+        Removes all tables from the memory. Stored files are kept.
+        """
+        with self.__lock:
+            self.__tables.clear()
+
+    def get(self, order):
+        """
+        Returns the nodes and weights of the gauss legendre quadrature of the
+        given order on the interval [-1, 1].
+
+        Parameters
+        ----------
+        order : int
+            The number of nodes.
+
+        Returns
+        -------
+        tuple : The arrays of the nodes and the weights.
+        """
+        if not 1 <= order <= self.MAX_ORDER:
+            raise ValueError('The order of the gauss legendre quadrature '
+                             'must be between 1 and {0}, not {1}.'.format(
+                                 self.MAX_ORDER, order))
+        with self.__lock:
+            table = self.__tables.get(order)
+        if table is not None:
+            return table
+
+        table = self._load(order)
+        if table is None:
+            table = getGaussLegendre(order)
+            self._store(order, table)
+
+        with self.__lock:
+            self.__tables[order] = table
+        return table
+
+    def getDirectory(self):
+        """
+        Returns the directory of the stored tables.
+
+        Returns
+        -------
+        str : The directory or None if the tables are kept in memory only.
+        """
+        return self.__directory
+
+    def setDirectory(self, directory):
+        """
+        Sets the directory of the stored tables.
+
+        Parameters
+        ----------
+        directory : str
+            The directory or None to keep the tables in memory only.
+        """
+        self.__directory = directory
+
+    def _getPath(self, order):
+        return os.path.join(self.__directory,
+                            'gauss-legendre-{0}.npy'.format(order))
+
+    def _load(self, order):
+        if self.__directory is None:
+            return None
+        try:
+            table = numpy.load(self._getPath(order))
+        except (IOError, ValueError):
+            return None
+        return (table[0], table[1])
+
+    def _store(self, order, table):
+        if self.__directory is None:
+            return
+        replaceFile(self._getPath(order),
+                    lambda file: numpy.save(file, numpy.vstack(table)), 'wb')
+
+
+class SymbolicCache(object):
+    """
+    Persistent cache of symbolic results of function strings, e.g. the
+    antiderivative. The results are kept in memory and stored as text files
+    named by the hash of the normalized function string, the symbols and the
+    sympy version, so the slow symbolic calculation runs only once per
+    function string across processes.
+
+    Methods
+    -------
+    clear:
+        Removes all results from the memory.
+    get:
+        Returns the symbolic result of a function string.
+    getDirectory:
+        Returns the directory of the stored results.
+    setDirectory:
+        Sets the directory of the stored results.
+    """
+    def __init__(self, name, directory=None):
+        self.__name = name
+        self.__results = {}
+        self.__directory = directory
+        self.__lock = threading.Lock()
+
+    def clear(self):
+        """
+        Removes all results from the memory. Stored files are kept.
+        """
+        with self.__lock:
+            self.__results.clear()
+
+    def get(self, funcString, symbols, derive):
+        """
+        Returns the symbolic result of the function string. The result is
+        derived only if it is neither in memory nor stored.
+
+        Parameters
+        ----------
+        funcString : str
+            The function string.
+        symbols : tuple
+            The sympy symbols of the function string.
+        derive : callable
+            Calculates the result from the parsed function string.
+
+        Returns
+        -------
+        str : The symbolic result as function string.
+        """
+        # The symbols are sympy symbols, so sympy is imported already.
+        import sympy
+
+        # Another sympy version may find another result, so its results are
+        # stored separately.
+        key = hashlib.sha256(repr((normalize(funcString),
+                                   tuple(str(s) for s in symbols),
+                                   sympy.__version__)
+                                  ).encode('utf-8')).hexdigest()
+
+        with self.__lock:
+            result = self.__results.get(key)
+        if result is not None:
+            return result
+
+        result = self._load(key)
+        if result is None:
+            expression = expressions.get(funcString, symbols).getExpression()
+            result = str(derive(expression))
+            self._store(key, result)
+
+        with self.__lock:
+            self.__results[key] = result
+        return result
+
+    def getDirectory(self):
+        """
+        Returns the directory of the stored results.
+
+        Returns
+        -------
+        str : The directory or None if the results are kept in memory only.
+        """
+        return self.__directory
+
+    def setDirectory(self, directory):
+        """
+        Sets the directory of the stored results.
+
+        Parameters
+        ----------
+        directory : str
+            The directory or None to keep the results in memory only.
+        """
+        self.__directory = directory
+
+    def _getPath(self, key):
+        return os.path.join(self.__directory,
+                            '{0}-{1}.txt'.format(self.__name, key))
+
+    def _load(self, key):
+        if self.__directory is None:
+            return None
+        try:
+            with open(self._getPath(key), 'r', encoding='utf-8') as file:
+                return file.read()
+        except IOError:
+            return None
+
+    def _store(self, key, result):
+        if self.__directory is None:
+            return
+        replaceFile(self._getPath(key), lambda file: file.write(result))
+
+
+def getDirectory():
+    """
+    Returns the default directory of the persistent caches. It is set by the
+    environment variable CTSOFT_AWD_CACHE and defaults to ~/.cache/ctsoft-awd.
+
+    Returns
+    -------
+    str : The directory of the persistent caches.
+    """
+    directory = os.environ.get('CTSOFT_AWD_CACHE')
+    if not directory:
+        directory = os.path.join(os.path.expanduser('~'), '.cache',
+                                 'ctsoft-awd')
+    return directory
+
+
+def replaceFile(path, write, mode='w'):
+    """
+    Writes a file by writing a temporary file in the same directory first,
+    which then replaces the file, so concurrent processes never read a
+    partially written file. The directory is created if needed.
+
+    Parameters
+    ----------
+    path : str
+        The path of the file.
+    write : callable
+        Writes the content to the opened temporary file.
+    mode : str
+        The mode of the temporary file, w for utf-8 text or wb for bytes.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    (handle, temporary) = tempfile.mkstemp(
+        dir=directory, suffix=os.path.splitext(path)[1])
+    try:
+        encoding = None if 'b' in mode else 'utf-8'
+        with os.fdopen(handle, mode, encoding=encoding) as file:
+            write(file)
+        os.replace(temporary, path)
+    except BaseException:
+        # Removes the temporary file of a failed write.
+        try:
+            os.remove(temporary)
+        except OSError:
+            pass
+        raise
+
+
+def getGaussLegendre(order):
+    """
+    Returns the nodes and weights of the gauss legendre quadrature of the
+    given order on the interval [-1, 1].
+
+    Small orders are solved by the eigenvalues of the companion matrix
+    (numpy.polynomial.legendre.leggauss), which costs O(order**3) time and
+    O(order**2) memory. Larger orders refine the asymptotic approximations
+    of the nodes by newton iterations on the three term recurrence of the
+    legendre polynomials, which costs O(order**2) time and O(order) memory.
+
+    Parameters
+    ----------
+    order : int
+        The number of nodes.
+
+    Returns
+    -------
+    tuple : The arrays of the nodes in ascending order and the weights.
+    """
+    if order <= EIGEN_ORDER:
+        return numpy.polynomial.legendre.leggauss(order)
+
+    # The nodes are symmetric, so only the non negative ones are calculated
+    # (in descending order) starting at the approximation of Tricomi.
+    indices = numpy.arange(1, (order + 1) // 2 + 1)
+    theta = numpy.pi * (4 * indices - 1) / (4 * order + 2)
+    nodes = (1.0 - (order - 1) / (8.0 * order ** 3)) * numpy.cos(theta)
+    for iteration in range(NEWTON_ITERATIONS):
+        (value, derivative) = getLegendre(order, nodes)
+        correction = value / derivative
+        nodes -= correction
+        if numpy.max(numpy.abs(correction)) <= 1e-15:
+            break
+    (value, derivative) = getLegendre(order, nodes)
+    weights = 2.0 / ((1.0 - nodes ** 2) * derivative ** 2)
+
+    # The node 0 of an odd order is not mirrored.
+    mirrored = slice(None) if order % 2 == 0 else slice(None, -1)
+    return (numpy.concatenate((-nodes[mirrored], nodes[::-1])),
+            numpy.concatenate((weights[mirrored], weights[::-1])))
+
+
+def getLegendre(order, xValues):
+    """
+    Returns the legendre polynomial of the given order and its derivative by
+    the three term recurrence.
+
+    Parameters
+    ----------
+    order : int
+        The degree of the polynomial.
+    xValues : numpy.ndarray
+        The abscissa values inside (-1, 1).
+
+    Returns
+    -------
+    tuple : The values of the polynomial and its derivative.
+    """
+    previous = numpy.ones_like(xValues)
+    current = xValues.copy()
+    for degree in range(2, order + 1):
+        (previous, current) = (current, ((2 * degree - 1) * xValues * current -
+                                         (degree - 1) * previous) / degree)
+    derivative = order * (xValues * current - previous) / (xValues ** 2 - 1.0)
+    return (current, derivative)
+
+
+def specialize(expression, symbols, values, modules='numpy', digits=None):
+    """
+    Specializes an expression on fixed values of all symbols but the first
+    one. The number symbols (e.g. pi) are folded into constants and the
+    common subexpressions are eliminated, so the kernel computes every
+    subexpression only once per call.
+
+    The fixed values stay arguments of the compiled kernel and are bound to
+    it, so they enter the calculation by the same float operations as the
+    abscissa grid (e.g. r1**2 - x**2 never becomes negative at the bound
+    x = r1 by a separately rounded constant r1**2).
+
+    Parameters
+    ----------
+    expression : sympy.Expr or list
+        The parsed function string or a list of them, which share their
+        common subexpressions in one kernel.
+    symbols : tuple
+        The sympy symbols of the expression, the first one stays variable.
+    values : tuple
+        The fixed values of the other symbols in the same order.
+    modules : str
+        The module evaluating the kernel, numpy or mpmath.
+    digits : int
+        The number of decimal digits of the folded constants (None for the
+        precision of a float).
+
+    Returns
+    -------
+    ctsoft.awd.math.cache.CompiledExpression : The specialized expression
+        with its kernel of the first symbol.
+    """
+    import sympy
+
+    if digits is None:
+        # 17 decimal digits represent every double exactly.
+        digits = 17
+    if modules == 'mpmath':
+        import mpmath
+
+        # The conversion of a float to a mpf is exact, so the fixed values
+        # are combined in the precision of the calculation.
+        values = tuple(mpmath.mpf(value) for value in values)
+    else:
+        values = tuple(values)
+    fused = isinstance(expression, list)
+    if not fused:
+        expression = [expression]
+
+    specialized = []
+    for single in expression:
+        constants = {constant: constant.evalf(digits)
+                     for constant in single.atoms(sympy.NumberSymbol)}
+        specialized.append(single.xreplace(constants))
+    if not fused:
+        specialized = specialized[0]
+
+    (replacements, reduced) = sympy.cse(specialized)
+    kernel = sympy.lambdify(tuple(symbols), specialized, modules=modules,
+                            cse=True)
+    return CompiledExpression(reduced if fused else reduced[0],
+                              (symbols[0],), bind(kernel, values),
+                              tuple(replacements))
+
+
+def bind(kernel, values):
+    """
+    Binds fixed values to the arguments after the first one of a kernel.
+
+    Parameters
+    ----------
+    kernel : callable
+        The kernel with the variable as first argument.
+    values : tuple
+        The values of the other arguments.
+
+    Returns
+    -------
+    callable : The kernel of the first argument only, its source is the one
+        of the wrapped kernel.
+    """
+    def bound(xValues):
+        return kernel(xValues, *values)
+
+    bound.__wrapped__ = kernel
+    return bound
+
+
+def normalize(funcString):
+    """
+    Normalizes a function string by removing all whitespace, so equal
+    function strings share one cache entry.
+
+    Parameters
+    ----------
+    funcString : str
+        The function string to normalize.
+
+    Returns
+    -------
+    str : The normalized function string.
+    """
+    return ''.join(funcString.split())
+
+
+# The maximal order of the gauss legendre nodes solved as eigenvalues.
+EIGEN_ORDER = 100
+# The maximal number of newton iterations of the gauss legendre nodes.
+NEWTON_ITERATIONS = 10
+
+# The process wide caches shared by all calculation objects.
+expressions = ExpressionCache()
+nodes = NodeCache()
+antiderivatives = SymbolicCache('antiderivative', getDirectory())
+definites = SymbolicCache('definite', getDirectory())
+complements = SymbolicCache('complement', getDirectory())
@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 19:16:48 2026
+
+@author: ctsoft
+"""
+
+import hashlib
+import json
+import os
+import time
+
+import numpy
+
+
+class Checkpoint(object):
+    """
+    Memory mapped file with the progress of a long running calculation, so
+    an interrupted calculation can be resumed at its last checkpoint.
+
+    The file holds a header with the key of the calculation and two slots of
+    the running state: the next abscissa index and the uncompensated sum and
+    compensation of a compensated sum. A state is written to the unused slot
+    first and then activated by the sequence number, so an interruption
+    never leaves a half written state. After the header follow a table of
+    values and the flags of the completed rows of the table, e.g. the
+    partial sums of the blocks of the parallel mode or the results of the
+    parameter sets of a sweep.
+
+    The memory mapped pages survive the interruption of the process, they
+    are flushed to the disk every interval seconds.
+
+    Methods
+    -------
+    close:
+        Flushes and closes the file.
+    flush:
+        Writes the mapped pages to the disk.
+    getDone:
+        Returns the flags of the completed rows.
+    getPath:
+        Returns the path of the file.
+    getState:
+        Returns the running state of the last checkpoint.
+    getValues:
+        Returns the table of values.
+    open:
+        Opens the file for a calculation.
+    remove:
+        Closes and deletes the file.
+    setDone:
+        Stores the values of a completed row.
+    setState:
+        Stores the running state.
+    """
+    # The identification of the file format.
+    MAGIC = b'AWDCKPT1'
+    # The layout of the header.
+    HEADER = numpy.dtype([('magic', 'S8'), ('key', 'S64'), ('size', '<i8'),
+                          ('width', '<i8'), ('sequence', '<i8'),
+                          ('slots', [('position', '<i8'), ('summe', '<f8'),
+                                     ('compensation', '<f8')], (2,))])
+
+    def __init__(self, path, interval=10.0, resume=True):
+        self.__path = path
+        self.__interval = interval
+        self.__resume = resume
+        self.__mapped = None
+        self.__header = None
+        self.__values = None
+        self.__done = None
+        self.__flushed = None
+
+    def close(self):
+        """
+        Flushes and closes the file.
+        """
+        if self.__mapped is not None:
+            self.flush()
+        self.__mapped = None
+        self.__header = None
+        self.__values = None
+        self.__done = None
+
+    def flush(self):
+        """
+        Writes the mapped pages to the disk.
+        """
+        self.__mapped.flush()
+        self.__flushed = time.monotonic()
+
+    def getDone(self):
+        """
+        Returns the flags of the completed rows.
+
+        Returns
+        -------
+        numpy.ndarray : The flags of the rows of the table as bool array.
+        """
+        return self.__done.astype(bool)
+
+    def getPath(self):
+        """
+        Returns the path of the file.
+
+        Returns
+        -------
+        str : The path of the checkpoint file.
+        """
+        return self.__path
+
+    def getState(self):
+        """
+        Returns the running state of the last checkpoint.
+
+        Returns
+        -------
+        tuple : The next abscissa index, the uncompensated sum and the
+            compensation (0, 0.0 and 0.0 for a new calculation).
+        """
+        header = self.__header[0]
+        slot = header['slots'][header['sequence'] % 2]
+        return (int(slot['position']), float(slot['summe']),
+                float(slot['compensation']))
+
+    def getValues(self):
+        """
+        Returns the table of values.
+
+        Returns
+        -------
+        numpy.ndarray : The memory mapped values with the shape (size,
+            width).
+        """
+        return self.__values
+
+    def open(self, key, size=0, width=1):
+        """
+        Opens the file for a calculation. The stored progress is kept, if
+        the checkpoint resumes and the file belongs to the same calculation,
+        otherwise the file is created again.
+
+        Parameters
+        ----------
+        key : str
+            The key of the calculation, see getKey.
+        size : int
+            The number of rows of the table.
+        width : int
+            The number of values per row.
+        """
+        self.close()
+        encoded = key.encode('ascii')
+        valueBytes = 8 * size * width
+        length = self.HEADER.itemsize + valueBytes + size
+
+        if not (self.__resume and self._matches(encoded, size, width,
+                                                length)):
+            directory = os.path.dirname(os.path.abspath(self.__path))
+            os.makedirs(directory, exist_ok=True)
+            mapped = numpy.memmap(self.__path, dtype=numpy.uint8, mode='w+',
+                                  shape=(length,))
+            header = mapped[:self.HEADER.itemsize].view(self.HEADER)
+            header['magic'] = self.MAGIC
+            header['key'] = encoded
+            header['size'] = size
+            header['width'] = width
+            mapped.flush()
+        else:
+            mapped = numpy.memmap(self.__path, dtype=numpy.uint8, mode='r+',
+                                  shape=(length,))
+
+        start = self.HEADER.itemsize
+        self.__mapped = mapped
+        self.__header = mapped[:start].view(self.HEADER)
+        self.__values = mapped[start:start + valueBytes].view(
+            '<f8').reshape((size, width))
+        self.__done = mapped[start + valueBytes:]
+        self.__flushed = time.monotonic()
+
+    def remove(self):
+        """
+        Closes and deletes the file, e.g. after the calculation finished.
+        """
+        self.close()
+        try:
+            os.remove(self.__path)
+        except FileNotFoundError:
+            pass
+
+    def setDone(self, index, values):
+        """
+        Stores the values of a completed row. The values are written before
+        the flag, so an interrupted row is calculated again.
+
+        Parameters
+        ----------
+        index : int or numpy.ndarray
+            The index of the row or of several rows.
+        values : numpy.ndarray
+            The values of the rows.
+        """
+        self.__values[index] = values
+        self.__done[index] = 1
+        self._flushDue()
+
+    def setState(self, position, summe, compensation):
+        """
+        Stores the running state in the unused slot and activates it.
+
+        Parameters
+        ----------
+        position : int
+            The next abscissa index.
+        summe : double
+            The uncompensated sum.
+        compensation : double
+            The compensation.
+        """
+        header = self.__header
+        sequence = int(header['sequence'][0]) + 1
+        slots = header['slots']
+        slots['position'][0, sequence % 2] = position
+        slots['summe'][0, sequence % 2] = summe
+        slots['compensation'][0, sequence % 2] = compensation
+        header['sequence'] = sequence
+        self._flushDue()
+
+    def _flushDue(self):
+        if time.monotonic() - self.__flushed >= self.__interval:
+            self.flush()
+
+    def _matches(self, encoded, size, width, length):
+        # Checks whether the existing file belongs to the calculation.
+        try:
+            if os.path.getsize(self.__path) != length:
+                return False
+            header = numpy.fromfile(self.__path, dtype=self.HEADER, count=1)
+        except OSError:
+            return False
+        return (len(header) == 1 and header['magic'][0] == self.MAGIC and
+                header['key'][0] == encoded and
+                header['size'][0] == size and header['width'][0] == width)
+
+    @staticmethod
+    def getKey(description):
+        """
+        Returns the key of a calculation.
+
+        Parameters
+        ----------
+        description : dict
+            The json serializable values defining the calculation.
+
+        Returns
+        -------
+        str : The hex encoded sha256 hash of the description.
+        """
+        return hashlib.sha256(json.dumps(description, sort_keys=True).encode(
+            'utf-8')).hexdigest()
@@ -0,0 +1,287 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 10:31:52 2026
+
+@author: ctsoft
+"""
+
+import json
+import logging
+import threading
+import time
+
+
+class Instrumentation(object):
+    """
+    Class for the opt-in instrumentation of the calculation objects. Each
+    calculation gets its own recorder, whose metrics are sent to all sinks
+    when the calculation is finished.
+
+    Methods
+    -------
+    addSink:
+        Adds a sink which receives the metrics of each calculation.
+    begin:
+        Returns a new recorder for one calculation.
+    emit:
+        Sends the metrics of a calculation to all sinks.
+    """
+    def __init__(self, sinks=None):
+        if sinks is None:
+            sinks = []
+        self.__sinks = list(sinks)
+
+    def addSink(self, sink):
+        """
+        Adds a sink which receives the metrics of each calculation.
+
+        Parameters
+        ----------
+        sink : object
+            An object with the method emit(metrics).
+        """
+        self.__sinks.append(sink)
+
+    def begin(self, calcType):
+        """
+        Returns a new recorder for one calculation.
+
+        Parameters
+        ----------
+        calcType : str
+            The calculation type of the calculation.
+
+        Returns
+        -------
+        ctsoft.awd.math.instrumentation.Recorder : The recorder of the
+            calculation.
+        """
+        return Recorder(self, calcType)
+
+    def emit(self, metrics):
+        """
+        Sends the metrics of a calculation to all sinks.
+
+        Parameters
+        ----------
+        metrics : dict
+            The metrics of the calculation.
+        """
+        for sink in self.__sinks:
+            sink.emit(metrics)
+
+
+class NullInstrumentation(object):
+    """
+    Class for the disabled instrumentation. All calculations share one
+    recorder which records nothing.
+    """
+    def addSink(self, sink):
+        raise ValueError('The disabled instrumentation has no sinks.')
+
+    def begin(self, calcType):
+        return NULL_RECORDER
+
+    def emit(self, metrics):
+        pass
+
+
+class Recorder(object):
+    """
+    Class for the metrics of one calculation: the wall time of the phases,
+    e.g. parse, substitute, evaluate and sum, and counters, e.g. the number
+    of evaluations and expression cache hits.
+
+    Methods
+    -------
+    count:
+        Increments a counter.
+    finish:
+        Finishes the calculation and sends the metrics to the sinks.
+    getMetrics:
+        Returns the recorded metrics.
+    phase:
+        Returns a context manager measuring the wall time of a phase.
+    """
+    def __init__(self, instrumentation, calcType):
+        self.__instrumentation = instrumentation
+        self.__calcType = calcType
+        self.__phases = {}
+        self.__counters = {}
+        self.__start = time.perf_counter()
+        self.__total = None
+
+    def count(self, name, value=1):
+        """
+        Increments a counter.
+
+        Parameters
+        ----------
+        name : str
+            The name of the counter.
+        value : int
+            The value to add.
+        """
+        self.__counters[name] = self.__counters.get(name, 0) + value
+
+    def finish(self):
+        """
+        Finishes the calculation and sends the metrics to the sinks.
+
+        Returns
+        -------
+        dict : The metrics of the calculation.
+        """
+        self.__total = time.perf_counter() - self.__start
+        metrics = self.getMetrics()
+        self.__instrumentation.emit(metrics)
+        return metrics
+
+    def getMetrics(self):
+        """
+        Returns the recorded metrics.
+
+        Returns
+        -------
+        dict : Dictonary with the keys: calcType, total, phases and counters.
+        """
+        return {'calcType': self.__calcType, 'total': self.__total,
+                'phases': dict(self.__phases),
+                'counters': dict(self.__counters)}
+
+    def phase(self, name):
+        """
+        Returns a context manager measuring the wall time of a phase. The
+        times of a phase entered several times are summed up.
+
+        Parameters
+        ----------
+        name : str
+            The name of the phase.
+
+        Returns
+        -------
+        ctsoft.awd.math.instrumentation.Phase : The context manager.
+        """
+        return Phase(self.__phases, name)
+
+
+class NullRecorder(object):
+    """
+    Class for the recorder of the disabled instrumentation. All methods do
+    nothing, so the instrumented code costs only a few method calls.
+    """
+    def count(self, name, value=1):
+        pass
+
+    def finish(self):
+        return None
+
+    def getMetrics(self):
+        return None
+
+    def phase(self, name):
+        return NULL_PHASE
+
+
+class Phase(object):
+    """
+    Context manager adding its wall time to a phase of a recorder.
+    """
+    def __init__(self, phases, name):
+        self.__phases = phases
+        self.__name = name
+        self.__start = None
+
+    def __enter__(self):
+        self.__start = time.perf_counter()
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        elapsed = time.perf_counter() - self.__start
+        self.__phases[self.__name] = (self.__phases.get(self.__name, 0.0) +
+                                      elapsed)
+        return False
+
+
+class NullPhase(object):
+    """
+    Context manager of the disabled instrumentation.
+    """
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        return False
+
+
+class CallbackSink(object):
+    """
+    Sink passing the metrics to a callable.
+    """
+    def __init__(self, callback):
+        self.__callback = callback
+
+    def emit(self, metrics):
+        self.__callback(metrics)
+
+
+class JsonSink(object):
+    """
+    Sink appending the metrics as one json line per calculation to a file.
+    """
+    def __init__(self, path):
+        self.__path = path
+        self.__lock = threading.Lock()
+
+    def emit(self, metrics):
+        line = json.dumps(metrics)
+        with self.__lock:
+            with open(self.__path, 'a', encoding='utf-8') as file:
+                file.write(line + '\n')
+
+
+class LogSink(object):
+    """
+    Sink writing the metrics to a logger.
+    """
+    def __init__(self, logger=None, level=logging.INFO):
+        if logger is None:
+            logger = logging.getLogger('ctsoft.awd.math')
+        self.__logger = logger
+        self.__level = level
+
+    def emit(self, metrics):
+        self.__logger.log(self.__level, 'calculation metrics: %s',
+                          json.dumps(metrics))
+
+
+def getDefault():
+    """
+    Returns the instrumentation used by new calculation objects.
+
+    Returns
+    -------
+    object : The default instrumentation, disabled if none was set.
+    """
+    return _default
+
+
+def setDefault(instrumentation):
+    """
+    Sets the instrumentation used by new calculation objects.
+
+    Parameters
+    ----------
+    instrumentation : ctsoft.awd.math.instrumentation.Instrumentation
+        The instrumentation or None to disable it.
+    """
+    global _default
+    if instrumentation is None:
+        instrumentation = NullInstrumentation()
+    _default = instrumentation
+
+
+NULL_PHASE = NullPhase()
+NULL_RECORDER = NullRecorder()
+_default = NullInstrumentation()
@@ -5,13 +5,29 @@ Created on Mon Jul  9 18:47:46 2018
 @author: ctsoft
 """
 
+import csv
+
+import numpy
+
 
 class Function(object):
-    def __init__(self, function, rCircle, rTorus, steps):
+    __slots__ = ('__function', '__rCircle', '__rTorus', '__steps',
+                 '__backend', '__digits')
+
+    def __init__(self, function, rCircle, rTorus, steps, backend='float64',
+                 digits=None):
         self.__function = function
         self.__rCircle = rCircle
         self.__rTorus = rTorus
         self.__steps = steps
+        self.__backend = backend
+        self.__digits = digits
+
+    def getBackend(self):
+        return self.__backend
+
+    def getDigits(self):
+        return self.__digits
 
     def getFunction(self):
         return self.__function
@@ -26,11 +42,65 @@ class Function(object):
         return self.__steps
 
 
+class MultiFunction(object):
+    # The bounds are pairs of numbers or function strings of r1, r2 and the
+    # preceding variables, e.g. ('-sqrt(r1**2-x**2)', 'sqrt(r1**2-x**2)').
+    __slots__ = ('__function', '__variables', '__bounds', '__rCircle',
+                 '__rTorus', '__steps', '__backend', '__digits')
+
+    def __init__(self, function, variables, bounds, rCircle, rTorus, steps,
+                 backend='float64', digits=None):
+        if isinstance(steps, int):
+            steps = (steps,) * len(variables)
+        if not len(variables) == len(bounds) == len(steps):
+            raise ValueError('Every variable needs its bounds and steps.')
+        self.__function = function
+        self.__variables = tuple(variables)
+        self.__bounds = tuple(tuple(bound) for bound in bounds)
+        self.__rCircle = rCircle
+        self.__rTorus = rTorus
+        self.__steps = tuple(steps)
+        self.__backend = backend
+        self.__digits = digits
+
+    def getBackend(self):
+        return self.__backend
+
+    def getBounds(self):
+        return self.__bounds
+
+    def getDigits(self):
+        return self.__digits
+
+    def getFunction(self):
+        return self.__function
+
+    def getRCircle(self):
+        return self.__rCircle
+
+    def getRTorus(self):
+        return self.__rTorus
+
+    def getSteps(self):
+        return self.__steps
+
+    def getVariables(self):
+        return self.__variables
+
+
 class Origin(object):
+    __slots__ = ('__function', '__calculatedValue', '__type', '__metrics',
+                 '__backend')
+
     def __init__(self, calcType, function, calculatedValue):
         self.__function = function
         self.__calculatedValue = calculatedValue
         self.__type = calcType
+        self.__metrics = None
+        self.__backend = 'float64'
+
+    def getBackend(self):
+        return self.__backend
 
     def getCalculatedValue(self):
         return self.__calculatedValue
@@ -41,11 +111,426 @@ class Origin(object):
     def getFunction(self):
         return self.__function
 
+    def getMetrics(self):
+        return self.__metrics
+
+    def setBackend(self, backend):
+        self.__backend = backend
+
+    def setMetrics(self, metrics):
+        self.__metrics = metrics
+
 
 class Result(Origin):
+    __slots__ = ('__derivation',)
+
     def __init__(self, calcType, function, calculatedValue, derivation):
         super(Result, self).__init__(calcType, function, calculatedValue)
         self.__derivation = derivation
 
     def getDerivation(self):
         return self.__derivation
+
+
+class EstimatedResult(Result):
+    __slots__ = ('__evaluations', '__errorEstimate')
+
+    def __init__(self, calcType, function, calculatedValue, derivation,
+                 evaluations, errorEstimate):
+        super(EstimatedResult, self).__init__(calcType, function,
+                                              calculatedValue, derivation)
+        self.__evaluations = evaluations
+        self.__errorEstimate = errorEstimate
+
+    def getErrorEstimate(self):
+        return self.__errorEstimate
+
+    def getEvaluations(self):
+        return self.__evaluations
+
+
+class SelectedResult(EstimatedResult):
+    __slots__ = ('__targetError', '__predictedError', '__achievedError',
+                 '__converged')
+
+    def __init__(self, calcType, function, calculatedValue, derivation,
+                 evaluations, errorEstimate, targetError, predictedError,
+                 achievedError, converged=True):
+        super(SelectedResult, self).__init__(calcType, function,
+                                             calculatedValue, derivation,
+                                             evaluations, errorEstimate)
+        self.__targetError = targetError
+        self.__predictedError = predictedError
+        self.__achievedError = achievedError
+        self.__converged = converged
+
+    def getAchievedError(self):
+        return self.__achievedError
+
+    def getPredictedError(self):
+        return self.__predictedError
+
+    def getTargetError(self):
+        return self.__targetError
+
+    def isConverged(self):
+        return self.__converged
+
+
+class IntervalResult(EstimatedResult):
+    __slots__ = ('__confidence', '__lowerBound', '__upperBound')
+
+    def __init__(self, calcType, function, calculatedValue, derivation,
+                 evaluations, errorEstimate, confidence, lowerBound,
+                 upperBound):
+        super(IntervalResult, self).__init__(calcType, function,
+                                             calculatedValue, derivation,
+                                             evaluations, errorEstimate)
+        self.__confidence = confidence
+        self.__lowerBound = lowerBound
+        self.__upperBound = upperBound
+
+    def getConfidence(self):
+        return self.__confidence
+
+    def getLowerBound(self):
+        return self.__lowerBound
+
+    def getUpperBound(self):
+        return self.__upperBound
+
+
+class SweepResult(object):
+    __slots__ = ('__function', '__calcTypes', '__rCircle', '__rTorus',
+                 '__steps', '__calculatedValues', '__referenceValues',
+                 '__derivations')
+
+    def __init__(self, function, calcTypes, rCircle, rTorus, steps,
+                 calculatedValues, referenceValues, derivations):
+        self.__function = function
+        self.__calcTypes = calcTypes
+        self.__rCircle = rCircle
+        self.__rTorus = rTorus
+        self.__steps = steps
+        self.__calculatedValues = calculatedValues
+        self.__referenceValues = referenceValues
+        self.__derivations = derivations
+
+    def __len__(self):
+        return len(self.__calculatedValues)
+
+    def getCalculatedValues(self):
+        return self.__calculatedValues
+
+    def getCalculationTypes(self):
+        return self.__calcTypes
+
+    def getColumns(self):
+        return {'calcType': self.__calcTypes, 'rCircle': self.__rCircle,
+                'rTorus': self.__rTorus, 'steps': self.__steps,
+                'calculated': self.__calculatedValues,
+                'reference': self.__referenceValues,
+                'derivation': self.__derivations}
+
+    def getDerivations(self):
+        return self.__derivations
+
+    def getFunction(self):
+        return self.__function
+
+    def getRCircle(self):
+        return self.__rCircle
+
+    def getReferenceValues(self):
+        return self.__referenceValues
+
+    def getRTorus(self):
+        return self.__rTorus
+
+    def getSteps(self):
+        return self.__steps
+
+
+class ResultRow(object):
+    """
+    View of one row of a result table with the getters of the result
+    models. The values are read from the arrays of the table on access, so
+    no result object is materialized.
+    """
+    __slots__ = ('__data', '__index')
+
+    def __init__(self, data, index):
+        self.__data = data
+        self.__index = index
+
+    def __getValue(self, name):
+        return self.__data[name][self.__index].item()
+
+    def getAchievedError(self):
+        return self.__getValue('achievedError')
+
+    def getBackend(self):
+        return self.__getValue('backend')
+
+    def getCalculatedText(self):
+        return self.__getValue('calculatedText')
+
+    def getCalculatedValue(self):
+        # The values of the mpmath backend are converted from their text, so
+        # they keep all their digits.
+        text = self.getCalculatedText()
+        if text:
+            import mpmath
+
+            with mpmath.workdps(len(text)):
+                return mpmath.mpf(text)
+        return self.__getValue('calculated')
+
+    def getCalculationType(self):
+        return self.__getValue('calcType')
+
+    def getConfidence(self):
+        return self.__getValue('confidence')
+
+    def getConverged(self):
+        return self.__getValue('converged')
+
+    def getDerivation(self):
+        return self.__getValue('derivation')
+
+    def getErrorEstimate(self):
+        return self.__getValue('errorEstimate')
+
+    def getEvaluations(self):
+        return self.__getValue('evaluations')
+
+    def getFunctionString(self):
+        return self.__getValue('function')
+
+    def getIndex(self):
+        return self.__index
+
+    def getLowerBound(self):
+        return self.__getValue('lowerBound')
+
+    def getPredictedError(self):
+        return self.__getValue('predictedError')
+
+    def getRCircle(self):
+        return self.__getValue('rCircle')
+
+    def getRTorus(self):
+        return self.__getValue('rTorus')
+
+    def getSteps(self):
+        return self.__getValue('steps')
+
+    def getTargetError(self):
+        return self.__getValue('targetError')
+
+    def getUpperBound(self):
+        return self.__getValue('upperBound')
+
+    def isConverged(self):
+        # Only SelectedResult rows may miss their target error.
+        return self.getConverged() != 0
+
+    def isEstimated(self):
+        # EstimatedResult rows are the ones with counted evaluations.
+        return self.getEvaluations() >= 0
+
+    def isInterval(self):
+        # IntervalResult rows are the ones with a confidence level.
+        return not numpy.isnan(self.getConfidence())
+
+    def isOrigin(self):
+        # Origin rows are the exact integrals, the derivation of other rows
+        # is NaN too if their reference value is zero.
+        return self.getCalculationType() == 'integral'
+
+    def isSelected(self):
+        # SelectedResult rows are the ones with a target error.
+        return not numpy.isnan(self.getTargetError())
+
+
+class ResultTable(object):
+    """
+    Columnar table of results backed by one numpy structured array. A row
+    holds the fields of the result models: missing fields are NaN (the
+    float fields) or -1 (evaluations), e.g. the derivation of an Origin.
+    The calculated values of the mpmath backend are stored as float and as
+    decimal text with all their digits (the calculatedText column), which
+    the rows convert back to mpmath numbers.
+    """
+    __slots__ = ('__data', '__size')
+
+    # The numeric columns in the order of the table. The string columns
+    # (STRINGS) are sized by their longest value.
+    COLUMNS = (('rCircle', 'f8'), ('rTorus', 'f8'), ('steps', 'i8'),
+               ('calculated', 'f8'), ('derivation', 'f8'),
+               ('evaluations', 'i8'), ('errorEstimate', 'f8'),
+               ('targetError', 'f8'), ('predictedError', 'f8'),
+               ('achievedError', 'f8'), ('confidence', 'f8'),
+               ('lowerBound', 'f8'), ('upperBound', 'f8'), ('converged', 'i1'))
+    # The value of a missing field of the numeric columns.
+    MISSING = {'evaluations': -1, 'converged': -1}
+    # The string columns in the order of the table.
+    STRINGS = ('calcType', 'backend', 'function', 'calculatedText')
+
+    def __init__(self, data=None, size=None):
+        if data is None:
+            data = numpy.zeros(0, dtype=ResultTable.getDtype(1, 1, 1, 1))
+        if size is None:
+            size = len(data)
+        self.__data = data
+        self.__size = size
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.__size
+        if not 0 <= index < self.__size:
+            raise IndexError('result table index out of range')
+        return ResultRow(self.__data, index)
+
+    def __iter__(self):
+        for index in range(0, self.__size):
+            yield ResultRow(self.__data, index)
+
+    def __len__(self):
+        return self.__size
+
+    def append(self, result):
+        function = result.getFunction()
+        steps = function.getSteps()
+        if isinstance(steps, tuple):
+            # The number of cells of a multi dimensional function.
+            steps = int(numpy.prod(steps))
+        row = {'calcType': result.getCalculationType(),
+               'backend': result.getBackend(),
+               'function': function.getFunction(),
+               'rCircle': function.getRCircle(),
+               'rTorus': function.getRTorus(),
+               'steps': steps,
+               'calculated': result.getCalculatedValue()}
+        row['calculatedText'] = ''
+        if row['backend'] == 'mpmath':
+            row['calculatedText'] = ResultTable.toText(row['calculated'])
+        if isinstance(result, Result):
+            row['derivation'] = result.getDerivation()
+        if isinstance(result, EstimatedResult):
+            row['evaluations'] = result.getEvaluations()
+            row['errorEstimate'] = result.getErrorEstimate()
+        if isinstance(result, SelectedResult):
+            row['targetError'] = result.getTargetError()
+            row['predictedError'] = result.getPredictedError()
+            row['achievedError'] = result.getAchievedError()
+            row['converged'] = int(result.isConverged())
+        if isinstance(result, IntervalResult):
+            row['confidence'] = result.getConfidence()
+            row['lowerBound'] = result.getLowerBound()
+            row['upperBound'] = result.getUpperBound()
+
+        self.__reserve(self.__size + 1, row)
+        data = self.__data
+        index = self.__size
+        for (name, kind) in ResultTable.COLUMNS:
+            value = row.get(name)
+            if value is None:
+                value = ResultTable.MISSING.get(name, numpy.nan)
+            data[name][index] = value
+        for name in ResultTable.STRINGS:
+            data[name][index] = row[name]
+        self.__size += 1
+
+    def getColumn(self, name):
+        # A view on the filled rows of the column, not a copy.
+        return self.__data[name][:self.__size]
+
+    def getColumns(self):
+        return {name: self.getColumn(name)
+                for name in self.__data.dtype.names}
+
+    def getData(self):
+        return self.__data[:self.__size]
+
+    def save(self, path):
+        numpy.save(path, self.getData(), allow_pickle=False)
+
+    def writeCsv(self, path):
+        data = self.getData()
+        names = data.dtype.names
+        with open(path, 'w', newline='') as handle:
+            writer = csv.writer(handle)
+            writer.writerow(names)
+            writer.writerows(zip(*(data[name].tolist() for name in names)))
+
+    def __reserve(self, size, row):
+        # Grows the capacity by doubling and widens the string columns if a
+        # value of the new row is longer than the current width.
+        data = self.__data
+        widths = [max(data.dtype[name].itemsize // 4, len(row[name]))
+                  for name in ResultTable.STRINGS]
+        dtype = ResultTable.getDtype(*widths)
+        capacity = len(data)
+        if size > capacity:
+            capacity = max(2 * capacity, size, 16)
+        if dtype != data.dtype or capacity != len(data):
+            grown = numpy.zeros(capacity, dtype=dtype)
+            grown[:self.__size] = data[:self.__size]
+            self.__data = grown
+
+    @staticmethod
+    def fromResults(results):
+        table = ResultTable()
+        for result in results:
+            table.append(result)
+        return table
+
+    @staticmethod
+    def fromSweep(sweepResult):
+        count = len(sweepResult)
+        calcTypes = numpy.asarray(sweepResult.getCalculationTypes(),
+                                  dtype=str)
+        function = sweepResult.getFunction()
+        data = numpy.zeros(count, dtype=ResultTable.getDtype(
+            max(calcTypes.dtype.itemsize // 4, 1), len('float64'),
+            max(len(function), 1), 1))
+        for name in ('evaluations', 'errorEstimate', 'targetError',
+                     'predictedError', 'achievedError', 'confidence',
+                     'lowerBound', 'upperBound', 'converged'):
+            data[name] = ResultTable.MISSING.get(name, numpy.nan)
+        data['calcType'] = calcTypes
+        data['backend'] = 'float64'
+        data['function'] = function
+        data['rCircle'] = sweepResult.getRCircle()
+        data['rTorus'] = sweepResult.getRTorus()
+        data['steps'] = sweepResult.getSteps()
+        data['calculated'] = sweepResult.getCalculatedValues()
+        data['derivation'] = sweepResult.getDerivations()
+        return ResultTable(data)
+
+    @staticmethod
+    def getDtype(calcTypeWidth, backendWidth, functionWidth, textWidth):
+        return numpy.dtype([('calcType', 'U{0}'.format(calcTypeWidth)),
+                            ('backend', 'U{0}'.format(backendWidth)),
+                            ('function', 'U{0}'.format(functionWidth)),
+                            ('calculatedText', 'U{0}'.format(textWidth))] +
+                           list(ResultTable.COLUMNS))
+
+    @staticmethod
+    def load(path, mmap=True):
+        # The memory mapped array is read on access of the rows only.
+        data = numpy.load(path, mmap_mode='r' if mmap else None,
+                          allow_pickle=False)
+        return ResultTable(data)
+
+    @staticmethod
+    def toText(value):
+        # The text has the decimal digits of the whole mantissa, so it is
+        # converted back to the same mpmath number.
+        import mpmath
+
+        if not isinstance(value, mpmath.mpf):
+            return ''
+        return mpmath.nstr(value, mpmath.libmp.repr_dps(
+            max(value.man.bit_length(), 53)))
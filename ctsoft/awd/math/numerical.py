@@ -5,8 +5,20 @@ Created on Sun Jun 24 22:33:31 2018
 @author: ctsoft
 """
 
-import sympy
+import concurrent.futures
+import contextlib
+import itertools
+import math
+import statistics
+
+import numpy
+import ctsoft.awd.math.cache as cache
+import ctsoft.awd.math.checkpoint as checkpoint
+import ctsoft.awd.math.instrumentation as instrumentation
 import ctsoft.awd.math.model as model
+import ctsoft.awd.math.sampling as sampling
+import ctsoft.awd.math.store as store
+import ctsoft.awd.math.summation as summation
 
 
 class Base(object):
@@ -17,16 +29,56 @@ class Base(object):
     -------
     calculate:
         Defines the used symbols of the calculation.
+    calculateDerivation:
+        Calculates the derivation of a calculated value in percent.
+    evaluate:
+        Evaluates the function string on an array of abscissa values.
+    getAbscissae:
+        Returns the abscissa values of grid indices.
+    getBackend:
+        Returns the precision backend of the calculation.
     getCalculatedValue:
         Returns the calculated value of the current method object.
+    getCompiled:
+        Returns the cached parsed and compiled function string.
+    getContext:
+        Returns the precision context of the backend.
+    getDigits:
+        Returns the number of decimal digits of the mpmath backend.
     getFunction:
         Returns the function object of the current method object.
+    getInstrumentation:
+        Returns the instrumentation of the current method object.
+    getKernel:
+        Returns the compiled function string of the function object.
+    getRecorder:
+        Returns the recorder of the running calculation.
+    getSpecialized:
+        Returns the function string specialized on the fixed parameters.
+    getStepSize:
+        Returns the step size of the equidistant abscissa grid.
+    setBackend:
+        Sets the precision backend of the current method object.
     setCalculatedValue:
         Sets the calculated value of the current method object.
+    setInstrumentation:
+        Sets the instrumentation of the current method object.
+    setRecorder:
+        Sets the recorder of the running calculation.
+    toNumber:
+        Converts a calculated value to the number type of the backend.
     """
+    # The number of decimal digits of the mpmath backend if the function
+    # object does not define them.
+    DIGITS = 30
+
     def __init__(self, function):
         self.__function = function
         self.__calculatedValue = None
+        self.__backend = None
+        self.__digits = None
+        self.__instrumentation = instrumentation.getDefault()
+        self.__recorder = instrumentation.NULL_RECORDER
 
     def calculate(self):
         """
@@ -36,6 +88,10 @@ class Base(object):
         -------
         dict : Dictonary with the keys: x, r1 and r2.
         """
+        # sympy (and mpmath) are imported on the first use only, because
+        # their import dominates the startup time of the application.
+        import sympy
+
         # defines the abscissa
         x = sympy.Symbol('x')
         # defines the radius of the circle of the torus
@@ -45,6 +101,101 @@ class Base(object):
 
         return {'x': x, 'r1': r1, 'r2': r2}
 
+    def calculateDerivation(self, calculatedValue, referenceValue):
+        """
+        Calculates the derivation of the current method compared to the
+        calculation with the exact integral (the referenceValue variable)
+        
+        Parameters
+        ----------
+        calculatedValue : double
+            The calculated value of the current numerical method.
+        referenceValue : double
+            The calculated value of the exact integral.
+
+        Returns
+        -------
+        double : The derivation of the calculated value compared to the
+            exact integral or None if the exact integral is zero.
+        """
+        if referenceValue == 0.0:
+            # The relative derivation is not defined.
+            return None
+        derivation = round(100.0 * calculatedValue / referenceValue - 100.0, 1)
+        return abs(derivation)
+
+    def evaluate(self, xValues):
+        """
+        Evaluates the function string on all given abscissa values with one
+        call of the kernel specialized on the fixed parameters.
+
+        Parameters
+        ----------
+        xValues : numpy.ndarray
+            The abscissa values to evaluate the function string on.
+
+        Returns
+        -------
+        numpy.ndarray : The ordinate values with the shape of xValues.
+        """
+        kernel = self.getSpecialized().getKernel()
+        recorder = self.__recorder
+        recorder.count('evaluations', numpy.size(xValues))
+
+        if self.getBackend() == 'mpmath':
+            # mpmath is not vectorized, so the kernel is called per value
+            # (in the precision of the context of the calculation).
+            with recorder.phase('evaluate'):
+                values = [kernel(xValue) for xValue in numpy.ravel(xValues)]
+            return numpy.array(values, dtype=object).reshape(
+                numpy.shape(xValues))
+
+        with recorder.phase('evaluate'):
+            values = kernel(xValues)
+        # Function strings without the abscissa (e.g. constants) return a
+        # scalar, so they are broadcasted to the shape of the abscissa values.
+        return numpy.broadcast_to(numpy.asarray(values, dtype=float),
+                                  numpy.shape(xValues))
+
+    def getAbscissae(self, indices):
+        """
+        Returns the abscissa values -rCircle + h * k of the equidistant grid
+        in the number type of the backend.
+
+        Parameters
+        ----------
+        indices : numpy.ndarray
+            The indices k of the abscissa values.
+
+        Returns
+        -------
+        numpy.ndarray : The abscissa values.
+        """
+        function = self.getFunction()
+        stepSize = self.getStepSize()
+
+        if self.getBackend() == 'mpmath':
+            import mpmath
+
+            rCircle = mpmath.mpf(function.getRCircle())
+            return numpy.array([(-1.0) * rCircle + stepSize * int(index)
+                                for index in indices], dtype=object)
+
+        return (-1.0) * function.getRCircle() + stepSize * indices
+
+    def getBackend(self):
+        """
+        Returns the precision backend of the calculation: the backend set for
+        the current method object or else the one of the function object.
+
+        Returns
+        -------
+        str : The backend, float64 or mpmath.
+        """
+        if self.__backend is not None:
+            return self.__backend
+        return self.getFunction().getBackend()
+
     def getCalculatedValue(self):
         """
         Returns the calculated value.
@@ -66,358 +217,2836 @@ class Base(object):
         """
         return self.__function
 
-    def setCalculatedValue(self, calculatedValue):
-        """
-        Sets the calculated value of the current method.
+    def getInstrumentation(self):
         """
-        self.__calculatedValue = calculatedValue
+        Returns the instrumentation of the current method object.
 
+        Returns
+        -------
+        ctsoft.awd.math.instrumentation.Instrumentation : The instrumentation
+            creating a recorder per calculation.
+        """
+        return self.__instrumentation
 
-class Numerical(Base):
-    """
-    Base class for the numerical method objects.
-    """
-    def __init__(self, function, referenceValue):
-        super(Numerical, self).__init__(function)
-        self.result = None
-        self.__referenceValue = referenceValue
-
-    def calculateDerivation(self, calculatedValue, referenceValue):
+    def getRecorder(self):
         """
-        Calculates the derivation of the current method compared to the
-        calculation with the exact integral (the referenceValue variable)
-        
-        Parameters
-        ----------
-        calculatedValue : double
-            The calculated value of the current numerical method.
-        referenceValue : double
-            The calculated value of the exact integral.
+        Returns the recorder of the running calculation.
 
         Returns
         -------
-        double : The derivation of the calculated value compared to the
-            exact integral.
+        ctsoft.awd.math.instrumentation.Recorder : The recorder, which
+            records nothing if the instrumentation is disabled.
         """
-        derivation = round(100.0 * calculatedValue / referenceValue - 100.0, 1)
-        return abs(derivation)
+        return self.__recorder
 
-    def fillResult(self, function, calculatedValue, derivation):
+    def getSpecialized(self):
         """
-        Fills a result model object with the needed values.
+        Returns the function string specialized on the radii of the function
+        object from the process wide expression cache. Pi is folded into a
+        constant, the common subexpressions are eliminated and the radii are
+        bound to the kernel, so it takes the abscissa values only. The
+        specialized expression and the source of the kernel can be inspected
+        by getExpression, getReplacements and getSource.
 
-        Parameters
-        ----------
-        function : ctsoft.awd.math.model.Function
-            An model object with the needed values for the numerical
-            integration.
-        calculatedValue : double
-            The calculated value of the current numerical integration.
-        derivation : double
-            The derivation of the current numerical integration.
+        Returns
+        -------
+        ctsoft.awd.math.cache.CompiledExpression : The specialized function
+            string.
         """
-        return model.Result(function, calculatedValue, derivation)
+        symbols = Base.calculate(self)
+        function = self.getFunction()
+        values = (function.getRCircle(), function.getRTorus())
+        if self.getBackend() == 'mpmath':
+            (modules, digits) = ('mpmath', self.getDigits())
+        else:
+            (modules, digits) = ('numpy', None)
+        with self.__recorder.phase('parse'):
+            (compiled, hit) = cache.expressions.lookup(
+                function.getFunction(),
+                (symbols['x'], symbols['r1'], symbols['r2']), modules,
+                values, digits)
+        self.__recorder.count('cacheHits' if hit else 'cacheMisses')
+        return compiled
 
-    def getReferenceValue(self):
+    def getStepSize(self):
         """
-        Returns the reference value coming from the calculation of the exact
-        integral.
-        
+        Returns the step size of the equidistant abscissa grid (this is the
+        symbol "h" in the documentation).
+
         Returns
         -------
-        double : The reference value calculated by the exact integral.
+        double : The step size in the number type of the backend.
         """
-        return self.__referenceValue
+        function = self.getFunction()
+        if self.getBackend() == 'mpmath':
+            import mpmath
 
-    def getResult(self):
+            return 2 * mpmath.mpf(function.getRCircle()) / function.getSteps()
+        return 2.0 * function.getRCircle() / function.getSteps()
+
+    def getContext(self):
         """
-        Returns the result mdel object of the current numerical integration.
-        
+        Returns the precision context of the backend, which must be active
+        while the values of the mpmath backend are calculated.
+
         Returns
         -------
-        ctsoft.awd.math.model.Result : The model with the important values
-            of the current calculation.
+        object : A context manager setting the mpmath precision.
         """
-        return self.__result
+        if self.getBackend() == 'mpmath':
+            import mpmath
 
-    def setResult(self, result):
+            return mpmath.workdps(self.getDigits())
+        return contextlib.nullcontext()
+
+    def getDigits(self):
         """
-        Sets the result model object of the current numerical integration.
-        
-        Parameters
-        ----------
-        ctsoft.awd.math.model.Result : The result model with the important
-            values of the current calculation.
+        Returns the number of decimal digits of the mpmath backend.
+
+        Returns
+        -------
+        int : The digits set for the current method object, else the ones of
+            the function object or DIGITS.
         """
-        self.__result = result
+        if self.__digits is not None:
+            return self.__digits
+        digits = self.getFunction().getDigits()
+        if digits is None:
+            digits = self.DIGITS
+        return digits
 
+    def getCompiled(self):
+        """
+        Returns the parsed and compiled function string from the process wide
+        expression cache.
 
-class Integrated(Base):
-    """
-    Class for the exact integral calculation.
-    """
-    def __init__(self, function):
-        super(Integrated, self).__init__(function)
+        Returns
+        -------
+        ctsoft.awd.math.cache.CompiledExpression : The parsed function string
+            and its kernel with the arguments x, r1 and r2.
+        """
+        # Uses the symbols of the base class also if a subclass overrides the
+        # calculate method.
+        symbols = Base.calculate(self)
+        funcString = self.getFunction().getFunction()
+        modules = 'mpmath' if self.getBackend() == 'mpmath' else 'numpy'
+        with self.__recorder.phase('parse'):
+            (compiled, hit) = cache.expressions.lookup(
+                funcString, (symbols['x'], symbols['r1'], symbols['r2']),
+                modules)
+        self.__recorder.count('cacheHits' if hit else 'cacheMisses')
+        return compiled
 
-    def calculate(self):
+    def getKernel(self):
         """
-        Calculates the exact integral.
-        
+        Returns the function string compiled into a numpy vectorized
+        callable with the arguments x, r1 and r2.
+
         Returns
         -------
-        ctsoft.awd.math.model.Origin : The result model with the important
-            values of the current calculation.
+        callable : The compiled function string.
         """
-        # get the used symbols
-        (x, r1, r2) = super(Integrated, self).calculate()
+        return self.getCompiled().getKernel()
 
-        # get the function with the needed values
-        function = self.getFunction()
-        funcString = function.getFunction()
+    def setBackend(self, backend, digits=None):
+        """
+        Sets the precision backend of the current method object, which
+        overrides the backend of the function object.
 
-        # Set the substitutions of the calculation. These are the variables
-        # of the function string.
-        substi = {x: 0.0, r1: 1.0, r2: 2.0}
+        Parameters
+        ----------
+        backend : str
+            The backend, float64 or mpmath, or None to use the one of the
+            function object.
+        digits : int
+            The number of decimal digits of the mpmath backend.
+        """
+        self.__backend = backend
+        self.__digits = digits
 
-        # Calculates the function string by replacing the defined symbols with
-        # the corresponding values.
-        calculated = sympy.sympify(funcString).evalf(subs=substi)
-        # Sets the calculated value as object variable.
-        self.setCalculatedValue(calculated)
+    def setCalculatedValue(self, calculatedValue):
+        """
+        Sets the calculated value of the current method.
+        """
+        self.__calculatedValue = calculatedValue
 
-        # defines the calculation type which will be used to decide, which
-        # printing method will be used and to output this information also
-        # as a part of the result summary.
-        calcType = 'integral'
-        # Creates the model for the output.
-        result = model.Origin(calcType, function, calculated)
+    def setInstrumentation(self, instrumentation):
+        """
+        Sets the instrumentation of the current method object.
 
-        return result
+        Parameters
+        ----------
+        instrumentation : ctsoft.awd.math.instrumentation.Instrumentation
+            The instrumentation creating a recorder per calculation.
+        """
+        self.__instrumentation = instrumentation
 
+    def setRecorder(self, recorder):
+        """
+        Sets the recorder of the running calculation.
 
-class Rectangle(Numerical):
-    """
-    Class for the numerical integration calculation by the rectangle method.
-    """
-    def __init__(self, function, referenceValue):
-        super(Rectangle, self).__init__(function, referenceValue)
+        Parameters
+        ----------
+        recorder : ctsoft.awd.math.instrumentation.Recorder
+            The recorder of the running calculation.
+        """
+        self.__recorder = recorder
 
-    def calculate(self):
+    def toNumber(self, value):
         """
-        Calculates the numerical integration by the rectangle method.
-        
+        Converts a calculated value to the plain number type of the backend.
+
+        Parameters
+        ----------
+        value : object
+            The calculated value, e.g. a numpy scalar.
+
         Returns
         -------
-        ctsoft.awd.math.model.Result : The result model with the important
-            values of the current calculation.
+        float or mpmath.mpf : The value as float for the float64 backend and
+            as mpf for the mpmath backend.
         """
-        # get the used symbols
-        (x, r1, r2) = super(Rectangle, self).calculate()
-
-        # get the function with the needed values
-        function = self.getFunction()
-        # Gets the function string.
-        funcString = function.getFunction()
-        # Gets the radius of the circle.
-        rCircle = function.getRCircle()
-        # Gets the radius of the Torus (see the documentation for further
-        # information of this variable).
-        rTorus = function.getRTorus()
-        # Gets the number of steps to calculate the numerical integration.
-        steps = function.getSteps()
-        # Calculates the step size for the calculation (this is the symbol "h"
-        # in the documentation)
-        stepSize = 2.0 * rCircle / steps
-        # Variable for the sum of each rectangle coming from the rectangle
-        # method.
-        summe = 0.0
-
-        for step in range(0, steps):
-            # Calculates the current abscissa value of the loop.
-            xValue = (-1.0) * rCircle + stepSize * step
-            # Set the substitutions of the calculation. These are the variables
-            # of the function string.
-            substi = {x: xValue, r1: rCircle, r2: rTorus}
-            # Calculates the function string by replacing the defined symbols with
-            # the corresponding values.
-            funcValue = sympy.sympify(funcString).evalf(subs=substi)
-            # Sum all calculated ordinate values.
-            summe += funcValue
-
-        # The calculated numerical integration value by the rectangle method.
-        calculated = summe * stepSize
-
-        # Gets the reference value coming from the exact integral.
-        refValue = self.getReferenceValue()
-        # Calculate the derivation compared by the exact integration.
-        derivation = self.calculateDerivation(calculated, refValue)
-        # Sets the calculated value as object variable.
-        self.setCalculatedValue(calculated)
+        if self.getBackend() == 'mpmath':
+            import mpmath
 
-        # defines the calculation type which will be used to decide, which
-        # printing method will be used and to output this information also
-        # as a part of the result summary.
-        calcType = 'rectangle'
-        # Creates the model for the output.
-        result = model.Result(calcType, function, calculated, derivation)
-        self.setResult(result)
-
-        return result
+            return mpmath.mpf(value)
+        return float(value)
 
 
-class Simpson(Numerical):
+class Numerical(Base):
     """
-    Class for the numerical integration calculation by the simpson method.
+    Base class for the numerical method objects.
+
+    Methods
+    -------
+    calculate:
+        Calculates the numerical integration and creates the result model.
+    getCalculationType:
+        Returns the calculation type of the current method.
+    getCheckpoint:
+        Returns the checkpoint of the streaming and parallel mode.
+    getCheckpointKey:
+        Returns the key of the calculation in a checkpoint file.
+    getErrorEstimate:
+        Returns the estimated error of methods with an own error estimate.
+    getEvaluations:
+        Returns the number of function evaluations of the last calculation.
+    getParameters:
+        Returns the parameters of the method changing the calculated value.
+    getSample:
+        Returns the sample with the ordinate values of the abscissa grid.
+    integrate:
+        Calculates the value of the numerical integration.
+    integrateSamples:
+        Applies the rule of the current method to ordinate values.
+    integrateParallel:
+        Applies the rule of the current method in a process pool.
+    integrateStream:
+        Applies the rule of the current method chunk by chunk.
+    setCheckpoint:
+        Sets the checkpoint of the streaming and parallel mode.
+    sumRange:
+        Sums the weighted ordinate values of a range of abscissa indices.
     """
-    def __init__(self, function, referenceValue):
-        super(Simpson, self).__init__(function, referenceValue)
+    # The number of abscissa values above which the grid based methods
+    # stream the grid in chunks instead of evaluating it at once.
+    STREAM_THRESHOLD = 2 ** 22
+    # The default number of abscissa values per chunk.
+    CHUNK_SIZE = 2 ** 18
+    # The number of subintervals per worker of the parallel mode, so a slow
+    # worker does not delay the whole calculation.
+    BLOCKS_PER_WORKER = 4
+    # The precision backends supported by the method.
+    BACKENDS = ('float64',)
+    # Whether the calculated values are kept in the result store. Methods
+    # with more state than the value, the evaluations and the error estimate
+    # are calculated every time.
+    STORED = True
+
+    def __init__(self, function, referenceValue, sample=None):
+        super(Numerical, self).__init__(function)
+        self.result = None
+        self.__referenceValue = referenceValue
+        self.__sample = sample
+        self.__chunkSize = None
+        self.__workers = None
+        self.__executor = None
+        self.__store = store.getDefault()
+        self.__checkpoint = None
+        self.__evaluations = None
+        self.__errorEstimate = None
 
     def calculate(self):
         """
-        Calculates the numerical integration by the simpson method.
-        
+        Calculates the numerical integration by the rule of the current
+        method.
+
         Returns
         -------
         ctsoft.awd.math.model.Result : The result model with the important
             values of the current calculation.
         """
-        # get the used symbols
-        (x, r1, r2) = super(Simpson, self).calculate()
-
         # get the function with the needed values
         function = self.getFunction()
-        # Gets the function string.
-        funcString = function.getFunction()
-        # Gets the radius of the circle.
-        rCircle = function.getRCircle()
-        # Gets the radius of the Torus (see the documentation for further
-        # information of this variable).
-        rTorus = function.getRTorus()
-        # Gets the number of steps to calculate the numerical integration.
-        steps = function.getSteps()
-        # Calculates the step size for the calculation (this is the symbol "h"
-        # in the documentation)
-        stepSize = 2.0 * rCircle / steps
-        # Variable for the sum of all odd steps ordinate values coming
-        # from the trapezoid method without the first and last step.
-        sumOdd = 0.0
-        # Variable for the sum of all even steps ordinate values coming
-        # from the trapezoid method without the first and last step.
-        sumEven = 0.0
-        # Variable for the sum of first and last ordinate values coming
-        # from the trapezoid method without the first and last step.
-        sumStartEnd = 0.0
-
-        for step in range(0, steps + 1):
-            # Calculates the current abscissa value of the loop.
-            xValue = (-1.0) * rCircle + stepSize * step
-            # Set the substitutions of the calculation. These are the variables
-            # of the function string.
-            substi = {x: xValue, r1: rCircle, r2: rTorus}
-            # Calculates the function string by replacing the defined symbols with
-            # the corresponding values.
-            funcValue = sympy.sympify(funcString).evalf(subs=substi)
-            if step == 0 or step == steps:
-                sumStartEnd += funcValue
-            elif step % 2 == 0:
-                sumEven += funcValue
-            else:
-                sumOdd += funcValue
-
-        # The calculated numerical integration value by the simpson method.
-        calculated = stepSize / 3 * (sumStartEnd + 4 * sumOdd + 2 * sumEven)
+        # The calculation type will be used to decide, which printing method
+        # will be used and to output this information also as a part of the
+        # result summary.
+        calcType = self.getCalculationType()
+        backend = self.getBackend()
+        if backend not in self.BACKENDS:
+            raise ValueError('The {0} method does not support the {1} '
+                             'backend.'.format(calcType, backend))
+        # Starts the recording of the metrics (if the instrumentation is
+        # enabled).
+        recorder = self.getInstrumentation().begin(calcType)
+        self.setRecorder(recorder)
+
+        # Looks the calculation up in the result store (if one is set). The
+        # store keeps float64 values only.
+        resultStore = self.__store
+        if backend != 'float64' or not self.STORED:
+            resultStore = None
+        stored = None
+        if resultStore is not None:
+            key = resultStore.getKey(calcType, function,
+                                     self.getParameters())
+            stored = resultStore.get(key)
+
+        if stored is None:
+            # The calculated numerical integration value by the current
+            # method.
+            with self.getContext():
+                calculated = self.toNumber(self.integrate())
+            if resultStore is not None:
+                resultStore.put(key, calculated, self.getEvaluations(),
+                                self.getErrorEstimate())
+        else:
+            (calculated, evaluations, errorEstimate) = stored
+            self.setEvaluations(evaluations)
+            self.setErrorEstimate(errorEstimate)
+            recorder.count('storeHits')
 
         # Gets the reference value coming from the exact integral.
         refValue = self.getReferenceValue()
         # Calculate the derivation compared by the exact integration.
-        derivation = self.calculateDerivation(calculated, refValue)
+        derivation = self.calculateDerivation(float(calculated),
+                                              float(refValue))
         # Sets the calculated value as object variable.
         self.setCalculatedValue(calculated)
 
-        # defines the calculation type which will be used to decide, which
-        # printing method will be used and to output this information also
-        # as a part of the result summary.
-        calcType = 'simpson'
         # Creates the model for the output.
-        result = model.Result(calcType, function, calculated, derivation)
+        result = self.fillResult(calcType, function, calculated, derivation)
+        result.setBackend(backend)
+        result.setMetrics(recorder.finish())
+        self.setRecorder(instrumentation.NULL_RECORDER)
         self.setResult(result)
 
         return result
 
+    def fillResult(self, calcType, function, calculatedValue, derivation):
+        """
+        Fills a result model object with the needed values.
 
-class Trapezoid(Numerical):
-    """
-    Class for the numerical integration calculation by the trapezoid method.
-    """
-    def __init__(self, function, referenceValue):
-        super(Trapezoid, self).__init__(function, referenceValue)
+        Parameters
+        ----------
+        calcType : str
+            The calculation type of the current numerical integration.
+        function : ctsoft.awd.math.model.Function
+            An model object with the needed values for the numerical
+            integration.
+        calculatedValue : double
+            The calculated value of the current numerical integration.
+        derivation : double
+            The derivation of the current numerical integration.
 
-    def calculate(self):
+        Returns
+        -------
+        ctsoft.awd.math.model.Result : The filled result model. Methods which
+            set the number of evaluations get a
+            ctsoft.awd.math.model.EstimatedResult.
         """
-        Calculates the numerical integration by the trapezoid method.
-        
+        if self.__evaluations is None:
+            return model.Result(calcType, function, calculatedValue,
+                                derivation)
+        return model.EstimatedResult(calcType, function, calculatedValue,
+                                     derivation, self.__evaluations,
+                                     self.__errorEstimate)
+
+    def getCalculationType(self):
+        """
+        Returns the calculation type of the current method. Must be
+        implemented by the subclasses.
+
         Returns
         -------
-        ctsoft.awd.math.model.Result : The result model with the important
-            values of the current calculation.
+        str : The name of the current method.
         """
-        # get the used symbols
-        (x, r1, r2) = super(Trapezoid, self).calculate()
+        raise NotImplementedError()
 
-        # get the function with the needed values
-        function = self.getFunction()
-        # Gets the function string.
-        funcString = function.getFunction()
-        # Gets the radius of the circle.
-        rCircle = function.getRCircle()
+    def getCheckpoint(self):
+        """
+        Returns the checkpoint of the streaming and parallel mode.
+
+        Returns
+        -------
+        ctsoft.awd.math.checkpoint.Checkpoint : The checkpoint or None if the
+            progress is not saved.
+        """
+        return self.__checkpoint
+
+    def getCheckpointKey(self, mode, chunkSize, blocks=None):
+        """
+        Returns the key of the calculation in a checkpoint file. It contains
+        everything changing the partial sums, so a checkpoint is resumed by
+        the same calculation only.
+
+        Parameters
+        ----------
+        mode : str
+            The mode of the calculation, stream or parallel.
+        chunkSize : int
+            The number of abscissa values per chunk.
+        blocks : int
+            The number of subintervals of the parallel mode.
+
+        Returns
+        -------
+        str : The key of the calculation.
+        """
+        function = self.getFunction()
+        return checkpoint.Checkpoint.getKey({
+            'calcType': self.getCalculationType(), 'mode': mode,
+            'function': function.getFunction(),
+            'rCircle': function.getRCircle(), 'rTorus': function.getRTorus(),
+            'steps': function.getSteps(), 'chunkSize': chunkSize,
+            'blocks': blocks, 'parameters': self.getParameters()})
+
+    def getChunkSize(self):
+        """
+        Returns the number of abscissa values evaluated per chunk in the
+        streaming mode.
+
+        Returns
+        -------
+        int : The chunk size or None if the streaming mode is used for very
+            large steps only.
+        """
+        return self.__chunkSize
+
+    def getExecutor(self):
+        """
+        Returns the executor of the parallel mode.
+
+        Returns
+        -------
+        concurrent.futures.Executor : The executor or None if a process pool
+            is created per calculation.
+        """
+        return self.__executor
+
+    def getWorkers(self):
+        """
+        Returns the number of worker processes of the parallel mode.
+
+        Returns
+        -------
+        int : The number of workers or None if the parallel mode is disabled.
+        """
+        return self.__workers
+
+    def getErrorEstimate(self):
+        """
+        Returns the estimated absolute error of the last calculation.
+
+        Returns
+        -------
+        double : The estimated error or None if the method has no own error
+            estimate.
+        """
+        return self.__errorEstimate
+
+    def getEvaluations(self):
+        """
+        Returns the number of function evaluations of the last calculation.
+
+        Returns
+        -------
+        int : The number of evaluated abscissa values or None if the method
+            does not count them.
+        """
+        return self.__evaluations
+
+    def getParameters(self):
+        """
+        Returns the parameters of the method which change the calculated
+        value besides the function object, e.g. tolerances. They are part of
+        the key of the result store.
+
+        Returns
+        -------
+        dict : The parameters of the method.
+        """
+        return {}
+
+    def getReferenceValue(self):
+        """
+        Returns the reference value coming from the calculation of the exact
+        integral.
+        
+        Returns
+        -------
+        double : The reference value calculated by the exact integral.
+        """
+        return self.__referenceValue
+
+    def getResult(self):
+        """
+        Returns the result mdel object of the current numerical integration.
+        
+        Returns
+        -------
+        ctsoft.awd.math.model.Result : The model with the important values
+            of the current calculation.
+        """
+        return self.__result
+
+    def getStore(self):
+        """
+        Returns the result store of the calculated values.
+
+        Returns
+        -------
+        ctsoft.awd.math.store.ResultStore : The result store or None.
+        """
+        return self.__store
+
+    def getSample(self):
+        """
+        Returns the sample with the ordinate values of the abscissa grid. If
+        no sample was passed to the constructor, an own sample is created.
+
+        Returns
+        -------
+        ctsoft.awd.math.numerical.Sample : The sample of the function.
+        """
+        if self.__sample is None:
+            self.__sample = Sample(self.getFunction())
+        return self.__sample
+
+    @staticmethod
+    def getScale(stepSize):
+        """
+        Returns the factor of the weighted sum of the ordinate values. Must
+        be implemented by the grid based subclasses.
+
+        Parameters
+        ----------
+        stepSize : double
+            The step size of the abscissa grid.
+
+        Returns
+        -------
+        double : The factor of the weighted sum.
+        """
+        raise NotImplementedError()
+
+    @staticmethod
+    def getValueCount(steps):
+        """
+        Returns the number of abscissa values used by the rule. Must be
+        implemented by the grid based subclasses.
+
+        Parameters
+        ----------
+        steps : int
+            The number of steps.
+
+        Returns
+        -------
+        int : The number of abscissa values starting at -rCircle.
+        """
+        raise NotImplementedError()
+
+    @staticmethod
+    def getWeights(indices, steps):
+        """
+        Returns the weights of the ordinate values by their abscissa index.
+        Must be implemented by the grid based subclasses.
+
+        Parameters
+        ----------
+        indices : numpy.ndarray
+            The indices k of the abscissa values -rCircle + h * k.
+        steps : int
+            The number of steps.
+
+        Returns
+        -------
+        numpy.ndarray : The weights of the indices.
+        """
+        raise NotImplementedError()
+
+    def integrate(self):
+        """
+        Calculates the value of the numerical integration by applying the
+        rule of the current method to the ordinate values of the sample. If a
+        chunk size or a checkpoint is set or the grid is very large, the grid
+        is streamed.
+
+        Returns
+        -------
+        double : The calculated value of the numerical integration.
+        """
+        steps = self.getFunction().getSteps()
+        if self.__checkpoint is not None and self.getBackend() != 'float64':
+            raise ValueError('Checkpoints store float64 sums only.')
+        if self.__workers is not None and self.__workers > 1:
+            return self.integrateParallel()
+        if (self.__chunkSize is not None or self.__checkpoint is not None or
+                self.getValueCount(steps) > self.STREAM_THRESHOLD):
+            return self.integrateStream()
+
+        sample = self.getSample()
+        # The sample evaluates the function string only at its first use,
+        # which is recorded by the recorder of the current calculation.
+        sample.setRecorder(self.getRecorder())
+        funcValues = sample.getValues()
+        sample.setRecorder(instrumentation.NULL_RECORDER)
+
+        with self.getRecorder().phase('sum'):
+            return self.integrateSamples(funcValues, sample.getStepSize())
+
+    @staticmethod
+    def integrateSamples(funcValues, stepSize):
+        """
+        Applies the rule of the current method to the ordinate values of
+        an equidistant abscissa grid. Must be implemented by the subclasses.
+
+        Parameters
+        ----------
+        funcValues : numpy.ndarray
+            The ordinate values of the steps + 1 abscissa values in the last
+            axis.
+        stepSize : double or numpy.ndarray
+            The step size of the abscissa grid.
+
+        Returns
+        -------
+        double or numpy.ndarray : The calculated integration value(s).
+        """
+        raise NotImplementedError()
+
+    def integrateParallel(self):
+        """
+        Calculates the value of the numerical integration by splitting the
+        abscissa grid into contiguous subintervals, which are streamed by a
+        process pool. The weights depend on the global abscissa index, so the
+        subinterval bounds do not change the rule (e.g. the odd and even
+        weights of the simpson method). The partial sums are combined with
+        correct rounding.
+
+        With a checkpoint the partial sums of the completed subintervals are
+        saved, so a resumed calculation calculates the missing ones only.
+
+        Returns
+        -------
+        double : The calculated value of the numerical integration.
+        """
+        function = self.getFunction()
+        steps = function.getSteps()
+        chunkSize = self.__chunkSize
+        if chunkSize is None:
+            chunkSize = self.CHUNK_SIZE
+        stepSize = self.getStepSize()
+
+        valueCount = self.getValueCount(steps)
+        blocks = min(valueCount, self.__workers * self.BLOCKS_PER_WORKER)
+        bounds = numpy.linspace(0, valueCount, blocks + 1).astype(int)
+        arguments = [(self.getCalculationType(), function.getFunction(),
+                      function.getRCircle(), function.getRTorus(), steps,
+                      int(bounds[block]), int(bounds[block + 1]), chunkSize,
+                      self.getBackend(), self.getDigits())
+                     for block in range(0, blocks)]
+
+        partials = [None] * blocks
+        progress = self.__checkpoint
+        if progress is not None:
+            progress.open(self.getCheckpointKey('parallel', chunkSize,
+                                                blocks), blocks, 2)
+            values = progress.getValues()
+            for block in numpy.flatnonzero(progress.getDone()):
+                partials[block] = tuple(values[block])
+        pending = [block for block in range(0, blocks)
+                   if partials[block] is None]
+
+        try:
+            if pending:
+                executor = self.__executor
+                with contextlib.ExitStack() as stack:
+                    if executor is None:
+                        executor = stack.enter_context(
+                            concurrent.futures.ProcessPoolExecutor(
+                                self.__workers))
+                    results = executor.map(
+                        sumBlock, *zip(*[arguments[block]
+                                         for block in pending]))
+                    for (block, partial) in zip(pending, results):
+                        partials[block] = partial
+                        if progress is not None:
+                            progress.setDone(block, partial)
+        finally:
+            if progress is not None:
+                progress.close()
+        self.getRecorder().count('evaluations', valueCount)
+
+        if self.getBackend() == 'mpmath':
+            import mpmath
+
+            summe = mpmath.fsum(value for partial in partials
+                                for value in partial)
+        else:
+            # math.fsum adds the sums and compensations of all subintervals
+            # with a single rounding.
+            summe = math.fsum(value for partial in partials
+                              for value in partial)
+        return self.getScale(stepSize) * summe
+
+    def integrateStream(self):
+        """
+        Calculates the value of the numerical integration by walking through
+        the abscissa grid in chunks. The memory is bounded by the chunk size
+        and the partial sums of the chunks are added by compensated
+        summation.
+
+        With a checkpoint the next abscissa index and the compensated sum
+        are saved after every chunk, so a resumed calculation continues at
+        the last completed chunk with the same result.
+
+        Returns
+        -------
+        double : The calculated value of the numerical integration.
+        """
+        function = self.getFunction()
+        steps = function.getSteps()
+        chunkSize = self.__chunkSize
+        if chunkSize is None:
+            chunkSize = self.CHUNK_SIZE
+        stepSize = self.getStepSize()
+
+        progress = self.__checkpoint
+        if progress is not None:
+            progress.open(self.getCheckpointKey('stream', chunkSize))
+        try:
+            summe = self.sumStream(0, self.getValueCount(steps), chunkSize,
+                                   progress)
+        finally:
+            if progress is not None:
+                progress.close()
+
+        return self.getScale(stepSize) * summe.getValue()
+
+    def sumStream(self, start, stop, chunkSize, progress=None):
+        """
+        Sums the weighted ordinate values of the abscissa indices start to
+        stop - 1 chunk by chunk with compensated summation.
+
+        Parameters
+        ----------
+        start : int
+            The first abscissa index.
+        stop : int
+            The abscissa index after the last one.
+        chunkSize : int
+            The number of abscissa values per chunk.
+        progress : ctsoft.awd.math.checkpoint.Checkpoint
+            The opened checkpoint, which the sum continues from and saves to,
+            or None.
+
+        Returns
+        -------
+        ctsoft.awd.math.summation.CompensatedSum : The weighted sum without
+            the factor of the rule.
+        """
+        summe = summation.CompensatedSum()
+        if progress is not None:
+            (position, partial, compensation) = progress.getState()
+            # The saved index is the end of a chunk, so the remaining chunks
+            # have the same bounds as without the interruption.
+            if position > start:
+                start = position
+                summe.setState(partial, compensation)
+
+        for chunk in range(start, stop, chunkSize):
+            end = min(chunk + chunkSize, stop)
+            summe.add(self.sumRange(chunk, end))
+            if progress is not None:
+                progress.setState(end, *summe.getState())
+        return summe
+
+    def setCheckpoint(self, checkpoint):
+        """
+        Sets the checkpoint of the streaming and parallel mode, which saves
+        the progress of the calculation and resumes it. A checkpoint enables
+        the streaming mode.
+
+        Parameters
+        ----------
+        checkpoint : ctsoft.awd.math.checkpoint.Checkpoint
+            The checkpoint or None to not save the progress.
+        """
+        self.__checkpoint = checkpoint
+
+    def setChunkSize(self, chunkSize):
+        """
+        Sets the number of abscissa values evaluated per chunk, which enables
+        the streaming mode.
+
+        Parameters
+        ----------
+        chunkSize : int
+            The chunk size or None to stream very large grids only.
+        """
+        self.__chunkSize = chunkSize
+
+    def setExecutor(self, executor):
+        """
+        Sets the executor of the parallel mode, e.g. to share one process
+        pool between several calculations.
+
+        Parameters
+        ----------
+        executor : concurrent.futures.Executor
+            The executor or None to create a process pool per calculation.
+        """
+        self.__executor = executor
+
+    def setStore(self, resultStore):
+        """
+        Sets the result store, which returns the values of repeated
+        calculations without calculating them again.
+
+        Parameters
+        ----------
+        resultStore : ctsoft.awd.math.store.ResultStore
+            The result store or None to disable the storing.
+        """
+        self.__store = resultStore
+
+    def setWorkers(self, workers):
+        """
+        Sets the number of worker processes, which enables the parallel mode
+        for more than one worker.
+
+        Parameters
+        ----------
+        workers : int
+            The number of workers or None to disable the parallel mode.
+        """
+        self.__workers = workers
+
+    def setErrorEstimate(self, errorEstimate):
+        """
+        Sets the estimated absolute error of the last calculation.
+
+        Parameters
+        ----------
+        errorEstimate : double
+            The estimated error of the current numerical integration.
+        """
+        self.__errorEstimate = errorEstimate
+
+    def setEvaluations(self, evaluations):
+        """
+        Sets the number of function evaluations of the last calculation.
+
+        Parameters
+        ----------
+        evaluations : int
+            The number of evaluated abscissa values.
+        """
+        self.__evaluations = evaluations
+
+    def setResult(self, result):
+        """
+        Sets the result model object of the current numerical integration.
+        
+        Parameters
+        ----------
+        ctsoft.awd.math.model.Result : The result model with the important
+            values of the current calculation.
+        """
+        self.__result = result
+
+    def sumRange(self, start, stop):
+        """
+        Sums the weighted ordinate values of the abscissa indices start to
+        stop - 1. The values of the chunk are summed pairwise by numpy.
+
+        Parameters
+        ----------
+        start : int
+            The first abscissa index.
+        stop : int
+            The abscissa index after the last one.
+
+        Returns
+        -------
+        double : The weighted sum without the factor of the rule.
+        """
+        steps = self.getFunction().getSteps()
+
+        with self.getRecorder().phase('substitute'):
+            indices = numpy.arange(start, stop)
+            xValues = self.getAbscissae(indices)
+        funcValues = self.evaluate(xValues)
+
+        with self.getRecorder().phase('sum'):
+            weights = self.getWeights(indices, steps)
+            return self.toNumber(numpy.sum(weights * funcValues))
+
+
+class AdaptiveSimpson(Numerical):
+    """
+    Class for the numerical integration calculation by the adaptive simpson
+    method. Instead of a fixed number of steps, each subinterval is halved
+    until the local error estimate fulfills the tolerance or the evaluation
+    budget is used up. All subintervals of one refinement level are
+    evaluated by one call of the kernel.
+    """
+    def __init__(self, function, referenceValue, absTolerance=1e-10,
+                 relTolerance=1e-10, maxEvaluations=100000):
+        super(AdaptiveSimpson, self).__init__(function, referenceValue)
+        self.__absTolerance = absTolerance
+        self.__relTolerance = relTolerance
+        self.__maxEvaluations = maxEvaluations
+
+    def getCalculationType(self):
+        """
+        Returns the calculation type of the adaptive simpson method.
+
+        Returns
+        -------
+        str : The name of the adaptive simpson method.
+        """
+        return 'adaptive'
+
+    def getParameters(self):
+        """
+        Returns the parameters of the adaptive simpson method.
+
+        Returns
+        -------
+        dict : The parameters changing the calculated value.
+        """
+        return {'absTolerance': self.__absTolerance,
+                'relTolerance': self.__relTolerance,
+                'maxEvaluations': self.__maxEvaluations}
+
+    def integrate(self):
+        """
+        Calculates the numerical integration by the adaptive simpson method.
+
+        Returns
+        -------
+        double : The calculated value of the numerical integration.
+        """
+        # Gets the radius of the circle.
+        rCircle = self.getFunction().getRCircle()
+        length = 2.0 * rCircle
+
+        # The state of all open subintervals: the bounds, the ordinate values
+        # of the bounds and the midpoint, the simpson value of the whole
+        # subinterval and its inherited error estimate.
+        left = numpy.array([(-1.0) * rCircle])
+        right = numpy.array([rCircle])
+        funcValues = self.evaluate(numpy.array([left[0], 0.5 * (left[0] +
+                                                right[0]), right[0]]))
+        funcLeft = funcValues[0:1]
+        funcMiddle = funcValues[1:2]
+        funcRight = funcValues[2:3]
+        whole = length / 6.0 * (funcLeft + 4.0 * funcMiddle + funcRight)
+        error = numpy.array([numpy.inf])
+        evaluations = 3
+
+        calculated = 0.0
+        errorEstimate = 0.0
+
+        while len(left) > 0:
+            if evaluations + 2 * len(left) > self.__maxEvaluations:
+                # The budget is used up, so the open subintervals are
+                # accepted with their last error estimate.
+                calculated += numpy.sum(whole)
+                errorEstimate += numpy.sum(error)
+                break
+
+            middle = 0.5 * (left + right)
+            funcValues = self.evaluate(numpy.concatenate(
+                (0.5 * (left + middle), 0.5 * (middle + right))))
+            evaluations += 2 * len(left)
+            funcLeftMiddle = funcValues[:len(left)]
+            funcRightMiddle = funcValues[len(left):]
+
+            width = right - left
+            simpsonLeft = width / 12.0 * (funcLeft + 4.0 * funcLeftMiddle +
+                                          funcMiddle)
+            simpsonRight = width / 12.0 * (funcMiddle + 4.0 *
+                                           funcRightMiddle + funcRight)
+            delta = simpsonLeft + simpsonRight - whole
+
+            # The tolerance is distributed proportional to the width of the
+            # subintervals.
+            estimate = calculated + numpy.sum(simpsonLeft + simpsonRight)
+            tolerance = max(self.__absTolerance,
+                            self.__relTolerance * abs(estimate))
+            done = ((numpy.abs(delta) <= 15.0 * tolerance * width / length) |
+                    (width <= 4.0 * numpy.finfo(float).eps * length))
+
+            calculated += numpy.sum((simpsonLeft + simpsonRight +
+                                     delta / 15.0)[done])
+            errorEstimate += numpy.sum(numpy.abs(delta[done]) / 15.0)
+
+            # Splits the remaining subintervals into their two halves.
+            todo = ~done
+            error = numpy.tile(numpy.abs(delta[todo]) / 30.0, 2)
+            left, right = (numpy.concatenate((left[todo], middle[todo])),
+                           numpy.concatenate((middle[todo], right[todo])))
+            funcLeft, funcMiddle, funcRight = (
+                numpy.concatenate((funcLeft[todo], funcMiddle[todo])),
+                numpy.concatenate((funcLeftMiddle[todo],
+                                   funcRightMiddle[todo])),
+                numpy.concatenate((funcMiddle[todo], funcRight[todo])))
+            whole = numpy.concatenate((simpsonLeft[todo], simpsonRight[todo]))
+
+        self.setEvaluations(evaluations)
+        self.setErrorEstimate(float(errorEstimate))
+
+        return float(calculated)
+
+
+class AutoSteps(Numerical):
+    """
+    Class for the numerical integration with automatically selected steps.
+    Instead of a fixed number of steps, the caller gives a target relative
+    error. Three pilot runs of the chosen grid based method with pilotSteps,
+    2 * pilotSteps and 4 * pilotSteps estimate the order and the constant of
+    the error, which predict the minimal steps reaching the target. The
+    result reports the predicted and the achieved relative error and whether
+    the target is reached within maxSteps.
+    """
+    # The selected steps and the predicted error are set by the calculation.
+    STORED = False
+
+    def __init__(self, function, referenceValue, calcType='simpson',
+                 targetError=1e-6, pilotSteps=16, maxSteps=10 ** 9):
+        super(AutoSteps, self).__init__(function, referenceValue)
+        self.__calcType = calcType
+        self.__targetError = targetError
+        self.__pilotSteps = pilotSteps
+        self.__maxSteps = maxSteps
+        self.__selected = function
+        self.__predictedError = None
+        self.__converged = True
+
+    def fillResult(self, calcType, function, calculatedValue, derivation):
+        """
+        Fills a result model object with the function object of the selected
+        steps and the target, predicted and achieved relative error.
+
+        Parameters
+        ----------
+        calcType : str
+            The calculation type of the current numerical integration.
+        function : ctsoft.awd.math.model.Function
+            An model object with the needed values for the numerical
+            integration.
+        calculatedValue : double
+            The calculated value of the current numerical integration.
+        derivation : double
+            The derivation of the current numerical integration.
+
+        Returns
+        -------
+        ctsoft.awd.math.model.SelectedResult : The filled result model.
+        """
+        refValue = self.getReferenceValue()
+        achievedError = None
+        if refValue:
+            achievedError = abs(calculatedValue / refValue - 1.0)
+
+        return model.SelectedResult(calcType, self.__selected,
+                                    calculatedValue, derivation,
+                                    self.getEvaluations(),
+                                    self.getErrorEstimate(),
+                                    self.__targetError,
+                                    self.__predictedError, achievedError,
+                                    self.__converged)
+
+    def getCalculationType(self):
+        """
+        Returns the calculation type of the automatic step selection.
+
+        Returns
+        -------
+        str : The name of the automatic step selection.
+        """
+        return 'auto'
+
+    def getParameters(self):
+        """
+        Returns the parameters of the automatic step selection.
+
+        Returns
+        -------
+        dict : The parameters changing the calculated value.
+        """
+        return {'method': self.__calcType, 'targetError': self.__targetError,
+                'pilotSteps': self.__pilotSteps, 'maxSteps': self.__maxSteps}
+
+    def getSelected(self):
+        """
+        Returns the function object with the selected steps.
+
+        Returns
+        -------
+        ctsoft.awd.math.model.Function : The function object of the final
+            calculation.
+        """
+        return self.__selected
+
+    def integrate(self):
+        """
+        Selects the steps by the pilot runs and calculates the numerical
+        integration with the selected steps.
+
+        Returns
+        -------
+        double : The calculated value of the numerical integration.
+        """
+        function = self.getFunction()
+        method = METHODS[self.__calcType]
+        pilots = []
+        evaluations = 0
+
+        # The pilot runs with doubled steps.
+        for factor in (1, 2, 4):
+            steps = self.__pilotSteps * factor
+            pilots.append(self.integrateSteps(method, steps))
+            evaluations += method.getValueCount(steps)
+
+        steps = 4 * self.__pilotSteps
+        delta = abs(pilots[2] - pilots[1])
+        previous = abs(pilots[1] - pilots[0])
+        if delta == 0.0 or previous <= delta:
+            # The method is exact (or does not converge) for the pilot
+            # steps, so more steps do not help.
+            order = None
+            errorPilot = delta
+        else:
+            # The empirical order of the error err(n) = C * n ** -order.
+            order = numpy.log2(previous / delta)
+            errorPilot = delta / (2.0 ** order - 1.0)
+
+        target = self.__targetError * abs(pilots[2])
+        if order is not None and errorPilot > target:
+            steps = int(numpy.ceil(steps * (errorPilot / target) **
+                                   (1.0 / order)))
+            # The simpson method needs an even number of steps, so the steps
+            # are limited to the largest even number up to maxSteps.
+            steps += steps % 2
+            maxSteps = self.__maxSteps - self.__maxSteps % 2
+            converged = steps <= maxSteps
+            steps = min(steps, maxSteps)
+            predicted = errorPilot * (4.0 * self.__pilotSteps / steps) ** order
+            calculated = self.integrateSteps(method, steps)
+            evaluations += method.getValueCount(steps)
+        else:
+            # Without an order the pilot runs reach the target or more steps
+            # do not help.
+            converged = errorPilot <= target
+            predicted = errorPilot
+            calculated = pilots[2]
+
+        self.__selected = model.Function(function.getFunction(),
+                                         function.getRCircle(),
+                                         function.getRTorus(), steps)
+        if calculated:
+            self.__predictedError = float(predicted / abs(calculated))
+        self.__converged = bool(converged)
+        self.setEvaluations(evaluations)
+        self.setErrorEstimate(float(predicted))
+
+        return float(calculated)
+
+    def integrateSteps(self, method, steps):
+        """
+        Calculates the numerical integration of the function string with the
+        given method and steps.
+
+        Parameters
+        ----------
+        method : type
+            The class of a grid based method.
+        steps : int
+            The number of steps.
+
+        Returns
+        -------
+        double : The calculated value of the numerical integration.
+        """
+        function = self.getFunction()
+        stepFunction = model.Function(function.getFunction(),
+                                      function.getRCircle(),
+                                      function.getRTorus(), steps)
+        calculation = method(stepFunction, self.getReferenceValue())
+        calculation.setInstrumentation(self.getInstrumentation())
+        calculation.setRecorder(self.getRecorder())
+        calculation.setChunkSize(self.getChunkSize())
+        calculation.setWorkers(self.getWorkers())
+        calculation.setExecutor(self.getExecutor())
+        return calculation.integrate()
+
+
+class Cubature(Numerical):
+    """
+    Class for the numerical integration of a multi dimensional function
+    object (ctsoft.awd.math.model.MultiFunction) by a tensor product rule.
+    Every variable is mapped from [0, 1] to its bounds, which may depend on
+    the preceding variables, and the one dimensional rule is applied per
+    variable: the grid rules of METHODS (e.g. simpson) with the steps of the
+    variable or the gauss legendre nodes with the steps as order.
+
+    The tensor grid is evaluated in blocks, which split the axes of the first
+    variables as far as needed, so at most blockSize ordinate values are kept
+    in memory, and the block sums are added by compensated summation.
+    """
+    def __init__(self, function, referenceValue, rule='simpson',
+                 blockSize=2 ** 20, nodeCache=None):
+        super(Cubature, self).__init__(function, referenceValue)
+        if rule != 'gauss' and rule not in METHODS:
+            raise ValueError('Unknown rule: {0}'.format(rule))
+        if nodeCache is None:
+            nodeCache = cache.nodes
+        self.__rule = rule
+        self.__blockSize = blockSize
+        self.__nodeCache = nodeCache
+
+    def getCalculationType(self):
+        """
+        Returns the calculation type of the cubature.
+
+        Returns
+        -------
+        str : The name of the cubature.
+        """
+        return 'cubature'
+
+    def getNodes(self, steps):
+        """
+        Returns the nodes and weights of the one dimensional rule on the
+        interval [0, 1].
+
+        Parameters
+        ----------
+        steps : int
+            The steps of the grid rules or the order of the gauss legendre
+            rule.
+
+        Returns
+        -------
+        tuple : The nodes and the weights as numpy.ndarray.
+        """
+        if self.__rule == 'gauss':
+            (nodes, weights) = self.__nodeCache.get(steps)
+            return (0.5 * (nodes + 1.0), 0.5 * weights)
+
+        method = METHODS[self.__rule]
+        indices = numpy.arange(0, method.getValueCount(steps))
+        weights = method.getWeights(indices, steps) * method.getScale(
+            1.0 / steps)
+        return (indices / steps, weights)
+
+    def getParameters(self):
+        """
+        Returns the parameters of the cubature.
+
+        Returns
+        -------
+        dict : The parameters changing the calculated value.
+        """
+        function = self.getFunction()
+        return {'rule': self.__rule,
+                'variables': list(function.getVariables()),
+                'bounds': [[str(bound) for bound in bounds]
+                           for bounds in function.getBounds()]}
+
+    def getRule(self):
+        """
+        Returns the one dimensional rule of the cubature.
+
+        Returns
+        -------
+        str : The name of the rule, gauss or a grid rule of METHODS.
+        """
+        return self.__rule
+
+    def integrate(self):
+        """
+        Calculates the numerical integration by the tensor product rule.
+
+        Returns
+        -------
+        double : The calculated value of the numerical integration.
+        """
+        import sympy
+
+        function = self.getFunction()
+        variables = function.getVariables()
+        rCircle = function.getRCircle()
+        rTorus = function.getRTorus()
+        symbols = tuple(sympy.Symbol(name) for name in variables + ('r1',
+                                                                    'r2'))
+
+        with self.getRecorder().phase('parse'):
+            kernel = cache.expressions.get(function.getFunction(),
+                                           symbols).getKernel()
+            # The bounds are compiled like the function string, numbers are
+            # constant kernels.
+            bounds = [tuple(cache.expressions.get(str(bound),
+                                                  symbols).getKernel()
+                            for bound in pair)
+                      for pair in function.getBounds()]
+        rules = [self.getNodes(steps) for steps in function.getSteps()]
+
+        # The count of the nodes per block of each variable. The axes of the
+        # last variables are kept whole as far as the block size allows.
+        lengths = []
+        remaining = self.__blockSize
+        for (nodes, weights) in reversed(rules):
+            length = max(1, min(len(nodes), remaining))
+            lengths.insert(0, length)
+            remaining = max(1, remaining // length)
+        dims = len(variables)
+
+        summe = summation.CompensatedSum()
+        evaluations = 0
+        for starts in itertools.product(*(
+                range(0, len(nodes), length)
+                for ((nodes, weights), length) in zip(rules, lengths))):
+            # The open grid of the block: the axis of each variable.
+            blockRules = [(nodes[start:start + length],
+                           weights[start:start + length])
+                          for ((nodes, weights), start, length)
+                          in zip(rules, starts, lengths)]
+            shapes = [[len(nodes) if axis == dim else 1
+                       for axis in range(0, dims)]
+                      for (dim, (nodes, weights)) in enumerate(blockRules)]
+
+            with self.getRecorder().phase('substitute'):
+                values = []
+                jacobian = 1.0
+                weight = 1.0
+                for (dim, (nodes, weights)) in enumerate(blockRules):
+                    arguments = values + [0.0] * (dims - dim) + [rCircle,
+                                                                 rTorus]
+                    lower = bounds[dim][0](*arguments)
+                    upper = bounds[dim][1](*arguments)
+                    nodes = nodes.reshape(shapes[dim])
+                    values.append(lower + (upper - lower) * nodes)
+                    jacobian = jacobian * (upper - lower)
+                    weight = weight * weights.reshape(shapes[dim])
+
+            with self.getRecorder().phase('evaluate'):
+                funcValues = kernel(*(values + [rCircle, rTorus]))
+            count = int(numpy.prod([len(nodes) for (nodes, weights)
+                                    in blockRules]))
+            self.getRecorder().count('evaluations', count)
+            evaluations += count
+
+            with self.getRecorder().phase('sum'):
+                summe.add(float(numpy.sum(numpy.broadcast_to(
+                    weight * jacobian * funcValues,
+                    [len(nodes) for (nodes, weights) in blockRules]))))
+
+        self.setEvaluations(evaluations)
+
+        return summe.getValue()
+
+
+class Fused(Base):
+    """
+    Class for the numerical integration of many function strings over the
+    same abscissa grid in one pass. The function object holds the list of
+    function strings, which are specialized and compiled into one kernel
+    sharing their common subexpressions. Every chunk of the grid is
+    evaluated once for all function strings and the grid rules of METHODS
+    are applied to it together.
+
+    Methods
+    -------
+    calculate:
+        Calculates all integrals and creates the result table.
+    calculateReference:
+        Calculates the exact integrals of the function strings.
+    evaluate:
+        Evaluates all function strings on an array of abscissa values.
+    getMethods:
+        Returns the calculation types of the grid rules.
+    integrate:
+        Calculates all integrals in one pass over the grid.
+    """
+    def __init__(self, function, methods=None, referenceValues=None,
+                 chunkSize=None):
+        super(Fused, self).__init__(function)
+        if methods is None:
+            methods = sorted(METHODS)
+        self.__methods = list(methods)
+        self.__referenceValues = referenceValues
+        self.__chunkSize = chunkSize
+
+    def calculate(self):
+        """
+        Calculates the integrals of all function strings with all methods.
+
+        Returns
+        -------
+        ctsoft.awd.math.model.ResultTable : The table with one row per
+            method and function string.
+        """
+        function = self.getFunction()
+        recorder = self.getInstrumentation().begin('fused')
+        self.setRecorder(recorder)
+        calculated = self.integrate()
+        referenceValues = self.__referenceValues
+        if referenceValues is None:
+            referenceValues = self.calculateReference()
+        self.setRecorder(instrumentation.NULL_RECORDER)
+        metrics = recorder.finish()
+
+        table = model.ResultTable()
+        for (index, calcType) in enumerate(self.__methods):
+            for (funcString, value, refValue) in zip(
+                    function.getFunction(), calculated[index],
+                    referenceValues):
+                single = model.Function(funcString, function.getRCircle(),
+                                        function.getRTorus(),
+                                        function.getSteps())
+                derivation = self.calculateDerivation(float(value),
+                                                      float(refValue))
+                result = model.Result(calcType, single, float(value),
+                                      derivation)
+                result.setMetrics(metrics)
+                table.append(result)
+        self.setCalculatedValue(table)
+
+        return table
+
+    def calculateReference(self):
+        """
+        Calculates the exact integrals of the function strings by their
+        antiderivative.
+
+        Returns
+        -------
+        list : The exact integrals, NaN for function strings without a
+            symbolic antiderivative defined at the bounds.
+        """
+        function = self.getFunction()
+        referenceValues = []
+        for funcString in function.getFunction():
+            single = model.Function(funcString, function.getRCircle(),
+                                    function.getRTorus(), 0)
+            try:
+                referenceValues.append(
+                    Integrated(single).calculate().getCalculatedValue())
+            except (ArithmeticError, TypeError, ValueError):
+                # The antiderivative is missing or not defined at a bound.
+                referenceValues.append(numpy.nan)
+        return referenceValues
+
+    def evaluate(self, xValues):
+        """
+        Evaluates all function strings on the abscissa values with one call
+        of the fused kernel.
+
+        Parameters
+        ----------
+        xValues : numpy.ndarray
+            The abscissa values.
+
+        Returns
+        -------
+        numpy.ndarray : The ordinate values with one row per function
+            string.
+        """
+        kernel = self.getSpecialized().getKernel()
+        recorder = self.getRecorder()
+        recorder.count('evaluations', numpy.size(xValues))
+
+        with recorder.phase('evaluate'):
+            values = kernel(xValues)
+        # Function strings without the abscissa return a scalar.
+        return numpy.array([numpy.broadcast_to(numpy.asarray(
+            value, dtype=float), numpy.shape(xValues)) for value in values])
+
+    def getMethods(self):
+        """
+        Returns the calculation types of the grid rules.
+
+        Returns
+        -------
+        list : The names of the numerical methods.
+        """
+        return self.__methods
+
+    def integrate(self):
+        """
+        Calculates the integrals of all function strings with all methods in
+        one pass over the abscissa grid. The grid is evaluated chunk by
+        chunk and the weighted sums of the chunks are added by compensated
+        summation per method and function string.
+
+        Returns
+        -------
+        numpy.ndarray : The calculated values with one row per method and
+            one column per function string.
+        """
+        function = self.getFunction()
+        steps = function.getSteps()
+        chunkSize = self.__chunkSize
+        if chunkSize is None:
+            chunkSize = Numerical.CHUNK_SIZE
+        methods = [METHODS[calcType] for calcType in self.__methods]
+        count = len(function.getFunction())
+        valueCount = max(method.getValueCount(steps) for method in methods)
+
+        sums = [[summation.CompensatedSum() for index in range(0, count)]
+                for method in methods]
+        for start in range(0, valueCount, chunkSize):
+            with self.getRecorder().phase('substitute'):
+                indices = numpy.arange(start, min(start + chunkSize,
+                                                  valueCount))
+                xValues = self.getAbscissae(indices)
+            funcValues = self.evaluate(xValues)
+
+            with self.getRecorder().phase('sum'):
+                for (method, methodSums) in zip(methods, sums):
+                    # The rectangle method omits the last abscissa value.
+                    valid = indices < method.getValueCount(steps)
+                    partials = numpy.dot(funcValues[:, valid],
+                                         method.getWeights(indices[valid],
+                                                           steps))
+                    for (summe, partial) in zip(methodSums, partials):
+                        summe.add(float(partial))
+
+        stepSize = self.getStepSize()
+        return numpy.array([[method.getScale(stepSize) * summe.getValue()
+                             for summe in methodSums]
+                            for (method, methodSums) in zip(methods, sums)])
+
+
+class GaussLegendre(Numerical):
+    """
+    Class for the numerical integration calculation by the gauss legendre
+    method. The steps of the function object are used as the order, which is
+    the number of evaluated nodes. The nodes and weights are cached per order,
+    which is limited to ctsoft.awd.math.cache.NodeCache.MAX_ORDER.
+    """
+    def __init__(self, function, referenceValue, order=None, nodeCache=None):
+        super(GaussLegendre, self).__init__(function, referenceValue)
+        if order is None:
+            order = function.getSteps()
+        if nodeCache is None:
+            nodeCache = cache.nodes
+        self.__order = order
+        self.__nodeCache = nodeCache
+
+    def getCalculationType(self):
+        """
+        Returns the calculation type of the gauss legendre method.
+
+        Returns
+        -------
+        str : The name of the gauss legendre method.
+        """
+        return 'gauss'
+
+    def getParameters(self):
+        """
+        Returns the parameters of the gauss legendre method.
+
+        Returns
+        -------
+        dict : The parameters changing the calculated value.
+        """
+        return {'order': self.__order}
+
+    def getOrder(self):
+        """
+        Returns the order of the gauss legendre method.
+
+        Returns
+        -------
+        int : The number of nodes.
+        """
+        return self.__order
+
+    def integrate(self):
+        """
+        Calculates the numerical integration by the gauss legendre method.
+
+        Returns
+        -------
+        double : The calculated value of the numerical integration.
+        """
+        # Gets the radius of the circle.
+        rCircle = self.getFunction().getRCircle()
+        (nodes, weights) = self.__nodeCache.get(self.__order)
+        # Maps the nodes from [-1, 1] to [-rCircle, rCircle].
+        funcValues = self.evaluate(rCircle * nodes)
+        self.setEvaluations(len(nodes))
+
+        return float(rCircle * numpy.dot(weights, funcValues))
+
+
+class Integrated(Base):
+    """
+    Class for the exact integral calculation. The function string is
+    integrated symbolically over [-rCircle, rCircle]. The antiderivative is
+    stored in the persistent cache, so the slow symbolic integration runs
+    only once per function string.
+
+    If the antiderivative has no real value at a bound (e.g. log(x - r2)),
+    it is evaluated again in complex mpmath numbers, so the branches of the
+    logarithm cancel in the difference (mpmath has no signed zeros, which
+    would move the branches). If the difference is still not finite (e.g.
+    (x - r1) * log(r1 - x) at x = r1) or not real (e.g. a pole inside the
+    interval) or sympy finds no antiderivative (e.g. abs(x)), the definite
+    integral is calculated symbolically, which takes the limits at the
+    bounds. An integral without a finite real value raises a ValueError.
+    """
+    # The relative size of a negligible imaginary part of the integral.
+    IMAGINARY_TOLERANCE = 1e-12
+
+    def __init__(self, function):
+        super(Integrated, self).__init__(function)
+
+    def calculate(self):
+        """
+        Calculates the exact integral.
+        
+        Returns
+        -------
+        ctsoft.awd.math.model.Origin : The result model with the important
+            values of the current calculation.
+        """
+        # get the function with the needed values
+        function = self.getFunction()
+        # Gets the radius of the circle.
+        rCircle = function.getRCircle()
         # Gets the radius of the Torus (see the documentation for further
         # information of this variable).
         rTorus = function.getRTorus()
+        # defines the calculation type which will be used to decide, which
+        # printing method will be used and to output this information also
+        # as a part of the result summary.
+        calcType = 'integral'
+        recorder = self.getInstrumentation().begin(calcType)
+        backend = self.getBackend()
+
+        # Evaluates the antiderivative at the bounds of the integral.
+        calculated = None
+        try:
+            with recorder.phase('integrateSymbolic'):
+                kernel = self.getAntiderivative().getKernel()
+        except ValueError:
+            # sympy finds no antiderivative (e.g. abs(x)), but maybe the
+            # definite integral.
+            kernel = None
+        if kernel is not None:
+            with recorder.phase('evaluate'), self.getContext():
+                if backend == 'mpmath':
+                    import mpmath
+
+                    rCircle = mpmath.mpf(rCircle)
+                    rTorus = mpmath.mpf(rTorus)
+                # The values without a real result are rejected by getReal.
+                with numpy.errstate(all='ignore'):
+                    calculated = self.getReal(
+                        kernel(rCircle, rCircle, rTorus) -
+                        kernel((-1.0) * rCircle, rCircle, rTorus))
+            recorder.count('evaluations', 2)
+
+            if calculated is None:
+                with recorder.phase('integrateSymbolic'):
+                    kernel = self.getAntiderivative('mpmath').getKernel()
+                calculated = self.evaluateComplex(
+                    lambda r1, r2: kernel(r1, r1, r2) - kernel(-r1, r1, r2),
+                    rCircle, rTorus)
+                recorder.count('evaluations', 2)
+        if calculated is None:
+            with recorder.phase('integrateSymbolic'):
+                kernel = self.getDefinite('mpmath').getKernel()
+            calculated = self.evaluateComplex(kernel, rCircle, rTorus)
+            recorder.count('evaluations', 1)
+        if calculated is None:
+            raise ValueError('The integral of the function string {0} is not '
+                             'finite.'.format(function.getFunction()))
+        # Sets the calculated value as object variable.
+        self.setCalculatedValue(calculated)
+
+        # Creates the model for the output.
+        result = model.Origin(calcType, function, calculated)
+        result.setBackend(backend)
+        result.setMetrics(recorder.finish())
+
+        return result
+
+    def getAntiderivative(self, modules=None):
+        """
+        Returns the compiled antiderivative of the function string with
+        respect to x.
+
+        Parameters
+        ----------
+        modules : str
+            The module evaluating the kernel, numpy or mpmath (None for the
+            one of the backend).
+
+        Returns
+        -------
+        ctsoft.awd.math.cache.CompiledExpression : The antiderivative and its
+            kernel with the arguments x, r1 and r2.
+
+        Raises
+        ------
+        ValueError : If the function string can not be integrated
+            symbolically.
+        """
+        symbols = Base.calculate(self)
+        symbols = (symbols['x'], symbols['r1'], symbols['r2'])
+        funcString = self.getFunction().getFunction()
+        antiderivative = cache.antiderivatives.get(funcString, symbols,
+                                                   self.integrateSymbolic)
+        if modules is None:
+            modules = 'mpmath' if self.getBackend() == 'mpmath' else 'numpy'
+        return cache.expressions.get(antiderivative, symbols, modules)
+
+    def getDefinite(self, modules=None):
+        """
+        Returns the compiled definite integral of the function string over
+        [-r1, r1].
+
+        Parameters
+        ----------
+        modules : str
+            The module evaluating the kernel, numpy or mpmath (None for the
+            one of the backend).
+
+        Returns
+        -------
+        ctsoft.awd.math.cache.CompiledExpression : The definite integral and
+            its kernel with the arguments r1 and r2.
+
+        Raises
+        ------
+        ValueError : If the function string can not be integrated
+            symbolically.
+        """
+        symbols = Base.calculate(self)
+        funcString = self.getFunction().getFunction()
+        definite = cache.definites.get(
+            funcString, (symbols['x'], symbols['r1'], symbols['r2']),
+            self.integrateDefinite)
+        if modules is None:
+            modules = 'mpmath' if self.getBackend() == 'mpmath' else 'numpy'
+        return cache.expressions.get(definite, (symbols['r1'], symbols['r2']),
+                                     modules)
+
+    def evaluateComplex(self, kernel, rCircle, rTorus):
+        """
+        Evaluates a mpmath kernel of the radii in complex numbers with the
+        digits of the calculation.
+
+        Parameters
+        ----------
+        kernel : callable
+            The mpmath kernel with the arguments r1 and r2.
+        rCircle : double
+            The radius of the circle.
+        rTorus : double
+            The radius of the torus.
+
+        Returns
+        -------
+        float or mpmath.mpf : The real value of the kernel or None if the
+            value is not finite and real, see getReal.
+        """
+        import mpmath
+
+        with mpmath.workdps(self.getDigits()):
+            return self.getReal(kernel(mpmath.mpc(rCircle),
+                                       mpmath.mpc(rTorus)))
+
+    def getReal(self, value):
+        """
+        Returns the real value of an evaluated integral. The value is
+        accepted if it is finite and its imaginary part is negligible
+        (IMAGINARY_TOLERANCE relative to the real part).
+
+        Parameters
+        ----------
+        value : object
+            The value, e.g. a float or a mpmath.mpc.
+
+        Returns
+        -------
+        float or mpmath.mpf : The real part in the number type of the
+            backend or None if the value is not accepted.
+        """
+        (real, imaginary) = (value.real, value.imag)
+        if not (math.isfinite(float(real)) and math.isfinite(
+                float(imaginary))):
+            return None
+        if abs(imaginary) > self.IMAGINARY_TOLERANCE * max(1.0, abs(real)):
+            return None
+        return self.toNumber(real)
+
+    def integrateSymbolic(self, expression):
+        """
+        Integrates the expression symbolically with respect to x. The radius
+        of the circle is assumed to be positive during the integration.
+
+        Parameters
+        ----------
+        expression : sympy.Expr
+            The parsed function string.
+
+        Returns
+        -------
+        sympy.Expr : The antiderivative of the expression.
+
+        Raises
+        ------
+        ValueError : If sympy can not find the antiderivative.
+        """
+        import sympy
+
+        symbols = Base.calculate(self)
+        rCircle = sympy.Symbol('r1', positive=True)
+        antiderivative = sympy.integrate(
+            expression.subs(symbols['r1'], rCircle), symbols['x'])
+
+        if antiderivative.has(sympy.Integral):
+            raise ValueError('The function string {0} can not be integrated '
+                             'symbolically.'.format(expression))
+
+        return antiderivative.subs(rCircle, symbols['r1'])
+
+    def integrateDefinite(self, expression):
+        """
+        Integrates the expression symbolically over [-r1, r1]. The radius of
+        the circle is assumed to be positive during the integration.
+
+        Parameters
+        ----------
+        expression : sympy.Expr
+            The parsed function string.
+
+        Returns
+        -------
+        sympy.Expr : The definite integral depending on r1 and r2.
+
+        Raises
+        ------
+        ValueError : If sympy can not find the definite integral.
+        """
+        import sympy
+
+        symbols = Base.calculate(self)
+        rCircle = sympy.Symbol('r1', positive=True)
+        definite = sympy.integrate(expression.subs(symbols['r1'], rCircle),
+                                   (symbols['x'], -rCircle, rCircle))
+
+        if definite.has(sympy.Integral):
+            raise ValueError('The function string {0} can not be integrated '
+                             'symbolically.'.format(expression))
+
+        return definite.subs(rCircle, symbols['r1'])
+
+
+class MonteCarlo(Numerical):
+    """
+    Class for the estimation of the volume of a solid by sampling its
+    bounding box with monte carlo (random) or quasi monte carlo (sobol)
+    points. The solid is the set of points, where the implicit function
+    string of x, y, z, r1 and r2 is not positive, e.g. TORUS for the torus of
+    the function object. The function string of the function object is not
+    used, so the method is not registered in CALCULATIONS and the solid must
+    be given explicitly.
+
+    The points are drawn in independent reproducible streams (one per
+    worker task), each stream is an estimate of the volume on its own. The
+    number of points per stream is doubled until the standard error of the
+    mean of the streams falls below the tolerance, so the result does not
+    depend on the number of workers.
+    """
+    # The implicit function of the torus with the radius r1 of the circle
+    # and the radius r2 of the torus.
+    TORUS = '(sqrt(x**2 + y**2) - r2)**2 + z**2 - r1**2'
+
+    def __init__(self, function, referenceValue, solid, sampler='sobol',
+                 bounds=None, streams=16, batchSize=2 ** 12,
+                 relTolerance=1e-4, absTolerance=0.0, maxSamples=2 ** 24,
+                 confidence=0.95, seed=0):
+        super(MonteCarlo, self).__init__(function, referenceValue)
+        if sampler not in sampling.SAMPLERS:
+            raise ValueError('Unknown sampler: {0}'.format(sampler))
+        if streams < 2:
+            raise ValueError('The standard error needs at least two '
+                             'streams.')
+        self.__sampler = sampler
+        self.__solid = solid
+        self.__bounds = bounds
+        self.__streams = streams
+        self.__batchSize = batchSize
+        self.__relTolerance = relTolerance
+        self.__absTolerance = absTolerance
+        self.__maxSamples = maxSamples
+        self.__confidence = confidence
+        self.__seed = seed
+
+    def fillResult(self, calcType, function, calculatedValue, derivation):
+        """
+        Fills a result model object with the standard error and the
+        confidence interval of the estimated volume.
+
+        Parameters
+        ----------
+        calcType : str
+            The calculation type of the current numerical integration.
+        function : ctsoft.awd.math.model.Function
+            An model object with the needed values for the numerical
+            integration.
+        calculatedValue : double
+            The estimated volume.
+        derivation : double
+            The derivation of the estimated volume.
+
+        Returns
+        -------
+        ctsoft.awd.math.model.IntervalResult : The filled result model.
+        """
+        # The estimate of the mean of the streams is normally distributed.
+        quantile = statistics.NormalDist().inv_cdf(
+            0.5 + 0.5 * self.__confidence)
+        halfWidth = quantile * self.getErrorEstimate()
+        return model.IntervalResult(calcType, function, calculatedValue,
+                                    derivation, self.getEvaluations(),
+                                    self.getErrorEstimate(),
+                                    self.__confidence,
+                                    calculatedValue - halfWidth,
+                                    calculatedValue + halfWidth)
+
+    def getBounds(self):
+        """
+        Returns the half edge lengths of the bounding box centered at the
+        origin.
+
+        Returns
+        -------
+        tuple : The half edge lengths in x, y and z, by default the ones of
+            the torus.
+        """
+        if self.__bounds is not None:
+            return tuple(self.__bounds)
+        function = self.getFunction()
+        rCircle = function.getRCircle()
+        rTorus = function.getRTorus()
+        return (rTorus + rCircle, rTorus + rCircle, rCircle)
+
+    def getCalculationType(self):
+        """
+        Returns the calculation type of the monte carlo method.
+
+        Returns
+        -------
+        str : The name of the monte carlo method.
+        """
+        return 'montecarlo'
+
+    def getParameters(self):
+        """
+        Returns the parameters of the monte carlo method.
+
+        Returns
+        -------
+        dict : The parameters changing the calculated value.
+        """
+        return {'sampler': self.__sampler, 'solid': self.getSolid(),
+                'bounds': list(self.getBounds()), 'streams': self.__streams,
+                'batchSize': self.__batchSize,
+                'relTolerance': self.__relTolerance,
+                'absTolerance': self.__absTolerance,
+                'maxSamples': self.__maxSamples,
+                'confidence': self.__confidence, 'seed': self.__seed}
+
+    def getSolid(self):
+        """
+        Returns the implicit function string of the solid.
+
+        Returns
+        -------
+        str : The function string of x, y, z, r1 and r2.
+        """
+        return self.__solid
+
+    def integrate(self):
+        """
+        Estimates the volume of the solid. Every round draws as many new
+        points per stream as the stream already has (the first round draws
+        batchSize points), until the standard error reaches the tolerance or
+        maxSamples points are drawn.
+
+        Returns
+        -------
+        double : The estimated volume.
+        """
+        function = self.getFunction()
+        bounds = self.getBounds()
+        volume = 8.0 * bounds[0] * bounds[1] * bounds[2]
+        streams = self.__streams
+        workers = self.getWorkers()
+
+        hits = numpy.zeros(streams)
+        count = 0
+        with contextlib.ExitStack() as stack:
+            executor = self.getExecutor()
+            if executor is None and workers is not None and workers > 1:
+                executor = stack.enter_context(
+                    concurrent.futures.ProcessPoolExecutor(workers))
+
+            while True:
+                batch = max(count, self.__batchSize)
+                arguments = [(self.getSolid(), bounds, function.getRCircle(),
+                              function.getRTorus(), self.__sampler,
+                              self.__seed, stream, count, batch)
+                             for stream in range(0, streams)]
+                if executor is None:
+                    partials = [countBlock(*argument)
+                                for argument in arguments]
+                else:
+                    partials = list(executor.map(countBlock,
+                                                 *zip(*arguments)))
+                hits += partials
+                count += batch
+                self.getRecorder().count('evaluations', streams * batch)
+
+                # Every stream is an estimate of the volume.
+                estimates = volume * hits / count
+                calculated = float(numpy.mean(estimates))
+                stdError = float(numpy.std(estimates, ddof=1) /
+                                 math.sqrt(streams))
+                tolerance = max(self.__absTolerance,
+                                self.__relTolerance * abs(calculated))
+                if (stdError <= tolerance or
+                        2 * streams * count > self.__maxSamples):
+                    break
+
+        self.setEvaluations(streams * count)
+        self.setErrorEstimate(stdError)
+
+        return calculated
+
+
+class Rectangle(Numerical):
+    """
+    Class for the numerical integration calculation by the rectangle method.
+    """
+    BACKENDS = ('float64', 'mpmath')
+
+    def __init__(self, function, referenceValue, sample=None):
+        super(Rectangle, self).__init__(function, referenceValue, sample)
+
+    def getCalculationType(self):
+        """
+        Returns the calculation type of the rectangle method.
+
+        Returns
+        -------
+        str : The name of the rectangle method.
+        """
+        return 'rectangle'
+
+    @staticmethod
+    def getScale(stepSize):
+        """
+        Returns the factor of the weighted sum of the rectangle method.
+
+        Parameters
+        ----------
+        stepSize : double
+            The step size of the abscissa grid.
+
+        Returns
+        -------
+        double : The step size.
+        """
+        return stepSize
+
+    @staticmethod
+    def getValueCount(steps):
+        """
+        Returns the number of abscissa values used by the rectangle method,
+        which does not use the last abscissa value.
+
+        Parameters
+        ----------
+        steps : int
+            The number of steps.
+
+        Returns
+        -------
+        int : The number of abscissa values.
+        """
+        return steps
+
+    @staticmethod
+    def getWeights(indices, steps):
+        """
+        Returns the weights of the rectangle method, which are all one.
+
+        Parameters
+        ----------
+        indices : numpy.ndarray
+            The indices k of the abscissa values -rCircle + h * k.
+        steps : int
+            The number of steps.
+
+        Returns
+        -------
+        numpy.ndarray : The weights of the indices.
+        """
+        return numpy.ones(numpy.shape(indices))
+
+    @staticmethod
+    def integrateSamples(funcValues, stepSize):
+        """
+        Calculates the numerical integration by the rectangle method. The
+        last ordinate value of the grid is not used by this method.
+
+        Parameters
+        ----------
+        funcValues : numpy.ndarray
+            The ordinate values of the steps + 1 abscissa values in the last
+            axis.
+        stepSize : double or numpy.ndarray
+            The step size of the abscissa grid.
+
+        Returns
+        -------
+        double or numpy.ndarray : The calculated integration value(s).
+        """
+        # Sum all calculated ordinate values without the last step.
+        summe = numpy.sum(funcValues[..., :-1], axis=-1)
+
+        return summe * stepSize
+
+
+class Sample(Base):
+    """
+    Class for the ordinate values of the equidistant abscissa grid
+    -rCircle + h * k with k = 0, ..., steps. The grid is evaluated only once
+    and can be shared by all numerical methods of the same function.
+
+    Methods
+    -------
+    calculate:
+        Evaluates the function string on the abscissa grid.
+    getValues:
+        Returns the ordinate values of the abscissa grid.
+    """
+    def __init__(self, function):
+        super(Sample, self).__init__(function)
+
+    def calculate(self):
+        """
+        Evaluates the function string on all abscissa values of the grid.
+
+        Returns
+        -------
+        numpy.ndarray : The steps + 1 ordinate values.
+        """
+        # get the function with the needed values
+        function = self.getFunction()
         # Gets the number of steps to calculate the numerical integration.
         steps = function.getSteps()
-        # Calculates the step size for the calculation (this is the symbol "h"
-        # in the documentation)
-        stepSize = 2.0 * rCircle / steps
+        # Calculates all abscissa values including the last step.
+        with self.getContext():
+            with self.getRecorder().phase('substitute'):
+                xValues = self.getAbscissae(numpy.arange(0, steps + 1))
+            # Calculates the ordinate values of all abscissa values at once.
+            funcValues = self.evaluate(xValues)
+        # Sets the calculated values as object variable.
+        self.setCalculatedValue(funcValues)
+
+        return funcValues
+
+    def getValues(self):
+        """
+        Returns the ordinate values of the abscissa grid. The function string
+        is evaluated at the first call only.
+
+        Returns
+        -------
+        numpy.ndarray : The steps + 1 ordinate values.
+        """
+        funcValues = self.getCalculatedValue()
+        if funcValues is None:
+            funcValues = self.calculate()
+        return funcValues
+
+
+class Simpson(Numerical):
+    """
+    Class for the numerical integration calculation by the simpson method.
+    """
+    BACKENDS = ('float64', 'mpmath')
+
+    def __init__(self, function, referenceValue, sample=None):
+        super(Simpson, self).__init__(function, referenceValue, sample)
+
+    def getCalculationType(self):
+        """
+        Returns the calculation type of the simpson method.
+
+        Returns
+        -------
+        str : The name of the simpson method.
+        """
+        return 'simpson'
+
+    @staticmethod
+    def getScale(stepSize):
+        """
+        Returns the factor of the weighted sum of the simpson method.
+
+        Parameters
+        ----------
+        stepSize : double
+            The step size of the abscissa grid.
+
+        Returns
+        -------
+        double : A third of the step size.
+        """
+        return stepSize / 3
+
+    @staticmethod
+    def getValueCount(steps):
+        """
+        Returns the number of abscissa values used by the simpson method.
+
+        Parameters
+        ----------
+        steps : int
+            The number of steps.
+
+        Returns
+        -------
+        int : The number of abscissa values including the last one.
+        """
+        return steps + 1
+
+    @staticmethod
+    def getWeights(indices, steps):
+        """
+        Returns the weights of the simpson method: one for the first and last
+        abscissa value, four for the odd and two for the even indices.
+
+        Parameters
+        ----------
+        indices : numpy.ndarray
+            The indices k of the abscissa values -rCircle + h * k.
+        steps : int
+            The number of steps.
+
+        Returns
+        -------
+        numpy.ndarray : The weights of the indices.
+        """
+        weights = numpy.where(indices % 2 == 1, 4.0, 2.0)
+        weights[(indices == 0) | (indices == steps)] = 1.0
+        return weights
+
+    @staticmethod
+    def integrateSamples(funcValues, stepSize):
+        """
+        Calculates the numerical integration by the simpson method.
+
+        Parameters
+        ----------
+        funcValues : numpy.ndarray
+            The ordinate values of the steps + 1 abscissa values in the last
+            axis.
+        stepSize : double or numpy.ndarray
+            The step size of the abscissa grid.
+
+        Returns
+        -------
+        double or numpy.ndarray : The calculated integration value(s).
+        """
+        # Variable for the sum of all odd steps ordinate values.
+        sumOdd = numpy.sum(funcValues[..., 1:-1:2], axis=-1)
+        # Variable for the sum of all even steps ordinate values without the
+        # first and last step.
+        sumEven = numpy.sum(funcValues[..., 2:-1:2], axis=-1)
+        # Variable for the sum of first and last ordinate values.
+        sumStartEnd = funcValues[..., 0] + funcValues[..., -1]
+
+        return stepSize / 3 * (sumStartEnd + 4 * sumOdd + 2 * sumEven)
+
+
+class TanhSinh(Numerical):
+    """
+    Class for the numerical integration calculation by the tanh-sinh (double
+    exponential) method. The substitution x = rCircle * tanh(pi / 2 *
+    sinh(t)) moves the abscissa values doubly exponentially towards the
+    bounds, so integrands with singular derivatives at the bounds like the
+    torus integrand converge exponentially. The step size of t is halved per
+    level and only the new odd abscissa values are evaluated.
+
+    Close to the bounds the abscissa values x = +-(rCircle - d) lose the
+    distance d to the bound by cancellation. So d is calculated directly
+    from t and the function string is evaluated as function of d: the
+    abscissa is substituted symbolically and the result is expanded, e.g.
+    r1**2 - x**2 becomes 2*r1*d - d**2. This keeps singularities at the
+    bounds like 1/sqrt(r1**2 - x**2) exponentially convergent.
+    """
+    def __init__(self, function, referenceValue, absTolerance=1e-14,
+                 relTolerance=1e-14, maxLevels=10):
+        super(TanhSinh, self).__init__(function, referenceValue)
+        self.__absTolerance = absTolerance
+        self.__relTolerance = relTolerance
+        self.__maxLevels = maxLevels
+
+    def getComplements(self):
+        """
+        Returns the function string as function of the distance to the
+        bounds from the process wide caches, specialized on the radii of the
+        function object.
+
+        Returns
+        -------
+        ctsoft.awd.math.cache.CompiledExpression : The fused kernel of the
+            distance d, which returns the ordinate values at the upper bound
+            minus d and at the lower bound plus d.
+        """
+        import sympy
+
+        symbols = Base.calculate(self)
+        symbols = (symbols['x'], symbols['r1'], symbols['r2'])
+        function = self.getFunction()
+        with self.getRecorder().phase('parse'):
+            complements = cache.complements.get(function.getFunction(),
+                                                symbols, self.substitute)
+            (compiled, hit) = cache.expressions.lookup(
+                [str(single) for single in sympy.sympify(complements)],
+                symbols, 'numpy',
+                (function.getRCircle(), function.getRTorus()))
+        self.getRecorder().count('cacheHits' if hit else 'cacheMisses')
+        return compiled
+
+    def getCalculationType(self):
+        """
+        Returns the calculation type of the tanh-sinh method.
+
+        Returns
+        -------
+        str : The name of the tanh-sinh method.
+        """
+        return 'tanhsinh'
+
+    def getParameters(self):
+        """
+        Returns the parameters of the tanh-sinh method.
+
+        Returns
+        -------
+        dict : The parameters changing the calculated value.
+        """
+        return {'absTolerance': self.__absTolerance,
+                'relTolerance': self.__relTolerance,
+                'maxLevels': self.__maxLevels}
+
+    def integrate(self):
+        """
+        Calculates the numerical integration by the tanh-sinh method.
+
+        Returns
+        -------
+        double : The calculated value of the numerical integration.
+        """
+        # Gets the radius of the circle.
+        rCircle = self.getFunction().getRCircle()
+        kernel = self.getComplements().getKernel()
+        # Beyond this value of t the distance of the abscissa values to the
+        # bounds falls below the smallest normal double.
+        tMax = numpy.arcsinh(2.0 / numpy.pi * 0.5 * numpy.log(
+            2.0 / numpy.finfo(float).tiny))
+
+        # The first level uses the step size 1 including t = 0. The values
+        # of t are mirrored, so only the non negative ones are evaluated.
+        stepSize = 1.0
+        tValues = numpy.arange(0.0, numpy.floor(tMax) + 1.0)
+        summe = self.sumWeighted(tValues, rCircle, kernel)
+        evaluations = 2 * len(tValues) - 1
+        calculated = stepSize * summe
+        errorEstimate = None
+
+        for level in range(1, self.__maxLevels + 1):
+            stepSize *= 0.5
+            # Only the odd multiples of the new step size are new values.
+            count = int(numpy.floor((tMax / stepSize + 1.0) / 2.0))
+            tValues = (2.0 * numpy.arange(0, count) + 1.0) * stepSize
+            summe += self.sumWeighted(tValues, rCircle, kernel)
+            evaluations += 2 * len(tValues)
+
+            previous = calculated
+            calculated = stepSize * summe
+            errorEstimate = abs(calculated - previous)
+            tolerance = max(self.__absTolerance,
+                            self.__relTolerance * abs(calculated))
+            if errorEstimate <= tolerance:
+                break
+
+        self.setEvaluations(evaluations)
+        self.setErrorEstimate(errorEstimate)
+
+        return calculated
+
+    def substitute(self, expression):
+        """
+        Substitutes the abscissa by the distance to the bounds and expands
+        the result, so the differences to the bounds cancel symbolically.
+
+        Parameters
+        ----------
+        expression : sympy.Expr
+            The parsed function string.
+
+        Returns
+        -------
+        list : The expressions of x = r1 - d and x = -r1 + d, where the
+            symbol x is the distance d.
+        """
+        import sympy
+
+        symbols = Base.calculate(self)
+        (x, rCircle) = (symbols['x'], symbols['r1'])
+        return [sympy.expand(expression.xreplace({x: bound}))
+                for bound in (rCircle - x, x - rCircle)]
+
+    def sumWeighted(self, tValues, rCircle, kernel):
+        """
+        Evaluates the function string on the abscissa values of the given
+        non negative values of t and their negatives and sums them multiplied
+        by their weights.
+
+        Parameters
+        ----------
+        tValues : numpy.ndarray
+            The non negative values of the substituted variable t.
+        rCircle : double
+            The radius of the circle.
+        kernel : callable
+            The kernel of the distance to the bounds, see getComplements.
+
+        Returns
+        -------
+        double : The weighted sum of the ordinate values without the step
+            size.
+        """
+        inner = 0.5 * numpy.pi * numpy.sinh(tValues)
+        # 1 - tanh(inner) and 1 / cosh(inner) ** 2 without the cancellation
+        # and the overflow for large values of inner.
+        decay = numpy.exp(-2.0 * inner)
+        distances = rCircle * 2.0 * decay / (1.0 + decay)
+        # The weights are the derivative of the substitution.
+        weights = (rCircle * 0.5 * numpy.pi * numpy.cosh(tValues) * 4.0 *
+                   decay / (1.0 + decay) ** 2)
+        # The value t = 0 is its own negative.
+        weights[tValues == 0.0] *= 0.5
+
+        self.getRecorder().count('evaluations', 2 * len(tValues))
+        with self.getRecorder().phase('evaluate'):
+            (upper, lower) = kernel(distances)
+        funcValues = (numpy.broadcast_to(numpy.asarray(upper, dtype=float),
+                                         distances.shape) +
+                      numpy.broadcast_to(numpy.asarray(lower, dtype=float),
+                                         distances.shape))
+        return float(numpy.dot(weights, funcValues))
+
+
+class Trapezoid(Numerical):
+    """
+    Class for the numerical integration calculation by the trapezoid method.
+    """
+    BACKENDS = ('float64', 'mpmath')
+
+    def __init__(self, function, referenceValue, sample=None):
+        super(Trapezoid, self).__init__(function, referenceValue, sample)
+
+    def getCalculationType(self):
+        """
+        Returns the calculation type of the trapezoid method.
+
+        Returns
+        -------
+        str : The name of the trapezoid method.
+        """
+        return 'trapezoid'
+
+    @staticmethod
+    def getScale(stepSize):
+        """
+        Returns the factor of the weighted sum of the trapezoid method.
+
+        Parameters
+        ----------
+        stepSize : double
+            The step size of the abscissa grid.
+
+        Returns
+        -------
+        double : The step size.
+        """
+        return stepSize
+
+    @staticmethod
+    def getValueCount(steps):
+        """
+        Returns the number of abscissa values used by the trapezoid method.
+
+        Parameters
+        ----------
+        steps : int
+            The number of steps.
+
+        Returns
+        -------
+        int : The number of abscissa values including the last one.
+        """
+        return steps + 1
+
+    @staticmethod
+    def getWeights(indices, steps):
+        """
+        Returns the weights of the trapezoid method: one half for the first
+        and last abscissa value and one for all others.
+
+        Parameters
+        ----------
+        indices : numpy.ndarray
+            The indices k of the abscissa values -rCircle + h * k.
+        steps : int
+            The number of steps.
+
+        Returns
+        -------
+        numpy.ndarray : The weights of the indices.
+        """
+        weights = numpy.ones(numpy.shape(indices))
+        weights[(indices == 0) | (indices == steps)] = 0.5
+        return weights
+
+    @staticmethod
+    def integrateSamples(funcValues, stepSize):
+        """
+        Calculates the numerical integration by the trapezoid method.
+
+        Parameters
+        ----------
+        funcValues : numpy.ndarray
+            The ordinate values of the steps + 1 abscissa values in the last
+            axis.
+        stepSize : double or numpy.ndarray
+            The step size of the abscissa grid.
+
+        Returns
+        -------
+        double or numpy.ndarray : The calculated integration value(s).
+        """
         # Variable for the sum of the first and last ordinate values coming
         # from the trapezoid method.
-        # method.
-        sumEdge = 0.0
+        sumEdge = funcValues[..., 0] + funcValues[..., -1]
         # Variable for the sum of all other ordinate values coming
         # from the trapezoid method.
-        sumMiddle = 0.0
-
-        for step in range(0, steps):
-            # Calculates the current abscissa value of the loop.
-            xValue = (-1.0) * rCircle + stepSize * step
-            # Set the substitutions of the calculation. These are the variables
-            # of the function string.
-            substi = {x: xValue, r1: rCircle, r2: rTorus}
-            # Calculates the function string by replacing the defined symbols with
-            # the corresponding values.
-            funcValue = sympy.sympify(funcString).evalf(subs=substi)
-
-            if step == 0 or step == steps:
-                sumEdge += funcValue
-            else:
-                sumMiddle += funcValue
-
-        summe = 0.5 * sumEdge + sumMiddle
-        # The calculated numerical integration value by the trapezoid method.
-        calculated = stepSize * summe
+        sumMiddle = numpy.sum(funcValues[..., 1:-1], axis=-1)
 
-        # Gets the reference value coming from the exact integral.
-        refValue = self.getReferenceValue()
-        # Calculate the derivation compared by the exact integration.
-        derivation = self.calculateDerivation(calculated, refValue)
-        # Sets the calculated value as object variable.
-        self.setCalculatedValue(calculated)
+        return stepSize * (0.5 * sumEdge + sumMiddle)
 
-        # defines the calculation type which will be used to decide, which
-        # printing method will be used and to output this information also
-        # as a part of the result summary.
-        calcType = 'trapezoid'
-        # Creates the model for the output.
-        result = model.Result(calcType, function, calculated, derivation)
-        self.setResult(result)
 
-        return result
+class Romberg(Trapezoid):
+    """
+    Class for the numerical integration calculation by the romberg method.
+    The trapezoid method is refined by doubling the steps of the function
+    object levels - 1 times. Each refinement evaluates only the new
+    midpoints and reuses the sum of the previous level, the values of all
+    levels are improved by richardson extrapolation.
+
+    The levels are evaluated at once on the shared sample, so the romberg
+    method has no streaming, parallel or checkpoint mode.
+    """
+    # The refinement sums in float64 only.
+    BACKENDS = ('float64',)
+    # The romberg table is set by the calculation.
+    STORED = False
+
+    def __init__(self, function, referenceValue, levels=5, sample=None):
+        super(Romberg, self).__init__(function, referenceValue, sample)
+        self.__levels = levels
+        self.__table = []
+
+    def getCalculationType(self):
+        """
+        Returns the calculation type of the romberg method.
+
+        Returns
+        -------
+        str : The name of the romberg method.
+        """
+        return 'romberg'
+
+    def getParameters(self):
+        """
+        Returns the parameters of the romberg method.
+
+        Returns
+        -------
+        dict : The parameters changing the calculated value.
+        """
+        return {'levels': self.__levels}
+
+    def getTable(self):
+        """
+        Returns the romberg table of the last calculation. The first column
+        contains the trapezoid values of all levels (steps, 2 * steps, ...),
+        the column j contains the values after j extrapolations.
+
+        Returns
+        -------
+        list : The rows of the romberg table.
+        """
+        return self.__table
+
+    def integrate(self):
+        """
+        Calculates the numerical integration by the romberg method.
+
+        Returns
+        -------
+        double : The extrapolated value of the finest level.
+        """
+        # Gets the radius of the circle.
+        rCircle = self.getFunction().getRCircle()
+        # The first level is the trapezoid method on the shared sample.
+        sample = self.getSample()
+        steps = self.getFunction().getSteps()
+        trapezoid = float(self.integrateSamples(sample.getValues(),
+                                                sample.getStepSize()))
+        table = [[trapezoid]]
+        evaluations = steps + 1
+
+        for level in range(1, self.__levels):
+            steps *= 2
+            stepSize = 2.0 * rCircle / steps
+            # Only the midpoints of the previous level are new abscissa
+            # values.
+            xValues = (-1.0) * rCircle + stepSize * numpy.arange(1, steps, 2)
+            funcValues = self.evaluate(xValues)
+            evaluations += len(xValues)
+            trapezoid = 0.5 * trapezoid + stepSize * float(
+                numpy.sum(funcValues))
+
+            # Richardson extrapolation of the new row.
+            row = [trapezoid]
+            for column in range(1, level + 1):
+                factor = 4.0 ** column - 1.0
+                row.append(row[column - 1] +
+                           (row[column - 1] - table[level - 1][column - 1]) /
+                           factor)
+            table.append(row)
+
+        self.__table = table
+        self.setEvaluations(evaluations)
+        if len(table) > 1:
+            self.setErrorEstimate(float(abs(table[-1][-1] -
+                                              table[-1][-2])))
+        else:
+            self.setErrorEstimate(None)
+
+        return float(table[-1][-1])
+
+    def setCheckpoint(self, checkpoint):
+        """
+        Rejects a checkpoint, because the romberg method has no streaming
+        mode.
+
+        Parameters
+        ----------
+        checkpoint : ctsoft.awd.math.checkpoint.Checkpoint
+            Must be None.
+
+        Raises
+        ------
+        ValueError : If a checkpoint is given.
+        """
+        if checkpoint is not None:
+            raise ValueError('The romberg method does not support '
+                             'checkpoints.')
+        super(Romberg, self).setCheckpoint(checkpoint)
+
+    def setChunkSize(self, chunkSize):
+        """
+        Rejects a chunk size, because the romberg method has no streaming
+        mode.
+
+        Parameters
+        ----------
+        chunkSize : int
+            Must be None.
+
+        Raises
+        ------
+        ValueError : If a chunk size is given.
+        """
+        if chunkSize is not None:
+            raise ValueError('The romberg method does not support the '
+                             'streaming mode.')
+        super(Romberg, self).setChunkSize(chunkSize)
+
+    def setWorkers(self, workers):
+        """
+        Rejects more than one worker, because the romberg method has no
+        parallel mode.
+
+        Parameters
+        ----------
+        workers : int
+            Must be None or 1.
+
+        Raises
+        ------
+        ValueError : If more than one worker is given.
+        """
+        if workers is not None and workers > 1:
+            raise ValueError('The romberg method does not support the '
+                             'parallel mode.')
+        super(Romberg, self).setWorkers(workers)
+
+
+def sumBlock(calcType, funcString, rCircle, rTorus, steps, start, stop,
+             chunkSize, backend='float64', digits=None):
+    """
+    Sums the weighted ordinate values of a subinterval of the abscissa grid.
+    This is the task of the worker processes of the parallel mode, so it
+    only takes picklable arguments.
+
+    Parameters
+    ----------
+    calcType : str
+        The calculation type of a grid based method.
+    funcString : str
+        The function string.
+    rCircle : double
+        The radius of the circle.
+    rTorus : double
+        The radius of the torus.
+    steps : int
+        The number of steps of the whole grid.
+    start : int
+        The first abscissa index of the subinterval.
+    stop : int
+        The abscissa index after the last one of the subinterval.
+    chunkSize : int
+        The number of abscissa values per chunk.
+    backend : str
+        The precision backend.
+    digits : int
+        The number of decimal digits of the mpmath backend.
+
+    Returns
+    -------
+    tuple : The uncompensated sum and the compensation.
+    """
+    function = model.Function(funcString, rCircle, rTorus, steps, backend,
+                              digits)
+    method = METHODS[calcType](function, None)
+    with method.getContext():
+        return method.sumStream(start, stop, chunkSize).getState()
+
+
+def countBlock(solid, bounds, rCircle, rTorus, sampler, seed, stream, start,
+               count, chunkSize=Numerical.CHUNK_SIZE):
+    """
+    Counts the points of a range of a stream, which are inside of the solid.
+    This is the task of the worker processes of the monte carlo method, so
+    it only takes picklable arguments.
+
+    Parameters
+    ----------
+    solid : str
+        The implicit function string of x, y, z, r1 and r2 of the solid.
+    bounds : tuple
+        The half edge lengths of the bounding box.
+    rCircle : double
+        The radius of the circle.
+    rTorus : double
+        The radius of the torus.
+    sampler : str
+        The name of the sampler, random or sobol.
+    seed : int
+        The seed of all streams.
+    stream : int
+        The index of the stream.
+    start : int
+        The index of the first point in the stream.
+    count : int
+        The number of points.
+    chunkSize : int
+        The number of points per chunk.
+
+    Returns
+    -------
+    int : The number of points inside of the solid.
+    """
+    import sympy
+
+    symbols = sympy.symbols('x y z r1 r2')
+    kernel = cache.expressions.get(solid, symbols).getKernel()
+    # Maps the unit cube to the bounding box.
+    scale = 2.0 * numpy.asarray(bounds, dtype=float)
+    offset = (-1.0) * numpy.asarray(bounds, dtype=float)
+
+    hits = 0
+    for chunkStart in range(start, start + count, chunkSize):
+        chunkCount = min(chunkSize, start + count - chunkStart)
+        points = offset + scale * sampling.samplePoints(
+            sampler, seed, stream, chunkStart, chunkCount)
+        values = kernel(points[:, 0], points[:, 1], points[:, 2], rCircle,
+                        rTorus)
+        hits += int(numpy.count_nonzero(values <= 0.0))
+    return hits
+
+
+# The numerical methods working on an equidistant abscissa grid by their
+# calculation type.
+METHODS = {'rectangle': Rectangle, 'simpson': Simpson, 'trapezoid': Trapezoid}
+
+# All numerical methods by their calculation type. The volume estimation
+# (MonteCarlo) is not one of them, because it does not integrate the
+# function string.
+CALCULATIONS = {'adaptive': AdaptiveSimpson, 'auto': AutoSteps,
+                'gauss': GaussLegendre, 'rectangle': Rectangle,
+                'romberg': Romberg, 'simpson': Simpson, 'tanhsinh': TanhSinh,
+                'trapezoid': Trapezoid}
@@ -0,0 +1,134 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 16:05:27 2026
+
+@author: ctsoft
+"""
+
+import numpy
+
+# The number of bits of the sobol points, so a stream has at most 2**32
+# points.
+SOBOL_BITS = 32
+# The primitive polynomials of the second and third sobol dimension by the
+# direction numbers of Joe and Kuo: the degree s, the coefficients a and the
+# initial direction numbers m. The first dimension is the van der Corput
+# sequence.
+SOBOL_POLYNOMIALS = ((1, 0, (1,)), (2, 1, (1, 3)))
+# The names of the samplers.
+SAMPLERS = ('random', 'sobol')
+
+
+def getDirections():
+    """
+    Returns the direction numbers of the first three sobol dimensions.
+
+    Returns
+    -------
+    numpy.ndarray : The direction numbers with the shape (3, SOBOL_BITS).
+    """
+    directions = [[1 << (SOBOL_BITS - 1 - bit) for bit in range(SOBOL_BITS)]]
+    for (degree, coefficients, initial) in SOBOL_POLYNOMIALS:
+        numbers = [initial[bit] << (SOBOL_BITS - 1 - bit)
+                   for bit in range(degree)]
+        for bit in range(degree, SOBOL_BITS):
+            number = numbers[bit - degree] ^ (numbers[bit - degree] >> degree)
+            for index in range(1, degree):
+                if (coefficients >> (degree - 1 - index)) & 1:
+                    number ^= numbers[bit - index]
+            numbers.append(number)
+        directions.append(numbers)
+    return numpy.array(directions, dtype=numpy.uint64)
+
+
+def getGenerator(seed, stream):
+    """
+    Returns the random generator of a stream. The streams of one seed are
+    the children of its seed sequence, so they are independent and every
+    stream is reproducible on its own.
+
+    Parameters
+    ----------
+    seed : int
+        The seed of all streams.
+    stream : int
+        The index of the stream.
+
+    Returns
+    -------
+    numpy.random.Generator : The generator at the start of the stream.
+    """
+    sequence = numpy.random.SeedSequence(seed, spawn_key=(stream,))
+    return numpy.random.Generator(numpy.random.PCG64(sequence))
+
+
+def getSobol(start, count):
+    """
+    Returns the points of the three dimensional sobol sequence by their
+    index, so any range of the sequence can be calculated on its own.
+
+    Parameters
+    ----------
+    start : int
+        The index of the first point.
+    count : int
+        The number of points.
+
+    Returns
+    -------
+    numpy.ndarray : The points in [0, 1) with the shape (count, 3).
+    """
+    indices = numpy.arange(start, start + count, dtype=numpy.uint64)
+    values = numpy.zeros((count, 3), dtype=numpy.uint64)
+    for (bit, numbers) in enumerate(DIRECTIONS.T):
+        if start + count <= 1 << bit:
+            break
+        mask = ((indices >> numpy.uint64(bit)) & numpy.uint64(1)).astype(bool)
+        values[mask] ^= numbers
+    return values * (1.0 / 2.0 ** SOBOL_BITS)
+
+
+def samplePoints(sampler, seed, stream, start, count):
+    """
+    Returns a range of the points of a stream in the unit cube. The points
+    only depend on the seed, the stream and their index, so the ranges can
+    be calculated in any order and by any process.
+
+    The random sampler jumps the generator of the stream ahead to the first
+    point. The sobol sampler shifts the sobol sequence by a random vector of
+    the stream (randomized quasi monte carlo), so the streams are
+    independent estimates of the same sequence.
+
+    Parameters
+    ----------
+    sampler : str
+        The name of the sampler, random or sobol.
+    seed : int
+        The seed of all streams.
+    stream : int
+        The index of the stream.
+    start : int
+        The index of the first point in the stream.
+    count : int
+        The number of points.
+
+    Returns
+    -------
+    numpy.ndarray : The points in [0, 1) with the shape (count, 3).
+    """
+    generator = getGenerator(seed, stream)
+    if sampler == 'random':
+        # Every coordinate consumes one 64 bit value of the generator.
+        generator.bit_generator.advance(3 * start)
+        return generator.random((count, 3))
+    if sampler == 'sobol':
+        if start + count > 1 << SOBOL_BITS:
+            raise ValueError('The sobol sampler is limited to 2**{0} points '
+                             'per stream.'.format(SOBOL_BITS))
+        shift = generator.random(3)
+        return numpy.mod(getSobol(start, count) + shift, 1.0)
+    raise ValueError('Unknown sampler: {0}'.format(sampler))
+
+
+# The direction numbers are calculated once per process.
+DIRECTIONS = getDirections()
@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 15:07:26 2026
+
+@author: ctsoft
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import ctsoft.awd
+import ctsoft.awd.math.cache as cache
+
+
+class ResultStore(object):
+    """
+    Persistent store of calculated values in a sqlite database. The key is
+    the normalized function string, the radii, the steps, the method with its
+    parameters and the library version. Old entries are evicted by age and
+    by the maximal number of entries (oldest first).
+
+    Methods
+    -------
+    clear:
+        Removes all entries and resets the counters.
+    evict:
+        Removes the entries exceeding the age and size limits.
+    get:
+        Returns a stored value.
+    getKey:
+        Returns the key of a calculation.
+    getStatistics:
+        Returns the counters and the number of entries.
+    put:
+        Stores a value.
+    """
+    # The number of stored values after which the limits are enforced.
+    EVICT_INTERVAL = 100
+
+    def __init__(self, path, maxEntries=100000, maxAge=None):
+        self.__path = path
+        self.__maxEntries = maxEntries
+        self.__maxAge = maxAge
+        self.__connection = None
+        self.__pid = None
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+        self.__puts = 0
+
+    def __getstate__(self):
+        # Only the configuration is passed to other processes, each process
+        # opens its own connection.
+        return {'path': self.__path, 'maxEntries': self.__maxEntries,
+                'maxAge': self.__maxAge}
+
+    def __setstate__(self, state):
+        self.__init__(state['path'], state['maxEntries'], state['maxAge'])
+
+    def clear(self):
+        """
+        Removes all entries and resets the counters.
+        """
+        with self.__lock:
+            connection = self._connect()
+            with connection:
+                connection.execute('DELETE FROM results')
+            self.__hits = 0
+            self.__misses = 0
+            self.__evictions = 0
+
+    def evict(self):
+        """
+        Removes the entries older than the maximal age and the oldest entries
+        exceeding the maximal number of entries.
+
+        Returns
+        -------
+        int : The number of removed entries.
+        """
+        with self.__lock:
+            connection = self._connect()
+            removed = 0
+            with connection:
+                if self.__maxAge is not None:
+                    cursor = connection.execute(
+                        'DELETE FROM results WHERE created < ?',
+                        (time.time() - self.__maxAge,))
+                    removed += cursor.rowcount
+                if self.__maxEntries is not None:
+                    cursor = connection.execute(
+                        'DELETE FROM results WHERE key IN (SELECT key FROM '
+                        'results ORDER BY created DESC LIMIT -1 OFFSET ?)',
+                        (self.__maxEntries,))
+                    removed += cursor.rowcount
+            self.__evictions += removed
+        return removed
+
+    def get(self, key):
+        """
+        Returns a stored value. Entries older than the maximal age are
+        ignored.
+
+        Parameters
+        ----------
+        key : str
+            The key of the calculation.
+
+        Returns
+        -------
+        tuple : The calculated value, the number of evaluations and the
+            error estimate or None if the key is not stored.
+        """
+        with self.__lock:
+            row = self._connect().execute(
+                'SELECT calculated, evaluations, errorEstimate, created FROM '
+                'results WHERE key = ?', (key,)).fetchone()
+            if row is None or (self.__maxAge is not None and
+                               row[3] < time.time() - self.__maxAge):
+                self.__misses += 1
+                return None
+            self.__hits += 1
+        return row[:3]
+
+    def getKey(self, calcType, function, parameters=None):
+        """
+        Returns the key of a calculation.
+
+        Parameters
+        ----------
+        calcType : str
+            The calculation type of the method.
+        function : ctsoft.awd.math.model.Function
+            The function object of the calculation (or a
+            ctsoft.awd.math.model.MultiFunction with steps per variable).
+        parameters : dict
+            The parameters of the method changing the calculated value.
+
+        Returns
+        -------
+        str : The key of the calculation.
+        """
+        steps = function.getSteps()
+        if isinstance(steps, tuple):
+            steps = [int(count) for count in steps]
+        else:
+            steps = int(steps)
+        return json.dumps([cache.normalize(function.getFunction()),
+                           float(function.getRCircle()),
+                           float(function.getRTorus()),
+                           steps, calcType,
+                           parameters or {}, ctsoft.awd.__version__],
+                          sort_keys=True)
+
+    def getStatistics(self):
+        """
+        Returns the counters and the number of entries.
+
+        Returns
+        -------
+        dict : Dictonary with the keys: hits, misses, evictions and size.
+        """
+        with self.__lock:
+            size = self._connect().execute(
+                'SELECT COUNT(*) FROM results').fetchone()[0]
+            return {'hits': self.__hits, 'misses': self.__misses,
+                    'evictions': self.__evictions, 'size': size}
+
+    def put(self, key, calculated, evaluations=None, errorEstimate=None):
+        """
+        Stores a value. The limits are enforced every EVICT_INTERVAL puts.
+
+        Parameters
+        ----------
+        key : str
+            The key of the calculation.
+        calculated : double
+            The calculated value.
+        evaluations : int
+            The number of evaluations of the calculation.
+        errorEstimate : double
+            The error estimate of the calculation.
+        """
+        with self.__lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    'INSERT OR REPLACE INTO results (key, calculated, '
+                    'evaluations, errorEstimate, created) VALUES '
+                    '(?, ?, ?, ?, ?)', (key, float(calculated), evaluations,
+                                        errorEstimate, time.time()))
+            self.__puts += 1
+            evict = self.__puts % self.EVICT_INTERVAL == 0
+        if evict:
+            self.evict()
+
+    def _connect(self):
+        # A connection must not be shared with a forked process.
+        if self.__connection is None or self.__pid != os.getpid():
+            directory = os.path.dirname(self.__path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            connection = sqlite3.connect(self.__path, timeout=30.0,
+                                         check_same_thread=False)
+            connection.execute('PRAGMA journal_mode=WAL')
+            # A lost entry only costs a recalculation, so the commits do not
+            # wait for the disk.
+            connection.execute('PRAGMA synchronous=NORMAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, '
+                'calculated REAL, evaluations INTEGER, errorEstimate REAL, '
+                'created REAL)')
+            connection.execute('CREATE INDEX IF NOT EXISTS resultsCreated '
+                               'ON results (created)')
+            self.__connection = connection
+            self.__pid = os.getpid()
+        return self.__connection
+
+
+def getDefault():
+    """
+    Returns the result store used by new numerical method objects.
+
+    Returns
+    -------
+    ctsoft.awd.math.store.ResultStore : The default store or None.
+    """
+    return _default
+
+
+def setDefault(resultStore):
+    """
+    Sets the result store used by new numerical method objects.
+
+    Parameters
+    ----------
+    resultStore : ctsoft.awd.math.store.ResultStore
+        The store or None to disable the storing.
+    """
+    global _default
+    _default = resultStore
+
+
+_default = None
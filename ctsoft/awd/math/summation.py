@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 11:48:09 2026
+
+@author: ctsoft
+"""
+
+
+class CompensatedSum(object):
+    """
+    Class for the compensated summation of many partial sums (Neumaier's
+    variant of the Kahan summation). The rounding error of each addition is
+    collected in a separate compensation, so the error does not grow with
+    the number of added values.
+
+    Methods
+    -------
+    add:
+        Adds a value to the sum.
+    getState:
+        Returns the sum and the compensation.
+    getValue:
+        Returns the compensated sum.
+    setState:
+        Restores the sum and the compensation.
+    """
+    def __init__(self, summe=0.0, compensation=0.0):
+        self.__summe = summe
+        self.__compensation = compensation
+
+    def add(self, value):
+        """
+        Adds a value to the sum.
+
+        Parameters
+        ----------
+        value : double
+            The value to add.
+        """
+        summe = self.__summe + value
+        if abs(self.__summe) >= abs(value):
+            self.__compensation += (self.__summe - summe) + value
+        else:
+            self.__compensation += (value - summe) + self.__summe
+        self.__summe = summe
+
+    def getState(self):
+        """
+        Returns the sum and the compensation, e.g. to combine or store a
+        partial sum exactly.
+
+        Returns
+        -------
+        tuple : The uncompensated sum and the compensation.
+        """
+        return (self.__summe, self.__compensation)
+
+    def getValue(self):
+        """
+        Returns the compensated sum.
+
+        Returns
+        -------
+        double : The sum of all added values.
+        """
+        return self.__summe + self.__compensation
+
+    def setState(self, summe, compensation):
+        """
+        Restores the sum and the compensation.
+
+        Parameters
+        ----------
+        summe : double
+            The uncompensated sum.
+        compensation : double
+            The compensation.
+        """
+        self.__summe = summe
+        self.__compensation = compensation
@@ -0,0 +1,313 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sat Oct 17 21:40:18 2026
+
+@author: ctsoft
+"""
+
+import hashlib
+
+import numpy
+import ctsoft.awd.math.cache as cache
+import ctsoft.awd.math.checkpoint as checkpoint
+import ctsoft.awd.math.model as model
+import ctsoft.awd.math.numerical as numerical
+import ctsoft.awd.math.summation as summation
+
+
+class Sweep(numerical.Base):
+    """
+    Class for the numerical integration of one function string over many
+    parameter sets. The radius of the circle, the radius of the torus and the
+    steps of the function object may be arrays, which are evaluated in bulk
+    by broadcasting instead of creating one calculation object per set.
+
+    Methods
+    -------
+    calculate:
+        Calculates all numerical integrations of the sweep.
+    getCheckpoint:
+        Returns the checkpoint of the sweep.
+    getCheckpointKey:
+        Returns the key of the sweep in a checkpoint file.
+    getMethods:
+        Returns the calculation types used by the sweep.
+    getParameters:
+        Returns the flattened parameter arrays of the sweep.
+    getReference:
+        Returns the function string of the exact integral.
+    integrateColumns:
+        Calculates one parameter set block by block of its abscissa grid.
+    setCheckpoint:
+        Sets the checkpoint of the sweep.
+    """
+    def __init__(self, function, methods=None, reference=None, product=False,
+                 blockSize=2 ** 20):
+        super(Sweep, self).__init__(function)
+        if methods is None:
+            methods = sorted(numerical.METHODS)
+        self.__methods = list(methods)
+        self.__reference = reference
+        self.__product = product
+        self.__blockSize = blockSize
+        self.__checkpoint = None
+
+    def calculate(self):
+        """
+        Calculates the numerical integrations of all parameter sets with all
+        methods of the sweep. With a checkpoint the results of the completed
+        parameter sets are saved, so a resumed sweep calculates the missing
+        parameter sets only.
+
+        Returns
+        -------
+        ctsoft.awd.math.model.SweepResult : The columnar result with one row
+            per method and parameter set.
+        """
+        # get the function with the needed values
+        function = self.getFunction()
+        (rCircle, rTorus, steps) = self.getParameters()
+        kernel = self.getKernel()
+        methods = self.__methods
+        count = len(rCircle)
+        calculated = numpy.empty((len(methods), count))
+
+        progress = self.__checkpoint
+        done = numpy.zeros(count, dtype=bool)
+        if progress is not None:
+            progress.open(self.getCheckpointKey(), count, len(methods))
+            done = progress.getDone()
+            calculated[:, done] = progress.getValues()[done].T
+
+        # The parameter sets are grouped by their steps, so all sets of a group
+        # share the same abscissa grid shape.
+        for stepCount in numpy.unique(steps):
+            indices = numpy.flatnonzero(steps == stepCount)
+            grid = numpy.arange(0, stepCount + 1)
+            # Limits the number of ordinate values evaluated at once.
+            rows = max(1, self.__blockSize // (stepCount + 1))
+
+            for start in range(0, len(indices), rows):
+                block = indices[start:start + rows]
+                if done[block].all():
+                    continue
+                if stepCount + 1 > self.__blockSize:
+                    # A single parameter set exceeds the block size, so its
+                    # abscissa grid is split into blocks as well.
+                    calculated[:, block[0]] = self.integrateColumns(
+                        rCircle[block[0]], rTorus[block[0]], stepCount)
+                    if progress is not None:
+                        progress.setDone(block, calculated[:, block].T)
+                    continue
+                r1 = rCircle[block, numpy.newaxis]
+                r2 = rTorus[block, numpy.newaxis]
+                # Calculates the step size of each parameter set (this is the
+                # symbol "h" in the documentation)
+                stepSize = 2.0 * r1 / stepCount
+                # Calculates all abscissa values of the parameter sets.
+                xValues = (-1.0) * r1 + stepSize * grid
+                funcValues = numpy.broadcast_to(
+                    numpy.asarray(kernel(xValues, r1, r2), dtype=float),
+                    xValues.shape)
+
+                for (index, calcType) in enumerate(methods):
+                    method = numerical.METHODS[calcType]
+                    calculated[index, block] = method.integrateSamples(
+                        funcValues, stepSize[:, 0])
+                if progress is not None:
+                    progress.setDone(block, calculated[:, block].T)
+
+        if progress is not None:
+            progress.close()
+
+        referenceValues = self.calculateReference(rCircle, rTorus)
+        # Calculates the derivation like numerical.Numerical does for each
+        # single calculation. The derivation of a zero reference is not
+        # defined and NaN like a missing derivation of a result table.
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            derivations = numpy.where(
+                referenceValues == 0.0, numpy.nan, numpy.abs(numpy.round(
+                    100.0 * calculated / referenceValues - 100.0, 1)))
+
+        result = model.SweepResult(function.getFunction(),
+                                   numpy.repeat(numpy.array(methods), count),
+                                   numpy.tile(rCircle, len(methods)),
+                                   numpy.tile(rTorus, len(methods)),
+                                   numpy.tile(steps, len(methods)),
+                                   calculated.ravel(),
+                                   numpy.tile(referenceValues, len(methods)),
+                                   derivations.ravel())
+        self.setCalculatedValue(result)
+
+        return result
+
+    def calculateReference(self, rCircle, rTorus):
+        """
+        Calculates the exact integral of all parameter sets. Without the
+        function string of a reference (a closed form of r1 and r2), the
+        antiderivative of numerical.Integrated is evaluated at the bounds.
+        The parameter sets without a real value of the antiderivative are
+        calculated one by one by numerical.Integrated.
+
+        Parameters
+        ----------
+        rCircle : numpy.ndarray
+            The radii of the circle.
+        rTorus : numpy.ndarray
+            The radii of the torus.
+
+        Returns
+        -------
+        numpy.ndarray : The reference values of the parameter sets.
+        """
+        if self.__reference is not None:
+            symbols = numerical.Base.calculate(self)
+            compiled = cache.expressions.get(self.__reference,
+                                             (symbols['x'], symbols['r1'],
+                                              symbols['r2']))
+            values = compiled.getKernel()(0.0, rCircle, rTorus)
+            return numpy.broadcast_to(numpy.asarray(values, dtype=float),
+                                      rCircle.shape)
+
+        funcString = self.getFunction().getFunction()
+        integrated = numerical.Integrated(self.getFunction())
+        kernel = integrated.getAntiderivative().getKernel()
+        with numpy.errstate(all='ignore'):
+            values = (kernel(rCircle, rCircle, rTorus) -
+                      kernel((-1.0) * rCircle, rCircle, rTorus))
+        values = numpy.array(numpy.broadcast_to(numpy.asarray(
+            values, dtype=float), rCircle.shape))
+        for index in numpy.flatnonzero(~numpy.isfinite(values)):
+            single = model.Function(funcString, float(rCircle.flat[index]),
+                                    float(rTorus.flat[index]), 0)
+            values.flat[index] = numerical.Integrated(single).calculate(
+                ).getCalculatedValue()
+        return values
+
+    def getCheckpoint(self):
+        """
+        Returns the checkpoint of the sweep.
+
+        Returns
+        -------
+        ctsoft.awd.math.checkpoint.Checkpoint : The checkpoint or None if the
+            progress is not saved.
+        """
+        return self.__checkpoint
+
+    def getCheckpointKey(self):
+        """
+        Returns the key of the sweep in a checkpoint file. The parameter
+        arrays are part of the key by their hash.
+
+        Returns
+        -------
+        str : The key of the sweep.
+        """
+        parameters = hashlib.sha256()
+        for array in self.getParameters():
+            parameters.update(numpy.ascontiguousarray(array).tobytes())
+        return checkpoint.Checkpoint.getKey({
+            'mode': 'sweep', 'function': self.getFunction().getFunction(),
+            'methods': self.__methods, 'parameters': parameters.hexdigest()})
+
+    def getMethods(self):
+        """
+        Returns the calculation types used by the sweep.
+
+        Returns
+        -------
+        list : The names of the numerical methods.
+        """
+        return self.__methods
+
+    def getParameters(self):
+        """
+        Returns the flattened parameter arrays of the sweep. The arrays of
+        the function object are broadcasted against each other or, if the
+        sweep is a product, combined to their cartesian product.
+
+        Returns
+        -------
+        tuple : The arrays rCircle, rTorus and steps of the same length.
+        """
+        function = self.getFunction()
+        rCircle = numpy.asarray(function.getRCircle(), dtype=float)
+        rTorus = numpy.asarray(function.getRTorus(), dtype=float)
+        steps = numpy.asarray(function.getSteps(), dtype=int)
+
+        if self.__product:
+            arrays = numpy.meshgrid(rCircle.ravel(), rTorus.ravel(),
+                                    steps.ravel(), indexing='ij')
+        else:
+            arrays = numpy.broadcast_arrays(rCircle, rTorus, steps)
+
+        return tuple(numpy.ravel(array) for array in arrays)
+
+    def getReference(self):
+        """
+        Returns the function string of the exact integral.
+
+        Returns
+        -------
+        str : The function string of the reference or None if the
+            reference is integrated symbolically.
+        """
+        return self.__reference
+
+    def integrateColumns(self, rCircle, rTorus, steps):
+        """
+        Calculates the numerical integrations of one parameter set, whose
+        abscissa grid exceeds the block size. The grid is evaluated block by
+        block and the weighted sums of the blocks are added by compensated
+        summation per method like numerical.Fused does.
+
+        Parameters
+        ----------
+        rCircle : double
+            The radius of the circle.
+        rTorus : double
+            The radius of the torus.
+        steps : int
+            The number of steps.
+
+        Returns
+        -------
+        numpy.ndarray : The calculated values of the methods of the sweep.
+        """
+        kernel = self.getKernel()
+        methods = [numerical.METHODS[calcType] for calcType in self.__methods]
+        valueCount = max(method.getValueCount(steps) for method in methods)
+        # Calculates the step size of the parameter set (this is the symbol
+        # "h" in the documentation)
+        stepSize = 2.0 * rCircle / steps
+
+        sums = [summation.CompensatedSum() for method in methods]
+        for start in range(0, valueCount, self.__blockSize):
+            indices = numpy.arange(start, min(start + self.__blockSize,
+                                              valueCount))
+            xValues = (-1.0) * rCircle + stepSize * indices
+            funcValues = numpy.broadcast_to(
+                numpy.asarray(kernel(xValues, rCircle, rTorus), dtype=float),
+                xValues.shape)
+            for (method, summe) in zip(methods, sums):
+                # The rectangle method omits the last abscissa value.
+                valid = indices < method.getValueCount(steps)
+                summe.add(float(numpy.dot(
+                    funcValues[valid], method.getWeights(indices[valid],
+                                                         steps))))
+
+        return numpy.array([method.getScale(stepSize) * summe.getValue()
+                            for (method, summe) in zip(methods, sums)])
+
+    def setCheckpoint(self, checkpoint):
+        """
+        Sets the checkpoint of the sweep, which saves the results of the
+        completed parameter sets and resumes the sweep.
+
+        Parameters
+        ----------
+        checkpoint : ctsoft.awd.math.checkpoint.Checkpoint
+            The checkpoint or None to not save the progress.
+        """
+        self.__checkpoint = checkpoint
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 22:18:51 2026
+
+@author: ctsoft
+"""
+
+import os
+import tempfile
+import tracemalloc
+import unittest
+from unittest import mock
+
+import ctsoft.awd.application.batch as batch
+import ctsoft.awd.math.cache as cache
+
+# The persistent caches of the tests, which must not write to the cache of
+# the user.
+CACHES = (cache.nodes, cache.antiderivatives, cache.definites,
+          cache.complements)
+
+
+def setUpModule():
+    global cacheDirectory, cacheEnvironment, cacheDirectories
+    cacheDirectory = tempfile.TemporaryDirectory()
+    cacheEnvironment = mock.patch.dict(
+        os.environ, {'CTSOFT_AWD_CACHE': cacheDirectory.name})
+    cacheEnvironment.start()
+    # The caches read the directory at their import.
+    cacheDirectories = [persistent.getDirectory() for persistent in CACHES]
+    for persistent in CACHES:
+        persistent.setDirectory(cacheDirectory.name)
+
+
+def tearDownModule():
+    for (persistent, previous) in zip(CACHES, cacheDirectories):
+        persistent.setDirectory(previous)
+    cacheEnvironment.stop()
+    cacheDirectory.cleanup()
+
+
+class RunJobTest(unittest.TestCase):
+    """
+    Tests of the calculation of one batch job.
+    """
+    def testZeroReference(self):
+        # The derivation is not defined, the values are reported anyway.
+        record = batch.runJob({'function': 'x', 'rCircle': 1.0,
+                               'rTorus': 2.0, 'steps': 10,
+                               'methods': ['simpson', 'trapezoid']})
+        self.assertNotIn('error', record)
+        self.assertEqual(record['reference'], 0.0)
+        self.assertEqual([result['derivation']
+                          for result in record['results']], [None, None])
+
+
+class ReadJobsTest(unittest.TestCase):
+    """
+    Tests of the lazy reading of the jobs.
+    """
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def measure(self, count):
+        # Returns the number of read jobs and the peak memory of reading.
+        path = os.path.join(self.directory.name, 'jobs-{0}.xml'.format(count))
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write('<jobs>\n')
+            for index in range(0, count):
+                file.write('<job id="{0}"><function>x</function>'
+                           '<rCircle>1.0</rCircle><rTorus>2.0</rTorus>'
+                           '<steps>10</steps><method>simpson</method>'
+                           '</job>\n'.format(index))
+            file.write('</jobs>\n')
+
+        tracemalloc.start()
+        try:
+            read = sum(1 for job in batch.readJobs(path))
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return (read, peak)
+
+    def testXmlMemoryBounded(self):
+        (smallRead, smallPeak) = self.measure(2000)
+        (largeRead, largePeak) = self.measure(20000)
+        self.assertEqual((smallRead, largeRead), (2000, 20000))
+        # Ten times the jobs must not need ten times the memory.
+        self.assertLess(largePeak, 2 * smallPeak)
+
+
+if __name__ == '__main__':
+    unittest.main()
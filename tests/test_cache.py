@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 21:02:44 2026
+
+@author: ctsoft
+"""
+
+import math
+import unittest
+import warnings
+
+import numpy
+
+import ctsoft.awd.math.cache as cache
+import ctsoft.awd.math.model as model
+import ctsoft.awd.math.numerical as numerical
+
+# The function string of the torus volume.
+TORUS = '4*r2*pi*(r1**2-x**2)**(1/2)'
+
+
+class SpecializeTest(unittest.TestCase):
+    """
+    Tests of the kernels specialized on the radii of the function object.
+    """
+    def testNonIntegerRadii(self):
+        # The bound x = r1 of the grid must not make r1**2 - x**2 negative.
+        for index in range(200):
+            rCircle = 1.0 + index * 1e-3
+            for method in (numerical.Simpson, numerical.Trapezoid):
+                function = model.Function(TORUS, rCircle, 2.0, 10)
+                with warnings.catch_warnings():
+                    warnings.simplefilter('error', RuntimeWarning)
+                    result = method(function, 1.0).calculate()
+                self.assertFalse(math.isnan(result.getCalculatedValue()),
+                                 (method.__name__, rCircle))
+
+    def testRadiiBoundToKernel(self):
+        function = model.Function(TORUS, 1.025, 2.0, 10)
+        compiled = numerical.Simpson(function, 1.0).getSpecialized()
+        kernel = compiled.getKernel()
+        self.assertEqual(kernel(1.025), 0.0)
+        self.assertIn('r1', compiled.getSource())
+
+
+class NodeCacheTest(unittest.TestCase):
+    """
+    Tests of the nodes and weights of the gauss legendre quadrature.
+    """
+    def testNewtonNodes(self):
+        # The newton iteration agrees with the eigenvalue solver.
+        order = 2 * cache.EIGEN_ORDER + 1
+        (expectedNodes, expectedWeights) = \
+            numpy.polynomial.legendre.leggauss(order)
+        (nodes, weights) = cache.getGaussLegendre(order)
+        numpy.testing.assert_allclose(nodes, expectedNodes, rtol=0,
+                                      atol=1e-15)
+        numpy.testing.assert_allclose(weights, expectedWeights, rtol=1e-9)
+
+    def testMaxOrder(self):
+        with self.assertRaises(ValueError):
+            cache.NodeCache().get(cache.NodeCache.MAX_ORDER + 1)
+        function = model.Function(TORUS, 1.0, 2.0, 100000)
+        with self.assertRaises(ValueError):
+            numerical.GaussLegendre(function, 1.0).calculate()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 23:41:05 2026
+
+@author: ctsoft
+"""
+
+import os
+import tempfile
+import unittest
+
+import numpy
+import ctsoft.awd.math.checkpoint as checkpoint
+import ctsoft.awd.math.model as model
+import ctsoft.awd.math.numerical as numerical
+
+# The function string of the torus volume.
+TORUS = '4*r2*pi*(r1**2-x**2)**(1/2)'
+# The exact volume of the torus.
+REFERENCE = 39.47841760435743
+
+
+class Interrupted(Exception):
+    """
+    Exception of the simulated interruption of a calculation.
+    """
+
+
+class InterruptedSimpson(numerical.Simpson):
+    """
+    Simpson method, which is interrupted after a number of chunks.
+    """
+    def __init__(self, function, referenceValue, chunks):
+        super(InterruptedSimpson, self).__init__(function, referenceValue)
+        self.__chunks = chunks
+
+    def sumRange(self, start, stop):
+        if self.__chunks == 0:
+            raise Interrupted()
+        self.__chunks -= 1
+        return super(InterruptedSimpson, self).sumRange(start, stop)
+
+
+class CheckpointTest(unittest.TestCase):
+    """
+    Tests of the resumption of interrupted calculations.
+    """
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'progress.ckpt')
+        self.function = model.Function(TORUS, 1.0, 2.0, 100000)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def calculate(self, calculation, progress=None, workers=None):
+        calculation.setStore(None)
+        calculation.setChunkSize(1000)
+        calculation.setWorkers(workers)
+        if progress is not None:
+            calculation.setCheckpoint(progress)
+        return calculation.calculate().getCalculatedValue()
+
+    def interrupt(self, chunks):
+        # Calculates the first chunks of the stream into the checkpoint.
+        progress = checkpoint.Checkpoint(self.path, interval=0.0)
+        with self.assertRaises(Interrupted):
+            self.calculate(InterruptedSimpson(self.function, REFERENCE,
+                                              chunks), progress)
+        return progress
+
+    def simpson(self):
+        return numerical.Simpson(self.function, REFERENCE)
+
+    def testResumeStream(self):
+        expected = self.calculate(self.simpson())
+        progress = self.interrupt(37)
+        self.assertEqual(self.calculate(self.simpson(), progress), expected)
+
+    def testTornState(self):
+        # An interruption while writing the state leaves the unused slot
+        # half written, the sequence number still selects the last state.
+        expected = self.calculate(self.simpson())
+        progress = self.interrupt(37)
+        header = numpy.memmap(self.path, dtype=checkpoint.Checkpoint.HEADER,
+                              mode='r+', shape=(1,))
+        unused = (int(header['sequence'][0]) + 1) % 2
+        header['slots']['position'][0, unused] = 99000
+        header['slots']['summe'][0, unused] = numpy.nan
+        header.flush()
+        del header
+
+        progress.open(self.simpson().getCheckpointKey('stream', 1000))
+        self.assertEqual(progress.getState()[0], 37000)
+        progress.close()
+        self.assertEqual(self.calculate(self.simpson(), progress), expected)
+
+    def testResumeParallel(self):
+        progress = checkpoint.Checkpoint(self.path, interval=0.0)
+        expected = self.calculate(self.simpson(), progress, 2)
+        # The values of an interrupted block are written, but not its flag.
+        mapped = numpy.memmap(self.path, dtype=numpy.uint8, mode='r+')
+        header = mapped[:checkpoint.Checkpoint.HEADER.itemsize].view(
+            checkpoint.Checkpoint.HEADER)
+        (size, width) = (int(header['size'][0]), int(header['width'][0]))
+        start = checkpoint.Checkpoint.HEADER.itemsize
+        values = mapped[start:start + 8 * size * width].view(
+            '<f8').reshape((size, width))
+        values[1] = numpy.nan
+        mapped[start + 8 * size * width + 1] = 0
+        mapped.flush()
+        del (mapped, header, values)
+
+        self.assertEqual(self.calculate(self.simpson(), progress, 2),
+                         expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
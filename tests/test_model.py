@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 23:58:14 2026
+
+@author: ctsoft
+"""
+
+import csv
+import os
+import tempfile
+import unittest
+
+import mpmath
+import ctsoft.awd.math.model as model
+
+# The function string of the torus volume.
+TORUS = '4*r2*pi*(r1**2-x**2)**(1/2)'
+
+
+class ResultTableTest(unittest.TestCase):
+    """
+    Tests of the columnar result table.
+    """
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        with mpmath.workdps(40):
+            self.value = 4 * mpmath.pi ** 2
+        function = model.Function(TORUS, 1.0, 2.0, 10, 'mpmath', 40)
+        origin = model.Origin('integral', function, self.value)
+        origin.setBackend('mpmath')
+        floating = model.Result('simpson',
+                                model.Function(TORUS, 1.0, 2.0, 10),
+                                38.957934950986264, 1.3)
+        self.table = model.ResultTable.fromResults([origin, floating])
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def assertDigits(self, value):
+        # The value keeps the 40 digits of the mpmath backend.
+        with mpmath.workdps(50):
+            self.assertLess(abs(value - self.value), mpmath.mpf(10) ** -40)
+
+    def testMpmathDigits(self):
+        row = self.table[0]
+        self.assertDigits(row.getCalculatedValue())
+        self.assertEqual(self.table.getColumn('calculated')[0],
+                         float(self.value))
+        # The float64 rows are not changed.
+        self.assertEqual(self.table[1].getCalculatedText(), '')
+        self.assertEqual(self.table[1].getCalculatedValue(),
+                         38.957934950986264)
+
+    def testExport(self):
+        path = os.path.join(self.directory.name, 'results.npy')
+        self.table.save(path)
+        loaded = model.ResultTable.load(path)
+        self.assertDigits(loaded[0].getCalculatedValue())
+
+        path = os.path.join(self.directory.name, 'results.csv')
+        self.table.writeCsv(path)
+        with open(path, newline='') as handle:
+            rows = list(csv.DictReader(handle))
+        with mpmath.workdps(50):
+            self.assertDigits(mpmath.mpf(rows[0]['calculatedText']))
+
+
+if __name__ == '__main__':
+    unittest.main()
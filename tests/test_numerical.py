@@ -0,0 +1,328 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 21:40:12 2026
+
+@author: ctsoft
+"""
+
+import math
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import ctsoft.awd.math.cache as cache
+import ctsoft.awd.math.model as model
+import ctsoft.awd.math.numerical as numerical
+import ctsoft.awd.math.store as store
+
+# The function string of the torus volume.
+TORUS = '4*r2*pi*(r1**2-x**2)**(1/2)'
+
+# The persistent caches of the tests, which must not write to the cache of
+# the user.
+CACHES = (cache.nodes, cache.antiderivatives, cache.definites,
+          cache.complements)
+
+
+def setUpModule():
+    global cacheDirectory, cacheEnvironment, cacheDirectories
+    cacheDirectory = tempfile.TemporaryDirectory()
+    cacheEnvironment = mock.patch.dict(
+        os.environ, {'CTSOFT_AWD_CACHE': cacheDirectory.name})
+    cacheEnvironment.start()
+    # The caches read the directory at their import.
+    cacheDirectories = [persistent.getDirectory() for persistent in CACHES]
+    for persistent in CACHES:
+        persistent.setDirectory(cacheDirectory.name)
+
+
+def tearDownModule():
+    for (persistent, previous) in zip(CACHES, cacheDirectories):
+        persistent.setDirectory(previous)
+    cacheEnvironment.stop()
+    cacheDirectory.cleanup()
+
+
+class AutoStepsTest(unittest.TestCase):
+    """
+    Tests of the automatic step selection.
+    """
+    def calculate(self, targetError, maxSteps):
+        function = model.Function(TORUS, 1.0, 2.0, 10)
+        auto = numerical.AutoSteps(function, 39.47841760435743,
+                                   targetError=targetError,
+                                   maxSteps=maxSteps)
+        auto.setStore(None)
+        return auto.calculate()
+
+    def testConverged(self):
+        result = self.calculate(1e-4, 10 ** 6)
+        self.assertTrue(result.isConverged())
+        self.assertLessEqual(result.getAchievedError(), 1e-4)
+
+    def testOddMaxSteps(self):
+        # The steps stay even and within maxSteps, so the target is missed.
+        result = self.calculate(1e-14, 101)
+        self.assertEqual(result.getFunction().getSteps(), 100)
+        self.assertFalse(result.isConverged())
+        table = model.ResultTable.fromResults([result])
+        self.assertFalse(table[0].isConverged())
+
+
+class CubatureTest(unittest.TestCase):
+    """
+    Tests of the tensor product rule.
+    """
+    def calculate(self, function, rule, blockSize=2 ** 20):
+        cubature = numerical.Cubature(function, 1.0, rule, blockSize)
+        cubature.setStore(None)
+        return cubature.calculate().getCalculatedValue()
+
+    def testClosedForm(self):
+        function = model.MultiFunction(
+            'x**2*y*exp(z)', ('x', 'y', 'z'), ((0, 1), (0, 2), (0, 1)), 1.0,
+            2.0, (8, 6, 10))
+        self.assertAlmostEqual(self.calculate(function, 'gauss'),
+                               2.0 / 3.0 * (math.e - 1.0), places=14)
+
+    def testTorusVolume(self):
+        # The volume of the torus by the theorem of pappus: the circle with
+        # the bounds of y depending on x revolved around the axis.
+        function = model.MultiFunction(
+            '2*pi*(r2+x)', ('x', 'y'), (('-r1', 'r1'), ('-sqrt(r1**2-x**2)',
+                                                        'sqrt(r1**2-x**2)')),
+            1.0, 2.0, (200, 2))
+        self.assertTrue(math.isclose(self.calculate(function, 'gauss'),
+                                     39.47841760435743, rel_tol=1e-7))
+        self.assertTrue(math.isclose(self.calculate(function, 'simpson'),
+                                     39.47841760435743, rel_tol=1e-3))
+
+    def testBlockSize(self):
+        # Blocks smaller than one row of the inner variables split their
+        # axes too without changing the rule.
+        function = model.MultiFunction(
+            'x**2*y*exp(z)', ('x', 'y', 'z'), ((0, 1), (0, 2), (0, 1)), 1.0,
+            2.0, (8, 6, 10))
+        for rule in ('gauss', 'simpson'):
+            whole = self.calculate(function, rule)
+            for blockSize in (1, 7, 50):
+                self.assertAlmostEqual(self.calculate(function, rule,
+                                                      blockSize),
+                                       whole, places=14)
+
+
+class FusedTest(unittest.TestCase):
+    """
+    Tests of the integration of many function strings in one pass.
+    """
+    def testSeparateRuns(self):
+        funcStrings = [TORUS, 'x', 'x**2*exp(x)', '1/(x-r2)']
+        table = numerical.Fused(model.Function(funcStrings, 1.0, 2.0, 1000),
+                                chunkSize=300).calculate()
+        self.assertEqual(len(table), 3 * len(funcStrings))
+        for row in table:
+            function = model.Function(row.getFunctionString(), 1.0, 2.0, 1000)
+            reference = numerical.Integrated(function).calculate(
+                ).getCalculatedValue()
+            calculation = numerical.METHODS[row.getCalculationType()](
+                function, reference)
+            calculation.setStore(None)
+            result = calculation.calculate()
+            self.assertAlmostEqual(row.getCalculatedValue(),
+                                   result.getCalculatedValue(), places=12)
+            if result.getDerivation() is None:
+                # The integral of x is zero, so its derivation is missing.
+                self.assertTrue(math.isnan(row.getDerivation()))
+            else:
+                self.assertEqual(row.getDerivation(), result.getDerivation())
+
+
+class IntegratedTest(unittest.TestCase):
+    """
+    Tests of the exact integral.
+    """
+    def calculate(self, funcString, backend='float64'):
+        function = model.Function(funcString, 1.0, 2.0, 10, backend)
+        return float(numerical.Integrated(function).calculate(
+            ).getCalculatedValue())
+
+    def testTorus(self):
+        self.assertEqual(self.calculate(TORUS), 39.47841760435743)
+
+    def testComplexAntiderivative(self):
+        # The antiderivative log(x - r2) has no real value at the bounds.
+        for backend in ('float64', 'mpmath'):
+            self.assertAlmostEqual(self.calculate('1/(x-r2)', backend),
+                                   math.log(1.0 / 3.0), places=14)
+
+    def testDefiniteIntegral(self):
+        # The antiderivative is not finite at the bound x = r1.
+        self.assertAlmostEqual(self.calculate('log(r1-x)'),
+                               2.0 * math.log(2.0) - 2.0, places=14)
+
+    def testMissingAntiderivative(self):
+        # sympy finds the definite integral of abs(x) only.
+        self.assertEqual(self.calculate('abs(x)'), 1.0)
+
+    def testDivergent(self):
+        with self.assertRaises(ValueError):
+            self.calculate('1/x')
+
+
+class MonteCarloTest(unittest.TestCase):
+    """
+    Tests of the volume estimation of a solid.
+    """
+    def calculate(self, sampler, workers):
+        function = model.Function(TORUS, 1.0, 2.0, 10)
+        monteCarlo = numerical.MonteCarlo(function, 4.0 * math.pi ** 2,
+                                          numerical.MonteCarlo.TORUS,
+                                          sampler, streams=4,
+                                          batchSize=2 ** 10,
+                                          maxSamples=2 ** 14)
+        monteCarlo.setStore(None)
+        monteCarlo.setWorkers(workers)
+        return monteCarlo.calculate()
+
+    def testIndependentOfWorkers(self):
+        # The streams depend on the seed only, not on the worker processes.
+        for sampler in ('random', 'sobol'):
+            single = self.calculate(sampler, None)
+            parallel = self.calculate(sampler, 2)
+            self.assertEqual(single.getCalculatedValue(),
+                             parallel.getCalculatedValue())
+            self.assertEqual(single.getErrorEstimate(),
+                             parallel.getErrorEstimate())
+            self.assertLess(abs(single.getCalculatedValue() /
+                                (4.0 * math.pi ** 2) - 1.0), 0.05)
+
+    def testNotRegistered(self):
+        self.assertNotIn('montecarlo', numerical.CALCULATIONS)
+
+
+class ParallelTest(unittest.TestCase):
+    """
+    Tests of the parallel mode of the grid based methods.
+    """
+    def testSubintervals(self):
+        # The subintervals start at odd and even indices, so the weights of
+        # the simpson method depend on the global abscissa index.
+        steps = 1000
+        for (calcType, method) in numerical.METHODS.items():
+            valueCount = method.getValueCount(steps)
+            bounds = [0, 1, 250, 333, 334, 999, valueCount]
+            partials = [numerical.sumBlock(calcType, TORUS, 1.0, 2.0, steps,
+                                           start, stop, 64)
+                        for (start, stop) in zip(bounds[:-1], bounds[1:])]
+            parallel = method.getScale(2.0 / steps) * math.fsum(
+                value for partial in partials for value in partial)
+            sequential = method(model.Function(TORUS, 1.0, 2.0, steps),
+                                None).integrate()
+            self.assertTrue(math.isclose(parallel, sequential,
+                                         rel_tol=1e-15))
+
+    def testWorkers(self):
+        for method in (numerical.Simpson, numerical.Trapezoid):
+            function = model.Function(TORUS, 1.0, 2.0, 10001)
+            calculation = method(function, 39.47841760435743)
+            calculation.setStore(None)
+            calculation.setWorkers(2)
+            parallel = calculation.calculate().getCalculatedValue()
+            sequential = method(function, None).integrate()
+            self.assertTrue(math.isclose(parallel, sequential,
+                                         rel_tol=1e-15))
+
+
+class RombergTest(unittest.TestCase):
+    """
+    Tests of the romberg method.
+    """
+    def testRejectsModes(self):
+        function = model.Function(TORUS, 1.0, 2.0, 10)
+        romberg = numerical.Romberg(function, 1.0)
+        romberg.setChunkSize(None)
+        romberg.setWorkers(1)
+        with self.assertRaises(ValueError):
+            romberg.setChunkSize(100)
+        with self.assertRaises(ValueError):
+            romberg.setWorkers(2)
+        with self.assertRaises(ValueError):
+            romberg.setCheckpoint(object())
+
+
+class StoreTest(unittest.TestCase):
+    """
+    Tests of the methods with a result store.
+    """
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.store = store.ResultStore(os.path.join(self.directory.name,
+                                                    'results.db'))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def testAutoStepsRepeated(self):
+        # A repeated calculation reports the selected steps again.
+        results = []
+        for repeat in range(2):
+            function = model.Function(TORUS, 1.0, 2.0, 10)
+            auto = numerical.AutoSteps(function, 39.47841760435743)
+            auto.setStore(self.store)
+            results.append(auto.calculate())
+        for result in results:
+            self.assertNotEqual(result.getFunction().getSteps(), 10)
+            self.assertIsNotNone(result.getPredictedError())
+        self.assertEqual(results[0].getFunction().getSteps(),
+                         results[1].getFunction().getSteps())
+
+    def testRombergTableRepeated(self):
+        for repeat in range(2):
+            function = model.Function(TORUS, 1.0, 2.0, 10)
+            romberg = numerical.Romberg(function, 1.0, levels=3)
+            romberg.setStore(self.store)
+            romberg.calculate()
+            self.assertEqual(len(romberg.getTable()), 3)
+
+
+class StreamTest(unittest.TestCase):
+    """
+    Tests of the streaming mode of the grid based methods.
+    """
+    def calculate(self, method, chunkSize):
+        function = model.Function(TORUS, 1.0, 2.0, 10000)
+        calculation = method(function, 39.47841760435743)
+        calculation.setStore(None)
+        calculation.setChunkSize(chunkSize)
+        return calculation.calculate().getCalculatedValue()
+
+    def testChunked(self):
+        # The chunks change the order of the additions only, so the values
+        # differ by rounding of the last bits at most.
+        for method in numerical.METHODS.values():
+            whole = self.calculate(method, None)
+            for chunkSize in (7, 1000, 4096, 20000):
+                self.assertTrue(math.isclose(self.calculate(method,
+                                                            chunkSize),
+                                             whole, rel_tol=1e-15))
+
+
+class TanhSinhTest(unittest.TestCase):
+    """
+    Tests of the tanh-sinh method.
+    """
+    def testEndpointSingularity(self):
+        # The distance to the bounds is kept, so the singularity converges
+        # exponentially.
+        function = model.Function('1/sqrt(r1**2-x**2)', 1.0, 2.0, 10)
+        tanhSinh = numerical.TanhSinh(function, math.pi)
+        tanhSinh.setStore(None)
+        calculated = tanhSinh.calculate().getCalculatedValue()
+        self.assertAlmostEqual(calculated, math.pi, places=14)
+        self.assertLess(tanhSinh.getEvaluations(), 500)
+
+
+if __name__ == '__main__':
+    unittest.main()
+
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 23:12:37 2026
+
+@author: ctsoft
+"""
+
+import math
+import random
+import unittest
+
+import ctsoft.awd.math.summation as summation
+
+
+class CompensatedSumTest(unittest.TestCase):
+    """
+    Tests of the compensated summation.
+    """
+    def calculate(self, values):
+        summe = summation.CompensatedSum()
+        for value in values:
+            summe.add(value)
+        return summe
+
+    def testCancellation(self):
+        # The naive sum loses the small value completely.
+        self.assertEqual(self.calculate([1e16, 1.0, -1e16]).getValue(), 1.0)
+
+    def testCorrectlyRounded(self):
+        generator = random.Random(1)
+        values = [generator.uniform(-1.0, 1.0) * 10.0 ** generator.randint(
+            -8, 8) for index in range(0, 10 ** 5)]
+        self.assertEqual(self.calculate(values).getValue(),
+                         math.fsum(values))
+        self.assertEqual(self.calculate([0.1] * 10 ** 5).getValue(),
+                         10000.0)
+
+    def testState(self):
+        # A restored state continues the sum exactly.
+        values = [1e16, 1.0, 3.0, -1e16, 0.5]
+        summe = self.calculate(values[:3])
+        restored = summation.CompensatedSum()
+        restored.setState(*summe.getState())
+        for value in values[3:]:
+            restored.add(value)
+        self.assertEqual(restored.getValue(),
+                         self.calculate(values).getValue())
+
+
+if __name__ == '__main__':
+    unittest.main()
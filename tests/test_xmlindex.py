@@ -0,0 +1,55 @@
+# -*- coding: utf-8 -*-
+"""
+Created on Sun Oct 18 22:51:06 2026
+
+@author: ctsoft
+"""
+
+import os
+import tempfile
+import unittest
+
+import ctsoft.awd.application.xmlindex as xmlindex
+
+
+class IndexCacheTest(unittest.TestCase):
+    """
+    Tests of the persistent indexes of xml files.
+    """
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'settings.xml')
+        with open(self.path, 'w', encoding='utf-8') as file:
+            file.write('<settings/>')
+        self.parsed = 0
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def parse(self, path):
+        self.parsed += 1
+        return {'parsed': self.parsed}
+
+    def testWithoutDirectory(self):
+        indexCache = xmlindex.IndexCache()
+        indexCache.get(self.path, 'settings', self.parse)
+        indexCache.get(self.path, 'settings', self.parse)
+        self.assertEqual(self.parsed, 2)
+
+    def testStoredIndex(self):
+        indexCache = xmlindex.IndexCache(os.path.join(self.directory.name,
+                                                      'cache'))
+        first = indexCache.get(self.path, 'settings', self.parse)
+        self.assertEqual(indexCache.get(self.path, 'settings', self.parse),
+                         first)
+        self.assertEqual(self.parsed, 1)
+
+        # A changed xml file is parsed again.
+        with open(self.path, 'w', encoding='utf-8') as file:
+            file.write('<settings></settings>')
+        indexCache.get(self.path, 'settings', self.parse)
+        self.assertEqual(self.parsed, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()